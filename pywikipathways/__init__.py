@@ -1,18 +1,116 @@
 # -*- coding:utf-8 -*-
 
-from .download_pathway_archive import *
-from .find_pathways_by_text import *
-from .find_pathways_by_literature import *
-from .find_pathways_by_orcid import *
-from .find_pathways_by_xref import *
-from .get_counts import *
-from .get_ontology_terms import *
-from .get_pathway import *
-from .get_pathway_history import *
-from .get_pathway_info import *
-from .get_recent_changes import *
-from .get_xref_list import *
-from .list_communities import *
-from .list_organisms import *
-from .list_pathways import *
+# Submodules are imported on first attribute access (PEP 562) so that
+# ``import pywikipathways`` does not pull in requests, pandas or lxml.
+
+import importlib
+import sys
+import types
+
 from ._version import __version__
+
+_EXPORTS = {
+    "backend": ("set_backend", "get_backend"),
+    "compact": ("compact_frame",),
+    "compile_gmt": ("compile_gmt",),
+    "download_pathway_archive": ("download_pathway_archive",),
+    "find_pathways_by_text": (
+        "find_pathways_by_text", "find_pathway_ids_by_text",
+        "find_pathway_names_by_text", "find_pathway_urls_by_text",
+    ),
+    "find_pathways_by_literature": (
+        "find_pathways_by_literature", "find_pathway_ids_by_literature",
+        "find_pathway_names_by_literature", "find_pathway_urls_by_literature",
+    ),
+    "find_pathways_by_orcid": (
+        "find_pathways_by_orcid", "find_pathway_ids_by_orcid",
+        "find_pathway_names_by_orcid", "find_pathway_urls_by_orcid",
+    ),
+    "find_pathways_by_xref": (
+        "find_pathways_by_xref", "find_pathway_ids_by_xref",
+        "find_pathway_names_by_xref", "find_pathway_urls_by_xref",
+    ),
+    "get_counts": ("get_counts",),
+    "get_ontology_terms": (
+        "get_ontology_terms", "get_ontology_term_names", "get_ontology_term_ids",
+        "get_pathways_by_ontology_term", "get_pathway_ids_by_ontology_term",
+        "get_pathways_by_parent_ontology_term", "get_pathway_ids_by_parent_ontology_term",
+    ),
+    "get_datanodes": ("get_datanodes",),
+    "get_pathway": ("get_pathway", "get_pathways"),
+    "get_pathway_history": ("get_pathway_history",),
+    "get_pathway_info": ("get_pathway_info",),
+    "get_recent_changes": (
+        "get_recent_changes", "get_recent_changes_ids", "get_recent_changes_names",
+    ),
+    "get_xref_list": ("get_xref_list",),
+    "gmt_index": ("GmtIndex", "build_gmt_index", "get_gene_set"),
+    "gpml_store": ("GpmlStore", "use_gpml_store", "get_gpml_store"),
+    "iter_pathway_records": ("iter_pathway_records",),
+    "list_communities": (
+        "list_communities", "get_pathways_by_community", "get_pathway_ids_by_community",
+        "get_pathway_names_by_community", "get_pathway_urls_by_community",
+    ),
+    "list_organisms": ("list_organisms",),
+    "list_pathways": (
+        "list_pathways", "list_pathway_ids", "list_pathway_names", "list_pathway_urls",
+    ),
+    "metrics": (
+        "MetricsRegistry", "enable_metrics", "disable_metrics", "get_metrics",
+        "add_metrics_callback", "remove_metrics_callback",
+    ),
+    "mirror": ("sync_mirror", "mirror_state"),
+    "ontology_index": (
+        "OntologyIndex", "build_ontology_index", "get_ontology_index",
+        "get_pathway_ids_by_ontology_branch",
+    ),
+    "pathway_db": ("export_database", "use_database", "database_info"),
+    "pathway_graph": ("PathwayGraph", "pathway_graph"),
+    "pathway_network": ("PathwayNetwork", "build_pathway_network", "load_pathway_network"),
+    "pathway_similarity": ("pathway_similarity",),
+    "ratelimit": (
+        "TokenBucket", "FileTokenBucket", "set_rate_limit", "clear_rate_limit",
+        "get_rate_limits",
+    ),
+    "reachability": ("ReachabilityIndex", "build_reachability_index"),
+    "read_gmt": ("read_gmt", "read_gmtnames"),
+    "read_pathway_gmt": ("read_pathway_gmt",),
+    "snapshot": ("export_snapshot", "load_snapshot", "use_snapshot", "snapshot_info"),
+    "tracing": (
+        "Span", "Tracer", "InMemoryRecorder", "set_tracer", "get_tracer", "profile",
+    ),
+    "translate_ids": ("build_id_mapping", "load_id_mapping", "translate_ids"),
+    "write_gmt": ("write_gmt",),
+    "xref_index": ("XrefIndex", "build_xref_index", "load_xref_index"),
+}
+
+_LAZY = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_LAZY) + ["__version__"]
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        if name in _EXPORTS:
+            return importlib.import_module(f".{name}", __name__)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+class _LazyPackage(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it on the package. Keep the function of
+        # the same name there instead, as the former star imports did.
+        if isinstance(value, types.ModuleType) and _LAZY.get(name) == name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyPackage
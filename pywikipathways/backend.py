@@ -0,0 +1,110 @@
+"""Result backends: pandas (default), pyarrow Tables or polars DataFrames."""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+from typing import Any, Callable
+
+__all__ = ["set_backend", "get_backend"]
+
+_BACKENDS = ("pandas", "pyarrow", "polars")
+_backend = "pandas"
+# Backend of the innermost ``with_backend`` call; lets table readers build
+# Arrow results directly instead of converting a pandas frame afterwards.
+_requested: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "pywikipathways_backend", default="pandas"
+)
+
+
+def _check(name: str) -> str:
+    if name not in _BACKENDS:
+        raise ValueError(f"backend must be one of: {', '.join(_BACKENDS)}.")
+    return name
+
+
+def set_backend(name: str) -> str:
+    """Set the default result backend and return the previous one.
+
+    Parameters
+    ----------
+    name : str
+        ``"pandas"`` (default), ``"pyarrow"`` or ``"polars"``.
+
+    Examples
+    --------
+    >>> set_backend('polars')
+    'pandas'
+    >>> list_pathways('Mus musculus')  # a polars.DataFrame
+    """
+    global _backend
+    previous, _backend = _backend, _check(name)
+    return previous
+
+
+def get_backend() -> str:
+    """Return the default result backend."""
+    return _backend
+
+
+def _arrow_requested() -> bool:
+    """True inside a call whose result is wanted as Arrow or polars."""
+    return _requested.get() != "pandas"
+
+
+def _to_backend(frame: Any, name: str) -> Any:
+    """Convert a pandas or Arrow result to ``name``; other results pass through."""
+    if frame is None or not hasattr(frame, "columns"):
+        return frame
+    is_arrow = hasattr(frame, "schema") and hasattr(frame, "num_rows")
+    if name == "pandas":
+        return frame.to_pandas() if is_arrow else frame
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise ImportError(
+            f"The {name} backend requires pyarrow; install it with 'pip install pyarrow'."
+        ) from exc
+    if is_arrow:
+        table = frame
+    else:
+        from .snapshot import _to_arrow
+
+        table = _to_arrow(frame)
+    if name == "pyarrow":
+        return table
+    try:
+        import polars
+    except ImportError as exc:
+        raise ImportError(
+            "The polars backend requires polars; install it with 'pip install polars'."
+        ) from exc
+    return polars.from_arrow(table)
+
+
+def with_backend(func: Callable) -> Callable:
+    """Add a ``backend=`` keyword returning the result in that backend.
+
+    None (the default) uses ``get_backend()``. Categorical columns become
+    dictionary-encoded Arrow columns. Helpers that post-process a result
+    with pandas must request ``backend="pandas"``. While the call runs,
+    ``_arrow_requested()`` tells table readers to return Arrow directly.
+    """
+    signature = inspect.signature(func)
+    parameter = inspect.Parameter("backend", inspect.Parameter.KEYWORD_ONLY, default=None)
+
+    @functools.wraps(func)
+    def wrapper(*args, backend: str | None = None, **kwargs):
+        name = _check(backend) if backend is not None else _backend
+        token = _requested.set(name)
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            _requested.reset(token)
+        return _to_backend(result, name)
+
+    wrapper.__signature__ = signature.replace(
+        parameters=[*signature.parameters.values(), parameter]
+    )
+    return wrapper
@@ -0,0 +1,394 @@
+"""The ``pywikipathways`` command-line interface for bulk jobs.
+
+Every subcommand writes one record per line to standard output, as JSON
+Lines (default) or TSV, so results can be piped while a job is running.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TextIO
+
+import pandas as pd
+
+from ._version import __version__
+
+__all__ = ["main"]
+
+
+class _Writer:
+    """Stream dict records as JSON Lines or TSV (header from the first record)."""
+
+    def __init__(self, fmt: str, stream: TextIO):
+        self.fmt = fmt
+        self.stream = stream
+        self.columns: List[str] | None = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        record = {key: _plain(value) for key, value in record.items()}
+        if self.fmt == "jsonl":
+            line = json.dumps(record, default=str)
+        else:
+            if self.columns is None:
+                self.columns = list(record)
+                self.stream.write("\t".join(self.columns) + "\n")
+            line = "\t".join(_tsv_cell(record.get(column)) for column in self.columns)
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def write_frame(self, frame: pd.DataFrame | None) -> None:
+        if frame is None:
+            return
+        for record in frame.to_dict("records"):
+            self.write(record)
+
+
+def _plain(value: Any) -> Any:
+    if value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if hasattr(value, "tolist") and not isinstance(value, str):
+        return value.tolist()
+    return value
+
+
+def _tsv_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def _read_ids(values: Iterable[str], ids_file: str | None) -> List[str]:
+    ids = list(values)
+    if ids_file is not None:
+        handle = sys.stdin if ids_file == "-" else open(ids_file, encoding="utf-8")
+        with handle:
+            ids.extend(line.strip() for line in handle if line.strip())
+    if not ids:
+        raise ValueError("No pathway identifiers given.")
+    return list(dict.fromkeys(ids))
+
+
+def _parallel(items: List[str], func: Callable[[str], Any], workers: int
+              ) -> Iterator[tuple]:
+    """Yield ``(item, result, error)`` in completion order."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except (RuntimeError, ValueError, OSError) as exc:
+                yield futures[future], None, str(exc)
+
+
+def _cmd_sync(args, out: _Writer) -> int:
+    from .mirror import sync_mirror
+
+    summary = sync_mirror(args.dest, organism=args.organism, formats=args.formats,
+                          max_workers=args.workers)
+    out.write(summary)
+    return 1 if summary["failed"] else 0
+
+
+def _cmd_fetch(args, out: _Writer) -> int:
+    from .get_datanodes import _fetch_datanodes
+    from .get_pathway import get_pathway
+
+    ids = _read_ids(args.ids, args.ids_file)
+    os.makedirs(args.dest, exist_ok=True)
+    suffix = ".gpml" if args.format == "gpml" else "-datanodes.tsv"
+    fetch = get_pathway if args.format == "gpml" else _fetch_datanodes
+
+    def save(wpid: str) -> Dict[str, Any]:
+        content = fetch(wpid).encode("utf-8")
+        path = os.path.join(args.dest, wpid + suffix)
+        with open(path + ".tmp", "wb") as handle:
+            handle.write(content)
+        os.replace(path + ".tmp", path)
+        return {"id": wpid, "path": path, "bytes": len(content)}
+
+    failed = 0
+    for wpid, record, error in _parallel(ids, save, args.workers):
+        if error is not None:
+            failed += 1
+            record = {"id": wpid, "error": error}
+        out.write(record)
+    return 1 if failed else 0
+
+
+def _cmd_xrefs(args, out: _Writer) -> int:
+    from .get_xref_list import get_xref_list
+
+    ids = _read_ids(args.ids, args.ids_file)
+    failed = 0
+    for wpid, xrefs, error in _parallel(
+        ids, lambda wpid: get_xref_list(wpid, args.system), args.workers
+    ):
+        if error is not None:
+            failed += 1
+            print(f"{wpid}: {error}", file=sys.stderr)
+            continue
+        for xref in xrefs:
+            out.write({"pathway": wpid, "xref": xref})
+    return 1 if failed else 0
+
+
+def _cmd_archive(args, out: _Writer) -> int:
+    from .download_pathway_archive import download_pathway_archive
+
+    os.makedirs(args.dest, exist_ok=True)
+    filename = download_pathway_archive(date=args.date, organism=args.organism,
+                                        format=args.format, destpath=args.dest)
+    out.write({"path": filename})
+    return 0
+
+
+def _cmd_index(args, out: _Writer) -> int:
+    if args.kind == "network":
+        from .pathway_network import build_pathway_network
+
+        if args.source is None:
+            raise ValueError("--source is required for a network index.")
+        network = build_pathway_network(args.source, previous=args.previous,
+                                        path=args.output, max_workers=args.workers)
+        out.write({"kind": "network", "path": args.output, "pathways": len(network.hashes),
+                   "nodes": len(network.nodes), "edges": len(network.edges),
+                   "failed": network.failed})
+    elif args.kind == "xrefs":
+        from .xref_index import build_xref_index
+
+        index = build_xref_index(args.organism, args.mirror, args.output, args.workers)
+        out.write({"kind": "xrefs", "path": args.output, "pathways": len(index.pathways),
+                   "identifiers": len(index), "failed": index.failed})
+    else:
+        from .translate_ids import build_id_mapping
+
+        mapping = build_id_mapping(args.organism, args.mirror, args.output, args.workers)
+        out.write({"kind": "ids", "path": args.output, "rows": len(mapping)})
+    return 0
+
+
+def _cmd_search(args, out: _Writer) -> int:
+    from .find_pathways_by_literature import find_pathways_by_literature
+    from .find_pathways_by_orcid import find_pathways_by_orcid
+    from .find_pathways_by_text import find_pathways_by_text
+    from .find_pathways_by_xref import find_pathways_by_xref
+
+    kwargs = {"backend": "pandas"}
+    if args.by == "text":
+        frame = find_pathways_by_text(args.query, field=args.field, **kwargs)
+    elif args.by == "xref":
+        if args.system is None:
+            raise ValueError("--system is required for an xref search.")
+        frame = find_pathways_by_xref(args.query, args.system, **kwargs)
+    elif args.by == "literature":
+        frame = find_pathways_by_literature(args.query, **kwargs)
+    else:
+        frame = find_pathways_by_orcid(args.query, **kwargs)
+    if frame is not None and args.columns:
+        frame = frame[[column for column in args.columns if column in frame.columns]]
+    out.write_frame(frame)
+    return 0
+
+
+def _cmd_database(args, out: _Writer) -> int:
+    from .pathway_db import database_info, export_database
+
+    path = export_database(args.path, tables=args.tables)
+    tables = database_info(path)["tables"]
+    for name, entry in tables.items():
+        out.write({"table": name, "rows": entry["rows"], "fts": "fts_columns" in entry})
+    return 0
+
+
+def _iter_gmt(path: str) -> Iterator[List[str]]:
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 2:
+                yield parts
+
+
+def _cmd_gmt_convert(args, out: _Writer) -> int:
+    for parts in _iter_gmt(args.file):
+        if args.names:
+            out.write({"term": parts[0], "name": parts[1]})
+            continue
+        for gene in parts[2:]:
+            out.write({"term": parts[0], "gene": gene})
+    return 0
+
+
+def _cmd_gmt_merge(args, out: _Writer) -> int:
+    # Later files do not override terms already written.
+    seen = set()
+    written = 0
+    with open(args.output, "w", encoding="utf-8") as handle:
+        for path in args.files:
+            for parts in _iter_gmt(path):
+                if parts[0] in seen:
+                    continue
+                seen.add(parts[0])
+                handle.write("\t".join(parts) + "\n")
+                written += 1
+    out.write({"path": args.output, "terms": written})
+    return 0
+
+
+def _cmd_gmt_get(args, out: _Writer) -> int:
+    from .gmt_index import get_gene_set
+
+    missing = 0
+    for term in args.terms:
+        try:
+            genes = get_gene_set(args.file, term)
+        except KeyError:
+            missing += 1
+            print(f"{term}: no such gene set", file=sys.stderr)
+            continue
+        out.write({"term": term, "genes": genes})
+    return 1 if missing else 0
+
+
+def _cmd_gmt_compile(args, out: _Writer) -> int:
+    from .compile_gmt import compile_gmt
+
+    source = args.source[0] if len(args.source) == 1 and os.path.exists(args.source[0]) \
+        else args.source
+    summary = compile_gmt(source, systems=args.systems, destpath=args.dest,
+                          mapping=args.mapping, version=args.version,
+                          max_workers=args.workers)
+    for path in summary["paths"]:
+        out.write({"path": path})
+    for wpid, error in summary["failed"].items():
+        out.write({"id": wpid, "error": error})
+    return 1 if summary["failed"] else 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pywikipathways",
+        description="Bulk access to WikiPathways content.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("-f", "--output-format", choices=("jsonl", "tsv"), default="jsonl",
+                        help="record format written to stdout (default: jsonl)")
+    parser.add_argument("-j", "--workers", type=int, default=8,
+                        help="concurrent downloads or worker processes (default: 8)")
+    parser.add_argument("--rate", type=float,
+                        help="maximum requests per second to WikiPathways")
+    parser.add_argument("--max-concurrency", type=int,
+                        help="maximum requests in flight at once")
+    parser.add_argument("--store", help="GPML store directory (see use_gpml_store)")
+    parser.add_argument("--snapshot", help="serve endpoint tables from this snapshot")
+    parser.add_argument("--database", help="serve tables and searches from this SQLite database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser("sync", help="bring a local mirror up to date")
+    sync.add_argument("dest", nargs="?", default="./wikipathways-mirror")
+    sync.add_argument("--organism")
+    sync.add_argument("--formats", nargs="+", default=["gpml", "tsv"], choices=("gpml", "tsv"))
+    sync.set_defaults(handler=_cmd_sync)
+
+    fetch = commands.add_parser("fetch", help="download GPML or datanode TSV files")
+    fetch.add_argument("ids", nargs="*", help="WPIDs")
+    fetch.add_argument("--ids-file", help="file with one WPID per line ('-' for stdin)")
+    fetch.add_argument("--format", choices=("gpml", "tsv"), default="gpml")
+    fetch.add_argument("--dest", default=".")
+    fetch.set_defaults(handler=_cmd_fetch)
+
+    xrefs = commands.add_parser("xrefs", help="list the xrefs of pathways")
+    xrefs.add_argument("ids", nargs="*", help="WPIDs")
+    xrefs.add_argument("--ids-file", help="file with one WPID per line ('-' for stdin)")
+    xrefs.add_argument("--system", required=True, help="BridgeDb system code, e.g. L")
+    xrefs.set_defaults(handler=_cmd_xrefs)
+
+    archive = commands.add_parser("archive", help="download a monthly pathway archive")
+    archive.add_argument("--organism", required=True)
+    archive.add_argument("--format", choices=("gpml", "gmt", "svg"), default="gpml")
+    archive.add_argument("--date", default="current")
+    archive.add_argument("--dest", default=".")
+    archive.set_defaults(handler=_cmd_archive)
+
+    index = commands.add_parser("index", help="build an offline index")
+    index.add_argument("kind", choices=("xrefs", "ids", "network"))
+    index.add_argument("--output", help="file or directory to save the index to")
+    index.add_argument("--organism")
+    index.add_argument("--mirror", help="sync_mirror directory to read instead of downloading")
+    index.add_argument("--source", help="GPML archive or directory (network)")
+    index.add_argument("--previous", help="earlier network directory to update (network)")
+    index.set_defaults(handler=_cmd_index)
+
+    search = commands.add_parser("search", help="search pathways")
+    search.add_argument("query")
+    search.add_argument("--by", choices=("text", "xref", "literature", "orcid"), default="text")
+    search.add_argument("--system", help="BridgeDb system code (xref search)")
+    search.add_argument("--field", help="restrict a text search to one field")
+    search.add_argument("--columns", nargs="+", help="only output these columns")
+    search.set_defaults(handler=_cmd_search)
+
+    database = commands.add_parser("database", help="export endpoint tables to SQLite")
+    database.add_argument("path", nargs="?", default="./wikipathways.sqlite")
+    database.add_argument("--tables", nargs="+", help="endpoint tables (default: all)")
+    database.set_defaults(handler=_cmd_database)
+
+    gmt = commands.add_parser("gmt", help="convert or merge GMT files")
+    gmt_commands = gmt.add_subparsers(dest="gmt_command", required=True)
+    convert = gmt_commands.add_parser("convert", help="write GMT records as term/gene rows")
+    convert.add_argument("file")
+    convert.add_argument("--names", action="store_true", help="write term/name rows instead")
+    convert.set_defaults(handler=_cmd_gmt_convert)
+    get = gmt_commands.add_parser("get", help="look up gene sets through an offset index")
+    get.add_argument("file")
+    get.add_argument("terms", nargs="+", help="GMT terms or WPIDs")
+    get.set_defaults(handler=_cmd_gmt_get)
+    compile_ = gmt_commands.add_parser("compile", help="compile GMT files from GPML")
+    compile_.add_argument("source", nargs="+",
+                          help="GPML archive or directory, or WPIDs to fetch")
+    compile_.add_argument("--systems", nargs="+", default=["L"],
+                          help="BridgeDb system codes (default: L)")
+    compile_.add_argument("--dest", default=".")
+    compile_.add_argument("--mapping", help="id mapping saved by build_id_mapping")
+    compile_.add_argument("--version", help="release stamp (default: archive date or today)")
+    compile_.set_defaults(handler=_cmd_gmt_compile)
+    merge = gmt_commands.add_parser("merge", help="merge GMT files, first term wins")
+    merge.add_argument("files", nargs="+")
+    merge.add_argument("-o", "--output", required=True)
+    merge.set_defaults(handler=_cmd_gmt_merge)
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Run the command line; returns the exit status."""
+    args = _parser().parse_args(argv)
+    try:
+        if args.rate is not None or args.max_concurrency is not None:
+            from .ratelimit import set_rate_limit
+
+            set_rate_limit(rate=args.rate, max_concurrency=args.max_concurrency)
+        if args.store is not None:
+            from .gpml_store import use_gpml_store
+
+            use_gpml_store(args.store)
+        if args.snapshot is not None:
+            from .snapshot import use_snapshot
+
+            use_snapshot(args.snapshot)
+        if args.database is not None:
+            from .pathway_db import use_database
+
+            use_database(args.database)
+        return args.handler(args, _Writer(args.output_format, sys.stdout))
+    except BrokenPipeError:
+        return 0
+    except (RuntimeError, ValueError, OSError) as exc:
+        print(f"pywikipathways: error: {exc}", file=sys.stderr)
+        return 1
@@ -0,0 +1,96 @@
+"""Memory-compact dtypes for the string-heavy result tables."""
+
+from __future__ import annotations
+
+import pandas as pd
+
+__all__ = ["compact_frame"]
+
+_MAX_UNIQUE_RATIO = 0.5
+
+
+def compact_frame(frame: pd.DataFrame,
+                  arrow_strings: bool = False,
+                  max_unique_ratio: float = _MAX_UNIQUE_RATIO) -> pd.DataFrame:
+    """Store repetitive string columns as categoricals.
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame
+        Any result table, e.g. from ``list_pathways`` or ``read_pathway_gmt``.
+    arrow_strings : bool, optional
+        Also convert the remaining (high-cardinality) string columns to the
+        Arrow-backed ``string[pyarrow]`` dtype. Requires pyarrow.
+    max_unique_ratio : float, optional
+        A string column becomes categorical when its number of distinct
+        values is at most this fraction of its length.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A new frame; columns holding lists, numbers or mixed values are left
+        unchanged.
+
+    Examples
+    --------
+    >>> compact_frame(read_pathway_gmt('wikipathways-Homo_sapiens.gmt')).memory_usage(deep=True)
+    """
+    if arrow_strings:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise ImportError(
+                "Arrow-backed strings require pyarrow; install it with 'pip install pyarrow'."
+            ) from exc
+
+    columns = {}
+    rows = len(frame)
+    for name in frame.columns:
+        series = frame[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            continue
+        if pd.api.types.infer_dtype(series, skipna=True) not in ("string", "empty"):
+            continue
+        if rows and series.nunique(dropna=True) <= max_unique_ratio * rows:
+            columns[name] = series.astype("category")
+        elif arrow_strings:
+            columns[name] = series.astype("string[pyarrow]")
+    if not columns:
+        return frame
+    frame = frame.copy(deep=False)
+    for name, series in columns.items():
+        frame[name] = series
+    return frame
+
+
+def _compact_arrow(table, max_unique_ratio: float = _MAX_UNIQUE_RATIO):
+    """Dictionary-encode the repetitive string columns of an Arrow table."""
+    import pyarrow
+    from pyarrow import compute
+
+    rows = table.num_rows
+    for index, field in enumerate(table.schema):
+        if not (pyarrow.types.is_string(field.type) or pyarrow.types.is_large_string(field.type)):
+            continue
+        column = table.column(index)
+        unique = compute.count_distinct(column, mode="only_valid").as_py()
+        if rows and unique <= max_unique_ratio * rows:
+            table = table.set_column(index, field.name, compute.dictionary_encode(column))
+    return table
+
+
+def _compact(frame, compact: bool | str):
+    """Apply a ``compact=`` argument: False, True or ``"arrow"``.
+
+    Arrow tables (from Arrow-backend calls) get dictionary-encoded columns
+    in place of categoricals; their strings are already Arrow-backed.
+    """
+    if not compact or frame is None:
+        return frame
+    if compact is not True and compact != "arrow":
+        raise ValueError("compact must be False, True or 'arrow'.")
+    if not isinstance(frame, pd.DataFrame):
+        return _compact_arrow(frame)
+    return compact_frame(frame, arrow_strings=compact == "arrow")
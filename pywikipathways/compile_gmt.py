@@ -0,0 +1,197 @@
+"""Compile GMT files for any identifier system from GPML archives."""
+
+from __future__ import annotations
+
+import datetime as _dt
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import pandas as pd
+from lxml import etree as ET
+
+from .get_datanodes import _CODE_MAP
+from .metrics import instrument
+from .pathway_graph import _attr, _children, _elements
+from .pathway_network import _iter_gpml
+from .tracing import span
+
+__all__ = ["compile_gmt"]
+
+_CHUNK_SIZE = 16
+_DATE = re.compile(r"(?<!\d)\d{8}(?!\d)")
+_DESCRIPTION_URL = "https://www.wikipathways.org/instance/{pathway}"
+
+# GPML Xref databases (lowercase) -> BridgeDb system code.
+_DATABASE_CODES = {
+    "ensembl": "En",
+    "entrez gene": "L",
+    "ncbi gene": "L",
+    "ncbigene": "L",
+    "hgnc": "H",
+    "uniprot-trembl": "S",
+    "uniprot/trembl": "S",
+    "uniprot-swissprot": "S",
+    "uniprot": "S",
+    "wikidata": "Wd",
+    "chebi": "Ce",
+    "inchikey": "Ik",
+    "pubchem-compound": "Cpc",
+    "pubchem.compound": "Cpc",
+    "chemspider": "Cs",
+    "hmdb": "Ch",
+    "kegg compound": "Ck",
+    "kegg.compound": "Ck",
+    "lipidmaps": "Lm",
+}
+
+
+def _pathway_xrefs(item: Tuple[str, bytes]
+                   ) -> Tuple[str, str, str, List[Tuple[str, str]], str | None]:
+    """Return the name, organism and (code, identifier) xrefs of one GPML.
+
+    Runs in a worker process. A GPML that cannot be parsed yields no xrefs
+    and the error message, since lxml errors cannot be pickled back.
+    """
+    wpid, gpml = item
+    try:
+        root = ET.fromstring(gpml)
+    except ET.XMLSyntaxError as exc:
+        return wpid, "", "", [], str(exc)
+    name = " ".join((_attr(root, "Name", "title") or wpid).split())
+    organism = _attr(root, "Organism", "organism") or ""
+    xrefs = []
+    for node in _elements(root, "DataNode"):
+        for xref in _children(node, "Xref"):
+            database = (_attr(xref, "Database", "dataSource") or "").strip().lower()
+            identifier = (_attr(xref, "ID", "identifier") or "").strip()
+            code = _DATABASE_CODES.get(database)
+            if code and identifier:
+                # Same form as the datanodes TSV identifiers (e.g. CHEBI:15422 -> 15422).
+                xrefs.append((code, identifier.rsplit(":", 1)[-1]))
+    return wpid, name, organism, xrefs, None
+
+
+def _translations(mapping: pd.DataFrame, code: str) -> Dict[Tuple[str, str], List[str]]:
+    """Return ``(system_code, identifier) -> identifiers of code`` from an id mapping."""
+    target = mapping[mapping["system_code"] == code][["node", "identifier"]]
+    pairs = mapping.merge(target, on="node", suffixes=("", "_to"))
+    pairs = pairs[pairs["system_code"] != code].drop_duplicates(
+        ["system_code", "identifier", "identifier_to"]
+    )
+    table: Dict[Tuple[str, str], List[str]] = {}
+    for system, identifier, translated in zip(
+        pairs["system_code"], pairs["identifier"], pairs["identifier_to"]
+    ):
+        table.setdefault((system, identifier), []).append(translated)
+    return table
+
+
+def _iter_sources(source) -> Iterator[Tuple[str, bytes]]:
+    if isinstance(source, str):
+        yield from _iter_gpml(source)
+        return
+    from .get_pathway import get_pathways
+
+    for wpid, gpml in get_pathways(source).items():
+        yield wpid, gpml.encode("utf-8")
+
+
+@instrument
+def compile_gmt(source: str | Iterable[str],
+                systems: Iterable[str] = ("L",),
+                destpath: str = "./",
+                mapping: pd.DataFrame | str | None = None,
+                version: str | None = None,
+                max_workers: int | None = None) -> Dict[str, Any]:
+    """Write WikiPathways GMT files for the requested identifier systems.
+
+    The GPMLs are parsed in a process pool and each gene set is appended
+    to its file as soon as its pathway is parsed. One file is written per
+    organism and system, named
+    ``wikipathways-{version}-gmt-{Organism}-{code}.gmt``; every line has
+    the ``name%WikiPathways_{version}%WPID%organism`` header read by
+    ``read_pathway_gmt``.
+
+    Parameters
+    ----------
+    source : str or iterable of str
+        A GPML archive from ``download_pathway_archive``, a directory of
+        ``.gpml`` files (e.g. a ``sync_mirror`` mirror) or WPIDs to fetch
+        with ``get_pathways``.
+    systems : iterable of str, optional
+        BridgeDb system codes such as ``"L"`` (NCBI gene), ``"En"``
+        (Ensembl), ``"S"`` (UniProt) or ``"Ce"`` (ChEBI).
+    destpath : str, optional
+        Output directory. It is created if missing.
+    mapping : pandas.DataFrame or str, optional
+        Table from ``build_id_mapping`` (or the path it was saved to). When
+        given, datanodes annotated in another system are translated;
+        otherwise only the identifiers drawn in the GPML are used.
+    version : str, optional
+        Release stamp for the header and file names. Defaults to the date in
+        the archive name, or today.
+    max_workers : int, optional
+        Worker processes; defaults to the number of CPUs.
+
+    Returns
+    -------
+    dict
+        ``paths`` of the written GMT files and ``failed`` (WPID -> parse
+        error) for GPMLs that were skipped.
+
+    Examples
+    --------
+    >>> archive = download_pathway_archive(organism='Homo sapiens', format='gpml')
+    >>> compile_gmt(archive, systems=['En', 'S'], destpath='gmt')['paths']
+    """
+    systems = list(dict.fromkeys(systems))
+    for code in systems:
+        if code not in _CODE_MAP:
+            raise ValueError("Unsupported system code; see BridgeDb datasources.")
+    if version is None:
+        match = _DATE.search(os.path.basename(source)) if isinstance(source, str) else None
+        version = match.group(0) if match else _dt.date.today().strftime("%Y%m%d")
+    if isinstance(mapping, str):
+        from .translate_ids import _read_id_mapping
+
+        mapping = _read_id_mapping(mapping)
+    translations = {
+        code: _translations(mapping, code) if mapping is not None else {} for code in systems
+    }
+    os.makedirs(destpath, exist_ok=True)
+
+    handles = {}
+    failed: Dict[str, str] = {}
+    try:
+        with span("compile"), ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parsed = pool.map(_pathway_xrefs, _iter_sources(source), chunksize=_CHUNK_SIZE)
+            for wpid, name, organism, xrefs, error in parsed:
+                if error is not None:
+                    failed[wpid] = error
+                    continue
+                header = f"{name}%WikiPathways_{version}%{wpid}%{organism}"
+                description = _DESCRIPTION_URL.format(pathway=wpid)
+                for code in systems:
+                    table = translations[code]
+                    genes = []
+                    for system, identifier in xrefs:
+                        if system == code:
+                            genes.append(identifier)
+                        else:
+                            genes.extend(table.get((system, identifier), ()))
+                    genes = list(dict.fromkeys(genes))
+                    if not genes:
+                        continue
+                    key = (organism, code)
+                    if key not in handles:
+                        label = organism.replace(" ", "_") or "unknown"
+                        filename = f"wikipathways-{version}-gmt-{label}-{code}.gmt"
+                        path = os.path.join(destpath, filename)
+                        handles[key] = open(path, "w", encoding="utf-8")
+                    handles[key].write("\t".join([header, description, *genes]) + "\n")
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return {"paths": sorted(handle.name for handle in handles.values()), "failed": failed}
@@ -1,10 +1,12 @@
 import re
 import sys
-import requests
 import pandas
 
 from .list_organisms import *
+from .metrics import instrument
+from .utilities import wikipathways_get
 
+@instrument
 def download_pathway_archive(date='current', organism=None, format='gpml', destpath='./'):
     """Download Pathway Archive
 
@@ -59,7 +61,7 @@ def download_pathway_archive(date='current', organism=None, format='gpml', destp
                 ext = ".gmt"
             filename = "-".join(['wikipathways', date, format, organism.replace(" ", "_")]) + ext
         url = "/".join(['https://data.wikipathways.org', date, format, filename])
-        r = requests.get(url)
+        r = wikipathways_get(url)
         file = open(filename, "wb")
         file.write(r.content)
         file.close()
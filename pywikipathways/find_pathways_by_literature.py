@@ -1,6 +1,25 @@
 import requests
 import pandas
 
+from .backend import with_backend
+from .metrics import instrument
+from .pathway_db import _search
+from .snapshot import _snapshot_table
+from .tracing import span
+from .utilities import wikipathways_get_json
+
+def _find_pathways_by_literature_frame():
+    data = wikipathways_get_json('https://www.wikipathways.org/json/findPathwaysByLiterature.json')
+
+    if 'pathwayInfo' not in data:
+        print("API response missing expected pathwayInfo data structure")
+        return None
+
+    with span("dataframe"):
+        return pandas.DataFrame(data['pathwayInfo']).reset_index(drop=True)
+
+@instrument
+@with_backend
 def find_pathways_by_literature(query):
     """Find Pathways By Literature
 
@@ -21,15 +40,17 @@ def find_pathways_by_literature(query):
     query_lower = str(query).lower()
 
     try:
-        response = requests.get('https://www.wikipathways.org/json/findPathwaysByLiterature.json')
-        response.raise_for_status()
-        data = response.json()
-
-        if 'pathwayInfo' not in data:
-            print("API response missing expected pathwayInfo data structure")
+        filtered_df = _search('findPathwaysByLiterature', [str(query)], ['refs', 'citations'])
+        if filtered_df is not None:
+            if filtered_df.empty:
+                print(f"No pathways found matching query: {query}")
+                return None
+            return filtered_df
+
+        df = _snapshot_table('findPathwaysByLiterature', _find_pathways_by_literature_frame)
+        if df is None:
             return None
 
-        df = pandas.DataFrame(data['pathwayInfo']).reset_index(drop=True)
         if df.empty:
             print("No results")
             return None
@@ -40,10 +61,11 @@ def find_pathways_by_literature(query):
             return None
 
         match_mask = pandas.Series(False, index=df.index)
-        for col in search_columns:
-            column_values = df[col].fillna('')
-            column_strings = column_values.astype(str).str.lower()
-            match_mask |= column_strings.str.contains(query_lower, na=False, regex=False)
+        with span("filter"):
+            for col in search_columns:
+                column_values = df[col].fillna('')
+                column_strings = column_values.astype(str).str.lower()
+                match_mask |= column_strings.str.contains(query_lower, na=False, regex=False)
 
         filtered_df = df[match_mask]
         if filtered_df.empty:
@@ -71,7 +93,7 @@ def find_pathway_ids_by_literature(query):
     Returns:
         pandas.Series or None: A series of pathway IDs, or None if no results.
     """
-    res = find_pathways_by_literature(query)
+    res = find_pathways_by_literature(query, backend="pandas")
     if res is None:
         return None
     return res['id']
@@ -88,7 +110,7 @@ def find_pathway_names_by_literature(query):
     Returns:
         pandas.Series or None: A series of pathway names, or None if no results.
     """
-    res = find_pathways_by_literature(query)
+    res = find_pathways_by_literature(query, backend="pandas")
     if res is None:
         return None
     return res['name']
@@ -105,7 +127,7 @@ def find_pathway_urls_by_literature(query):
     Returns:
         pandas.Series or None: A series of pathway URLs, or None if no results.
     """
-    res = find_pathways_by_literature(query)
+    res = find_pathways_by_literature(query, backend="pandas")
     if res is None:
         return None
     return res['url']
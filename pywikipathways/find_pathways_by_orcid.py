@@ -1,5 +1,26 @@
 import requests
+import pandas
 
+from .backend import with_backend
+from .metrics import instrument
+from .pathway_db import _search
+from .snapshot import _snapshot_table
+from .tracing import span
+from .utilities import wikipathways_get_json
+
+def _find_pathways_by_orcid_frame():
+    # Fetch the static JSON file containing all pathway ORCID data
+    data = wikipathways_get_json('https://www.wikipathways.org/json/findPathwaysByOrcid.json')
+
+    if 'pathwayInfo' not in data:
+        print("API response missing expected pathwayInfo data structure")
+        return None
+
+    with span("dataframe"):
+        return pandas.DataFrame(data['pathwayInfo'])
+
+@instrument
+@with_backend
 def find_pathways_by_orcid(orcid):
     """Find Pathways By ORCID
     
@@ -16,35 +37,33 @@ def find_pathways_by_orcid(orcid):
         raise ValueError("Must provide an ORCID, e.g., '0000-0001-9773-4008'")
     
     try:
-        # Fetch the static JSON file containing all pathway ORCID data
-        response = requests.get('https://www.wikipathways.org/json/findPathwaysByOrcid.json')
-        response.raise_for_status()
-        data = response.json()
-        
-        if 'pathwayInfo' not in data:
-            print("API response missing expected pathwayInfo data structure")
+        filtered_df = _search('findPathwaysByOrcid', [orcid], ['orcids'])
+        if filtered_df is not None:
+            if filtered_df.empty:
+                print(f"No pathways found for ORCID: {orcid}")
+                return None
+            return filtered_df.drop_duplicates(ignore_index=True)
+
+        df = _snapshot_table('findPathwaysByOrcid', _find_pathways_by_orcid_frame)
+        if df is None:
             return None
-            
-        pathway_info = data['pathwayInfo']
         
         # Filter pathways that contain the query ORCID in the orcids field
         orcid_lower = orcid.lower()
-        filtered_pathways = []
-        
-        for pathway in pathway_info:
-            # Check if ORCID matches in the orcids field
-            orcids_value = pathway.get('orcids')
-            if orcids_value is not None:
-                orcids_str = str(orcids_value).lower()
-                if orcid_lower in orcids_str:
-                    filtered_pathways.append(pathway)
+        match_mask = pandas.Series(False, index=df.index)
+        if 'orcids' in df.columns:
+            with span("filter"):
+                orcids_values = df['orcids']
+                match_mask = orcids_values.notna() & orcids_values.astype(str).str.lower().str.contains(
+                    orcid_lower, regex=False
+                )
         
-        if len(filtered_pathways) == 0:
+        filtered_df = df[match_mask]
+        if filtered_df.empty:
             print(f"No pathways found for ORCID: {orcid}")
             return None
             
-        # Convert to DataFrame and return
-        return pandas.DataFrame(filtered_pathways).drop_duplicates(ignore_index=True)
+        return filtered_df.drop_duplicates(ignore_index=True)
         
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data: {e}")
@@ -64,7 +83,7 @@ def find_pathway_ids_by_orcid(orcid):
     Returns:
         pandas.Series or None: A series of pathway IDs, or None if no results.
     """
-    res = find_pathways_by_orcid(orcid)
+    res = find_pathways_by_orcid(orcid, backend="pandas")
     if res is None:
         return None
     return res['id']
@@ -80,7 +99,7 @@ def find_pathway_names_by_orcid(orcid):
     Returns:
         pandas.Series or None: A series of pathway names, or None if no results.
     """
-    res = find_pathways_by_orcid(orcid)
+    res = find_pathways_by_orcid(orcid, backend="pandas")
     if res is None:
         return None
     return res['name']
@@ -96,7 +115,7 @@ def find_pathway_urls_by_orcid(orcid):
     Returns:
         pandas.Series or None: A series of pathway URLs, or None if no results.
     """
-    res = find_pathways_by_orcid(orcid)
+    res = find_pathways_by_orcid(orcid, backend="pandas")
     if res is None:
         return None
     return res['url']
\ No newline at end of file
@@ -1,6 +1,25 @@
 import requests
 import pandas
 
+from .backend import with_backend
+from .metrics import instrument
+from .pathway_db import _columns, _search
+from .snapshot import _snapshot_table
+from .tracing import span
+from .utilities import wikipathways_get_json
+
+def _find_pathways_by_text_frame():
+    data = wikipathways_get_json('https://www.wikipathways.org/json/findPathwaysByText.json')
+
+    if 'pathwayInfo' not in data:
+        print("API response missing expected pathwayInfo data structure")
+        return None
+
+    with span("dataframe"):
+        return pandas.DataFrame(data['pathwayInfo']).reset_index(drop=True)
+
+@instrument
+@with_backend
 def find_pathways_by_text(query, field=None):
     """Find Pathways By Text
 
@@ -32,15 +51,21 @@ def find_pathways_by_text(query, field=None):
         query_terms = [str(query).lower()]
 
     try:
-        response = requests.get('https://www.wikipathways.org/json/findPathwaysByText.json')
-        response.raise_for_status()
-        data = response.json()
-
-        if 'pathwayInfo' not in data:
-            print("API response missing expected pathwayInfo data structure")
+        database_columns = _columns('findPathwaysByText')
+        if database_columns is not None:
+            if field is not None and field not in database_columns:
+                raise ValueError("Must provide a supported field, e.g., 'name'")
+            filtered_df = _search('findPathwaysByText', query_terms,
+                                  None if field is None else [field])
+            if filtered_df.empty:
+                print("No results")
+                return None
+            return filtered_df
+
+        df = _snapshot_table('findPathwaysByText', _find_pathways_by_text_frame)
+        if df is None:
             return None
 
-        df = pandas.DataFrame(data['pathwayInfo']).reset_index(drop=True)
         if df.empty:
             print("No pathways available in dataset")
             return None
@@ -57,18 +82,22 @@ def find_pathways_by_text(query, field=None):
         else:
             search_columns = [field]
 
-        search_frame = df[search_columns].fillna('').astype(str)
+        with span("astype"):
+            search_frame = df[search_columns].fillna('').astype(str)
 
         match_mask = pandas.Series(False, index=df.index)
         if field is None:
-            lower_frame = search_frame.map(lambda value: value.lower())
-            row_strings = lower_frame.apply(lambda row: ' '.join(row), axis=1)
-            for term in query_terms:
-                match_mask |= row_strings.str.contains(term, na=False, regex=False)
+            with span("join_rows"):
+                lower_frame = search_frame.map(lambda value: value.lower())
+                row_strings = lower_frame.apply(lambda row: ' '.join(row), axis=1)
+            with span("filter"):
+                for term in query_terms:
+                    match_mask |= row_strings.str.contains(term, na=False, regex=False)
         else:
-            column_series = search_frame[field].str.lower()
-            for term in query_terms:
-                match_mask |= column_series.str.contains(term, na=False, regex=False)
+            with span("filter"):
+                column_series = search_frame[field].str.lower()
+                for term in query_terms:
+                    match_mask |= column_series.str.contains(term, na=False, regex=False)
 
         filtered_df = df[match_mask]
         if filtered_df.empty:
@@ -103,7 +132,7 @@ def find_pathway_ids_by_text(query, field=None):
     Examples:
         >>> find_pathway_ids_by_text('cancer')
     """
-    res = find_pathways_by_text(query, field)
+    res = find_pathways_by_text(query, field, backend="pandas")
     if res is None:
         return None
     return res['id']
@@ -125,7 +154,7 @@ def find_pathway_names_by_text(query, field=None):
     Examples:
         >>> find_pathway_names_by_text('cancer')
     """
-    res = find_pathways_by_text(query, field)
+    res = find_pathways_by_text(query, field, backend="pandas")
     if res is None:
         return None
     return res['name']
@@ -147,7 +176,7 @@ def find_pathway_urls_by_text(query, field=None):
     Examples:
         >>> find_pathway_urls_by_text('cancer')
     """
-    res = find_pathways_by_text(query, field)
+    res = find_pathways_by_text(query, field, backend="pandas")
     if res is None:
         return None
     return res['url']
@@ -1,6 +1,26 @@
 import requests
 import pandas as pd
 
+from .backend import with_backend
+from .metrics import instrument
+from .pathway_db import _search
+from .snapshot import _snapshot_table
+from .tracing import span
+from .utilities import wikipathways_get_json
+
+def _find_pathways_by_xref_frame():
+    # Fetch the static JSON file containing all pathway xref data
+    data = wikipathways_get_json('https://www.wikipathways.org/json/findPathwaysByXref.json')
+
+    if 'pathwayInfo' not in data:
+        print("API response missing expected pathwayInfo data structure")
+        return None
+
+    with span("dataframe"):
+        return pd.DataFrame(data['pathwayInfo'])
+
+@instrument
+@with_backend
 def find_pathways_by_xref(identifier, system_code):
     """Find Pathways By Xref
     
@@ -38,35 +58,35 @@ def find_pathways_by_xref(identifier, system_code):
         raise ValueError(f"Must provide a supported systemCode, e.g., En. Supported codes: {', '.join(code_list.keys())}")
     
     try:
-        # Fetch the static JSON file containing all pathway xref data
-        response = requests.get('https://www.wikipathways.org/json/findPathwaysByXref.json')
-        response.raise_for_status()
-        data = response.json()
-        
-        if 'pathwayInfo' not in data:
-            print("API response missing expected pathwayInfo data structure")
+        filtered_df = _search('findPathwaysByXref', [identifier], [code_list[system_code]])
+        if filtered_df is not None:
+            if filtered_df.empty:
+                print(f"No pathways found for identifier '{identifier}' with system code '{system_code}'")
+                return None
+            return filtered_df.drop_duplicates(ignore_index=True)
+
+        df = _snapshot_table('findPathwaysByXref', _find_pathways_by_xref_frame)
+        if df is None:
             return None
-            
-        pathway_info = data['pathwayInfo']
         
         field_name = code_list[system_code]
         identifier_lower = identifier.lower()
         
         # Filter pathways that contain the identifier in the appropriate field
-        filtered_pathways = []
-        for pathway in pathway_info:
-            field_value = pathway.get(field_name)
-            if field_value is not None:
-                field_value_str = str(field_value).lower()
-                if identifier_lower in field_value_str:
-                    filtered_pathways.append(pathway)
+        match_mask = pd.Series(False, index=df.index)
+        if field_name in df.columns:
+            with span("filter"):
+                field_values = df[field_name]
+                match_mask = field_values.notna() & field_values.astype(str).str.lower().str.contains(
+                    identifier_lower, regex=False
+                )
         
-        if len(filtered_pathways) == 0:
+        filtered_df = df[match_mask]
+        if filtered_df.empty:
             print(f"No pathways found for identifier '{identifier}' with system code '{system_code}'")
             return None
             
-        # Convert to DataFrame and return
-        return pd.DataFrame(filtered_pathways).drop_duplicates(ignore_index=True)
+        return filtered_df.drop_duplicates(ignore_index=True)
         
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data: {e}")
@@ -110,7 +130,7 @@ def find_pathway_ids_by_xref(identifier, system_code):
         86    WP5098
         Name: id, Length: 87, dtype: object
     """
-    res = find_pathways_by_xref(identifier, system_code)
+    res = find_pathways_by_xref(identifier, system_code, backend="pandas")
     if res is None:
         return None
     return res['id']
@@ -150,7 +170,7 @@ def find_pathway_names_by_xref(identifier, system_code):
         86                         T-cell activation SARS-CoV-2
         Name: name, Length: 87, dtype: object
     """
-    res = find_pathways_by_xref(identifier, system_code)
+    res = find_pathways_by_xref(identifier, system_code, backend="pandas")
     if res is None:
         return None
     return res['name']
@@ -190,7 +210,7 @@ def find_pathway_urls_by_xref(identifier, system_code):
         86    https://www.wikipathways.org/index.php/Pathway...
         Name: url, Length: 87, dtype: object
     """
-    res = find_pathways_by_xref(identifier, system_code)
+    res = find_pathways_by_xref(identifier, system_code, backend="pandas")
     if res is None:
         return None
     return res['url']
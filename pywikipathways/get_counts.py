@@ -1,7 +1,20 @@
 import requests
 import pandas
 
+from .metrics import instrument
+from .snapshot import _snapshot_table
+from .utilities import wikipathways_get_json
 
+
+def _counts_frame():
+    # Fetch the static JSON file containing counts data
+    data = wikipathways_get_json('https://www.wikipathways.org/json/getCounts.json')
+
+    # Convert to DataFrame - the JSON response should contain count statistics
+    return pandas.DataFrame([data])
+
+
+@instrument
 def get_counts():
     """Get Counts for WikiPathways Stats
     
@@ -16,15 +29,7 @@ def get_counts():
         >>> get_counts()
     """
     try:
-        # Fetch the static JSON file containing counts data
-        response = requests.get('https://www.wikipathways.org/json/getCounts.json')
-        response.raise_for_status()
-        data = response.json()
-        
-        # Convert to DataFrame - the JSON response should contain count statistics
-        df = pandas.DataFrame([data])
-        
-        return df
+        return _snapshot_table('getCounts', _counts_frame)
         
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data: {e}")
@@ -0,0 +1,153 @@
+"""Parsed datanode tables from the ``{pathway}-datanodes.tsv`` assets."""
+
+from __future__ import annotations
+
+import io
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+
+import pandas as pd
+import requests
+
+from . import metrics
+from .metrics import instrument
+from .tracing import span
+from .utilities import wikipathways_get
+
+__all__ = ["get_datanodes"]
+
+# BridgeDb system code -> column of the datanodes TSV.
+_CODE_MAP = {
+    "En": "Ensembl",
+    "L": "NCBI gene",
+    "H": "HGNC",
+    "S": "UniProt",
+    "Wd": "Wikidata",
+    "Ce": "ChEBI",
+    "Ik": "InChI",
+    "Cpc": "PubChem",
+    "Cs": "ChemSpider",
+    "Ch": "HMDB",
+    "Ck": "KEGG",
+    "Lm": "LipidMaps",
+}
+
+_BASE_URL = (
+    "https://www.wikipathways.org/wikipathways-assets/pathways/{pathway}/"
+    "{pathway}-datanodes.tsv"
+)
+
+_COLUMNS = ["node", "label", "type", "system_code", "system", "xref", "identifier"]
+_CACHE_SIZE = 128
+_cache: "OrderedDict[str, Tuple[pd.DataFrame, Tuple[str, ...]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _parse_datanodes(raw: str) -> Tuple[pd.DataFrame, Tuple[str, ...]]:
+    """Parse a datanodes TSV into the long table and the TSV's system codes.
+
+    Every ``;``-separated identifier of every xref column becomes one row;
+    ``node`` is the datanode's row number so identifiers of the same node
+    can be linked. Within a system, rows keep the file order.
+    """
+    try:
+        wide = pd.read_csv(io.StringIO(raw), sep="\t", dtype=str, keep_default_na=False)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame(columns=_COLUMNS), ()
+    labels = wide["Label"] if "Label" in wide.columns else pd.Series("", index=wide.index)
+    types = wide["Type"] if "Type" in wide.columns else pd.Series("", index=wide.index)
+    present = tuple(code for code, column in _CODE_MAP.items() if column in wide.columns)
+
+    parts: List[pd.DataFrame] = []
+    for code in present:
+        xrefs = wide[_CODE_MAP[code]].str.split(";").explode().str.strip()
+        xrefs = xrefs[xrefs.notna() & (xrefs != "")]
+        parts.append(pd.DataFrame({
+            "node": xrefs.index.to_numpy(),
+            "system_code": code,
+            "system": _CODE_MAP[code],
+            "xref": xrefs.to_numpy(),
+        }))
+    if not parts:
+        return pd.DataFrame(columns=_COLUMNS), present
+
+    frame = pd.concat(parts, ignore_index=True)
+    frame.insert(1, "label", labels.to_numpy()[frame["node"].to_numpy()])
+    frame.insert(2, "type", types.to_numpy()[frame["node"].to_numpy()])
+    frame["identifier"] = frame["xref"].str.replace(r".*:", "", regex=True)
+    return frame, present
+
+
+def _fetch_datanodes(pathway: str) -> str:
+    url = _BASE_URL.format(pathway=pathway)
+    try:
+        return wikipathways_get(url).content.decode("utf-8")
+    except requests.HTTPError as exc:
+        status_code = exc.response.status_code if exc.response is not None else "unknown"
+        raise RuntimeError(f"Failed to retrieve TSV data ({status_code}).") from exc
+    except requests.RequestException as exc:
+        raise RuntimeError("Failed to retrieve TSV data (network error).") from exc
+
+
+def _datanodes(pathway: str, refresh: bool = False) -> Tuple[pd.DataFrame, Tuple[str, ...]]:
+    """Return the cached parse of ``pathway`` (LRU of ``_CACHE_SIZE`` pathways)."""
+    with _cache_lock:
+        entry = None if refresh else _cache.get(pathway)
+        if entry is not None:
+            _cache.move_to_end(pathway)
+    if metrics._sinks:
+        metrics.record_cache("datanodes", entry is not None)
+    if entry is not None:
+        return entry
+
+    raw = _fetch_datanodes(pathway)
+    with span("parse"):
+        entry = _parse_datanodes(raw)
+    with _cache_lock:
+        _cache[pathway] = entry
+        _cache.move_to_end(pathway)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return entry
+
+
+@instrument
+def get_datanodes(pathway: str | None = None, refresh: bool = False) -> pd.DataFrame:
+    """Return every datanode identifier of a pathway as a long table.
+
+    The ``{pathway}-datanodes.tsv`` asset is downloaded once and kept in a
+    small in-memory cache, so projections such as ``get_xref_list`` for
+    several systems cost a single download.
+
+    Parameters
+    ----------
+    pathway : str
+        WikiPathways identifier (for example ``"WP554"``).
+    refresh : bool, optional
+        Download the table again even if it is cached.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per identifier with columns ``node`` (datanode row number),
+        ``label``, ``type``, ``system_code`` (BridgeDb code, e.g. ``"L"``),
+        ``system`` (TSV column, e.g. ``"NCBI gene"``), ``xref`` (as in the
+        file, e.g. ``"ncbigene:1215"``) and ``identifier`` (prefix stripped).
+
+    Raises
+    ------
+    ValueError
+        If ``pathway`` is missing.
+    RuntimeError
+        If the remote TSV cannot be retrieved.
+
+    Examples
+    --------
+    >>> nodes = get_datanodes('WP554')
+    >>> nodes[nodes['system_code'] == 'S'][['label', 'identifier']]
+    """
+    if not pathway:
+        raise ValueError("Must provide a pathway identifier, e.g. 'WP554'.")
+    frame, _ = _datanodes(pathway, refresh)
+    return frame.copy()
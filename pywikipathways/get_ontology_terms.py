@@ -1,6 +1,12 @@
-import requests
 import pandas as pd
 
+from .backend import with_backend
+from .compact import _compact
+from .metrics import instrument
+from .snapshot import _snapshot_table
+from .tracing import span
+from .utilities import wikipathways_get_json
+
 
 def _normalize_exploded_column(df, column_name, prefix):
     exploded_df = df.explode(column_name).reset_index(drop=True)
@@ -11,71 +17,88 @@ def _normalize_exploded_column(df, column_name, prefix):
         normalized.columns = [f"{prefix}_{col}" for col in normalized.columns]
     return pd.concat([exploded_df.drop(column_name, axis=1), normalized], axis=1)
 
-# ----------------------------------------------------------------------
-# Get Ontology Terms by Pathway
-def get_ontology_terms(pathway=None):
+
+def _ontology_terms_frame():
     url = "https://www.wikipathways.org/json/getOntologyTermsByPathway.json"
-    res = requests.get(url).json()
+    res = wikipathways_get_json(url)
     pathways_data = res['pathways']
     res_df = pd.DataFrame(pathways_data)
     if 'terms' in res_df.columns:
-        res_df = _normalize_exploded_column(res_df, 'terms', 'terms')
-    
+        with span("normalize"):
+            res_df = _normalize_exploded_column(res_df, 'terms', 'terms')
+    return res_df
+
+
+def _pathways_by_ontology_term_frame():
+    url = "https://www.wikipathways.org/json/getPathwaysByOntologyTerm.json"
+    res = wikipathways_get_json(url)
+    pathways_data = res['terms']
+    res_df = pd.DataFrame(pathways_data)
+    if 'pathways' in res_df.columns:
+        with span("normalize"):
+            res_df = _normalize_exploded_column(res_df, 'pathways', 'pathways')
+    return res_df
+
+# ----------------------------------------------------------------------
+# Get Ontology Terms by Pathway
+@instrument
+@with_backend
+def get_ontology_terms(pathway=None, compact=False):
+    res_df = _snapshot_table("getOntologyTermsByPathway", _ontology_terms_frame)
+
     if pathway is not None:
         res_df = res_df[res_df["id"] == pathway]
 
-    return res_df.reset_index(drop=True)
+    return _compact(res_df.reset_index(drop=True), compact)
+
+def _annotated_terms(pathway):
+    from .ontology_index import get_ontology_index
+
+    index = get_ontology_index()
+    if pathway is None:
+        return index.terms
+    return index.terms[index.terms["id"].isin(index.terms_for(pathway))]
 
 # ----------------------------------------------------------------------
 # Get Ontology Term Names by Pathway
 def get_ontology_term_names(pathway=None):
-    df = get_ontology_terms(pathway)
-    return df["name"].dropna().unique().tolist()
+    """Return the names of the ontology terms annotated on ``pathway`` (or on any pathway)."""
+    return _annotated_terms(pathway)["name"].dropna().unique().tolist()
 
 # ----------------------------------------------------------------------
 # Get Ontology Term IDs by Pathway
 def get_ontology_term_ids(pathway=None):
-    df = get_ontology_terms(pathway)
-    return df["id"].dropna().unique().tolist()
+    """Return the IDs of the ontology terms annotated on ``pathway`` (or on any pathway)."""
+    return _annotated_terms(pathway)["id"].tolist()
 
 # ----------------------------------------------------------------------
 # Get Pathways by Ontology Term
-def get_pathways_by_ontology_term(term=None):
-    url = "https://www.wikipathways.org/json/getPathwaysByOntologyTerm.json"
-    res = requests.get(url).json()
-    pathways_data = res['terms']
-    res_df = pd.DataFrame(pathways_data)
-    if 'pathways' in res_df.columns:
-        res_df = _normalize_exploded_column(res_df, 'pathways', 'pathways')
-    
-    if term is not None:
-        res_df = res_df[res_df["id"] == term]
-    
-    return res_df.reset_index(drop=True)
+@instrument
+@with_backend
+def get_pathways_by_ontology_term(term=None, compact=False):
+    from .ontology_index import _term_table
+
+    res_df = _term_table().rows(term)
+    return _compact(res_df.reset_index(drop=True), compact)
 
 # ----------------------------------------------------------------------
 # Get Pathway WPIDs by Ontology Term
 def get_pathway_ids_by_ontology_term(term=None):
-    df = get_pathways_by_ontology_term(term)
+    df = get_pathways_by_ontology_term(term, backend="pandas")
     return df["pathways_id"].dropna().unique().tolist()
 
 # ----------------------------------------------------------------------
 # Get Pathways by Parent Ontology Term
-def get_pathways_by_parent_ontology_term(term=None):
-    url = "https://www.wikipathways.org/json/getOntologyTermsByPathway.json"
-    res = requests.get(url).json()
-    pathways_data = res['pathways']
-    res_df = pd.DataFrame(pathways_data)
-    if 'terms' in res_df.columns:
-        res_df = _normalize_exploded_column(res_df, 'terms', 'terms')
-    
-    if term is not None:
-        res_df = res_df[res_df["terms_parent"] == term]
+@instrument
+@with_backend
+def get_pathways_by_parent_ontology_term(term=None, compact=False):
+    from .ontology_index import get_ontology_index
 
-    return res_df.reset_index(drop=True)
+    res_df = get_ontology_index().rows_with_parent(term)
+    return _compact(res_df.reset_index(drop=True), compact)
 
 # ----------------------------------------------------------------------
 # Get Pathway WPIDs by Parent Ontology Term
 def get_pathway_ids_by_parent_ontology_term(term=None):
-    df = get_pathways_by_parent_ontology_term(term)
+    df = get_pathways_by_parent_ontology_term(term, backend="pandas")
     return df["id"].dropna().unique().tolist()
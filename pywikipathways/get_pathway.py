@@ -1,16 +1,23 @@
 """Python translation of the `getPathway` function from R/getPathway.R."""
 
 from __future__ import annotations
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable
 import requests
 from lxml import etree as ET
 
+from .gpml_store import _lookup
+from .metrics import instrument
+from .tracing import span
+from .utilities import wikipathways_get
+
 _BASE_URL = (
     "https://www.wikipathways.org/wikipathways-assets/pathways/{pathway}/"
     "{pathway}.gpml"
 )
 
 
+@instrument
 def get_pathway(pathway: str | None, revision: Any = 0) -> str:
     """Return the GPML content for the requested WikiPathways identifier.
 
@@ -27,6 +34,12 @@ def get_pathway(pathway: str | None, revision: Any = 0) -> str:
     str
         GPML document encoded as UTF-8 text.
 
+    Notes
+    -----
+    With a store activated by ``use_gpml_store``, the current revision of
+    the pathway is served from the store when present, and a download is
+    stored under it otherwise.
+
     Raises
     ------
     ValueError
@@ -38,10 +51,13 @@ def get_pathway(pathway: str | None, revision: Any = 0) -> str:
     if not pathway:
         raise ValueError("Must provide a pathway identifier, e.g. 'WP554'.")
 
+    store, known_revision, stored = _lookup(pathway)
+    if stored is not None:
+        return stored
+
     url = _BASE_URL.format(pathway=pathway)
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
+        response = wikipathways_get(url, timeout=30)
     except requests.HTTPError as exc:
         status_code = exc.response.status_code if exc.response else "unknown"
         raise RuntimeError(
@@ -52,14 +68,47 @@ def get_pathway(pathway: str | None, revision: Any = 0) -> str:
 
     xml_bytes = response.content
     try:
-        root = ET.fromstring(xml_bytes)
+        with span("parse"):
+            root = ET.fromstring(xml_bytes)
     except ET.XMLSyntaxError as exc:
         raise RuntimeError("Failed to parse GPML response.") from exc
 
-    xml_string = ET.tostring(
-        root, encoding="utf-8", xml_declaration=True
-    ).decode("utf-8").rstrip("\n")
+    with span("serialize"):
+        xml_string = ET.tostring(
+            root, encoding="utf-8", xml_declaration=True
+        ).decode("utf-8").rstrip("\n")
+    if known_revision is not None:
+        store.put(pathway, known_revision, xml_string)
     return xml_string
 
 
-__all__ = ["get_pathway"]
+@instrument
+def get_pathways(pathways: Iterable[str], max_workers: int = 8) -> Dict[str, str]:
+    """Return the GPML of several pathways, downloading them concurrently.
+
+    With a store activated by ``use_gpml_store``, only pathways whose
+    current revision is not stored yet are downloaded.
+
+    Parameters
+    ----------
+    pathways : iterable of str
+        WikiPathways identifiers.
+    max_workers : int, optional
+        Number of concurrent downloads.
+
+    Returns
+    -------
+    dict
+        WPID -> GPML document, in input order.
+
+    Raises
+    ------
+    RuntimeError
+        If a GPML cannot be retrieved or parsed.
+    """
+    pathways = list(dict.fromkeys(pathways))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(zip(pathways, pool.map(get_pathway, pathways)))
+
+
+__all__ = ["get_pathway", "get_pathways"]
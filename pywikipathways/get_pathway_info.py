@@ -1,7 +1,23 @@
-import requests
 import pandas as pd
 
-def get_pathway_info(pathway=None):
+from .backend import with_backend
+from .compact import _compact
+from .metrics import instrument
+from .snapshot import _pushdown_table, _snapshot_table
+from .tracing import span
+from .utilities import wikipathways_get_json
+
+def _pathway_info_frame():
+    url = "https://www.wikipathways.org/json/getPathwayInfo.json"
+    data = wikipathways_get_json(url)
+
+    # Extract pathwayInfo list and normalize into dataframe
+    with span("normalize"):
+        return pd.json_normalize(data["pathwayInfo"])
+
+@instrument
+@with_backend
+def get_pathway_info(pathway=None, columns=None, ids=None, species=None, compact=False):
     """
     Retrieve information for a specific pathway (or all pathways) from WikiPathways.
 
@@ -10,23 +26,53 @@ def get_pathway_info(pathway=None):
     pathway : str, optional
         WikiPathways identifier (WPID) for the pathway to download, e.g. 'WP554'.
         If None, then all pathways are returned.
+    columns : list of str, optional
+        Only return these columns, e.g. ``['id', 'revision']``.
+    ids : list of str, optional
+        Only return these WPIDs. Combined with ``pathway``, only ``pathway``
+        is returned, and only if it is among ``ids``.
+    species : str, optional
+        Only return pathways of this species, e.g. 'Homo sapiens'.
+    compact : bool or str, optional
+        Return repetitive string columns (species, ...) as categoricals;
+        ``"arrow"`` also stores the other string columns Arrow-backed.
+    backend : str, optional
+        ``"pandas"``, ``"pyarrow"`` or ``"polars"``; defaults to
+        ``get_backend()``.
 
     Returns
     -------
     pd.DataFrame
         DataFrame containing pathway info: WPID, URL, name, species, revision,
         authors, description, citedIn.
+
+    Notes
+    -----
+    When ``columns``, ``ids`` or ``species`` is given, records are filtered
+    and projected while the response is decoded, so unneeded fields such as
+    ``description`` are never materialized.
+
+    Examples
+    --------
+    >>> get_pathway_info(ids=['WP554', 'WP4868'], columns=['id', 'revision'])
     """
-    url = "https://www.wikipathways.org/json/getPathwayInfo.json"
-    res = requests.get(url)
-    res.raise_for_status()
-    data = res.json()
+    if columns is not None or ids is not None or species is not None:
+        filters = {}
+        if pathway is not None:
+            filters["id"] = [pathway] if ids is None or pathway in set(ids) else []
+        elif ids is not None:
+            filters["id"] = list(ids)
+        if species is not None:
+            filters["species"] = [species]
+        return _compact(
+            _pushdown_table("getPathwayInfo", columns, filters, pd.json_normalize), compact
+        )
 
-    # Extract pathwayInfo list and normalize into dataframe
-    df = pd.json_normalize(data["pathwayInfo"])
+    df = _snapshot_table("getPathwayInfo", _pathway_info_frame)
 
     # Filter if pathway is given
     if pathway is not None:
-        df = df[df["id"] == pathway]
+        with span("filter"):
+            df = df[df["id"] == pathway]
 
-    return df.reset_index(drop=True)
+    return _compact(df.reset_index(drop=True), compact)
@@ -3,12 +3,24 @@
 from __future__ import annotations
 
 import datetime as _dt
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Tuple
+import numpy as np
 import pandas as pd
 import requests
 
+from . import metrics, snapshot
+from .metrics import instrument
+from .snapshot import _snapshot_table
+from .tracing import span
+from .utilities import wikipathways_get_json
+
 _INFO_URL = "https://www.wikipathways.org/json/getPathwayInfo.json"
 _DROP_FIELDS = {"authors", "description", "citedIn"}
+# Seconds a revision index built from the live endpoint is reused.
+_INDEX_MAX_AGE = 300.0
+
+_cached_index: Tuple[object, "_RevisionIndex"] | None = None
 
 def _normalize_timestamp(timestamp: str | int | None) -> _dt.date:
     """Return the cutoff date derived from the provided timestamp."""
@@ -23,33 +35,18 @@ def _normalize_timestamp(timestamp: str | int | None) -> _dt.date:
         raise ValueError("Timestamp must be in YYYYMMDD format.") from exc
 
 
-def _parse_revision_date(raw: str | None) -> _dt.date | None:
-    """Convert revision text to a date if possible."""
-    if not raw:
-        return None
-    raw = raw.strip()
-    if not raw:
-        return None
-
-    iso_candidate = raw[:10]
-    try:
-        return _dt.date.fromisoformat(iso_candidate)
-    except ValueError:
-        pass
-
-    basic_candidate = raw[:8]
-    try:
-        return _dt.datetime.strptime(basic_candidate, "%Y%m%d").date()
-    except ValueError:
-        return None
+def _parse_revision_dates(revisions: pd.Series) -> pd.Series:
+    """Convert revision text to dates (``NaT`` where unparseable), vectorized."""
+    text = revisions.astype("string").str.strip()
+    iso = pd.to_datetime(text.str[:10], format="%Y-%m-%d", errors="coerce")
+    basic = pd.to_datetime(text.str[:8], format="%Y%m%d", errors="coerce")
+    return iso.fillna(basic)
 
 
 def _fetch_recent_changes_json() -> Dict[str, Any]:
     """Fetch the recent changes JSON payload."""
     try:
-        response = requests.get(_INFO_URL, timeout=30)
-        response.raise_for_status()
-        return response.json()
+        return wikipathways_get_json(_INFO_URL, timeout=30)
     except requests.HTTPError as exc:
         raise RuntimeError(
             f"Failed to retrieve JSON data ({exc.response.status_code})."
@@ -58,62 +55,122 @@ def _fetch_recent_changes_json() -> Dict[str, Any]:
         raise RuntimeError("Failed to retrieve JSON data (network error).") from exc
 
 
-def get_recent_changes(timestamp: str | int | None = None) -> pd.DataFrame:
-    """Return recently changed pathways filtered by timestamp.
+def _recent_changes_frame() -> pd.DataFrame:
+    """Build the pathway info table behind ``get_recent_changes``."""
+    payload = _fetch_recent_changes_json()
+    entries = [entry for entry in payload.get("pathwayInfo", []) if isinstance(entry, dict)]
+    return pd.json_normalize(entries)
+
+
+class _RevisionIndex:
+    """Pathway table with row positions sorted by parsed revision date."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame.drop(columns=[c for c in frame.columns if c in _DROP_FIELDS])
+        self.built = time.monotonic()
+        if "revision" not in self.frame.columns:
+            self.positions = np.empty(0, dtype=np.intp)
+            self.dates = np.empty(0, dtype="datetime64[ns]")
+            return
+        with span("parse_revisions"):
+            dates = _parse_revision_dates(self.frame["revision"]).to_numpy()
+        positions = np.flatnonzero(~np.isnat(dates))
+        order = np.argsort(dates[positions], kind="stable")
+        self.positions = positions[order]
+        self.dates = dates[self.positions]
+
+    def select(self, after: _dt.date | None = None, start: _dt.date | None = None,
+               end: _dt.date | None = None) -> pd.DataFrame:
+        """Return rows dated after ``after``/from ``start`` up to ``end`` inclusive."""
+        lo, hi = 0, len(self.dates)
+        if after is not None:
+            lo = np.searchsorted(self.dates, np.datetime64(after), side="right")
+        if start is not None:
+            lo = np.searchsorted(self.dates, np.datetime64(start), side="left")
+        if end is not None:
+            hi = np.searchsorted(self.dates, np.datetime64(end), side="right")
+        with span("select"):
+            rows = np.sort(self.positions[lo:max(lo, hi)])
+            return self.frame.iloc[rows].reset_index(drop=True)
+
+
+def _revision_index(refresh: bool = False) -> _RevisionIndex:
+    """Return the revision index, rebuilt per snapshot or when it gets stale."""
+    global _cached_index
+    owner = snapshot._active
+    stale = (
+        _cached_index is None
+        or _cached_index[0] is not owner
+        or (owner is None and time.monotonic() - _cached_index[1].built > _INDEX_MAX_AGE)
+    )
+    rebuild = refresh or stale
+    if metrics._sinks:
+        metrics.record_cache("revision_index", not rebuild)
+    if rebuild:
+        frame = _snapshot_table("getPathwayInfo", _recent_changes_frame)
+        _cached_index = (owner, _RevisionIndex(frame))
+    return _cached_index[1]
+
+
+@instrument
+def get_recent_changes(timestamp: str | int | None = None,
+                       start: str | int | None = None,
+                       end: str | int | None = None,
+                       refresh: bool = False) -> pd.DataFrame:
+    """Return recently changed pathways filtered by timestamp or date range.
+
+    Revision dates are parsed once into a sorted index that is shared by
+    later calls, so each cutoff or window is answered by binary search. The
+    index is rebuilt when another snapshot is activated, after five minutes
+    when served from the live endpoint, or when ``refresh`` is True.
 
     Parameters
     ----------
     timestamp : str | int | None, optional
         8-digit cutoff (YYYYMMDD). Pathways with revision dates after this value
-        are returned. Defaults to ``20070301`` when omitted.
+        are returned. Defaults to ``20070301`` when omitted and ``start`` is
+        not given.
+    start : str | int | None, optional
+        8-digit first revision date (inclusive) of the window. Cannot be
+        combined with ``timestamp``.
+    end : str | int | None, optional
+        8-digit last revision date (inclusive) of the window.
+    refresh : bool, optional
+        Re-download the pathway table instead of reusing the cached index.
 
     Returns
     -------
     pandas.DataFrame
         Table of pathway records excluding ``authors``, ``description``, and
-        ``citedIn`` fields.
+        ``citedIn`` fields, in the order of the source payload.
+
+    Examples
+    --------
+    >>> get_recent_changes('20240101')
+    >>> get_recent_changes(start='20240101', end='20240131')
     """
 
-    cutoff = _normalize_timestamp(timestamp)
-    payload = _fetch_recent_changes_json()
-    entries = payload.get("pathwayInfo", [])
-
-    template_columns: List[str] | None = None
-    records: List[Dict[str, Any]] = []
-    for entry in entries:
-        if not isinstance(entry, dict):
-            continue
-        revision_date = _parse_revision_date(entry.get("revision"))
-        if revision_date is None or revision_date <= cutoff:
-            continue
-        filtered = {k: v for k, v in entry.items() if k not in _DROP_FIELDS}
-        if template_columns is None:
-            template_columns = list(filtered.keys())
-        records.append(filtered)
-
-    if template_columns is None:
-        template_columns = []
-        for entry in entries:
-            if not isinstance(entry, dict):
-                continue
-            for key in entry.keys():
-                if key in _DROP_FIELDS or key in template_columns:
-                    continue
-                template_columns.append(key)
-
-    frame = pd.DataFrame.from_records(records, columns=template_columns)
-    return frame
-
-
-def get_recent_changes_ids(timestamp: str | int | None = None) -> List[Any]:
+    if timestamp is not None and start is not None:
+        raise ValueError("Provide either a timestamp or a start date, not both.")
+    after = None if start is not None else _normalize_timestamp(timestamp)
+    lower = None if start is None else _normalize_timestamp(start)
+    upper = None if end is None else _normalize_timestamp(end)
+    return _revision_index(refresh).select(after, lower, upper)
+
+
+def get_recent_changes_ids(timestamp: str | int | None = None,
+                           start: str | int | None = None,
+                           end: str | int | None = None) -> List[Any]:
     """Return pathway IDs for recent changes after the given timestamp."""
-    frame = get_recent_changes(timestamp)
+    frame = get_recent_changes(timestamp, start, end)
     return frame.get("id", pd.Series(dtype=object)).tolist()
 
 
-def get_recent_changes_names(timestamp: str | int | None = None) -> List[Any]:
+def get_recent_changes_names(timestamp: str | int | None = None,
+                             start: str | int | None = None,
+                             end: str | int | None = None) -> List[Any]:
     """Return pathway names for recent changes after the given timestamp."""
-    frame = get_recent_changes(timestamp)
+    frame = get_recent_changes(timestamp, start, end)
     return frame.get("name", pd.Series(dtype=object)).tolist()
 
 
@@ -2,46 +2,22 @@
 
 from __future__ import annotations
 
-import csv
-import io
-import re
-import urllib.error
-import urllib.request
-from typing import Iterable, List
+from typing import List
 
-
-_CODE_MAP = {
-    "En": "Ensembl",
-    "L": "NCBI gene",
-    "H": "HGNC",
-    "S": "UniProt",
-    "Wd": "Wikidata",
-    "Ce": "ChEBI",
-    "Ik": "InChI",
-    "Cpc": "PubChem",
-    "Cs": "ChemSpider",
-    "Ch": "HMDB",
-    "Ck": "KEGG",
-    "Lm": "LipidMaps",
-}
-
-_BASE_URL = (
-    "https://www.wikipathways.org/wikipathways-assets/pathways/{pathway}/"
-    "{pathway}-datanodes.tsv"
-)
-
-
-def _unique_preserve_order(values: Iterable[str]) -> List[str]:
-    """Return unique values while preserving first-seen order."""
-    seen = {}
-    return [seen.setdefault(v, v) for v in values if v not in seen]
+from .get_datanodes import _CODE_MAP, _datanodes
+from .metrics import instrument
 
 
+@instrument
 def get_xref_list(pathway: str | None = None,
                   system_code: str | None = None,
                   compact: bool = False) -> List[str]:
     """Return Xref identifiers for the given pathway and system code.
 
+    This is a projection of ``get_datanodes``: the datanodes table is
+    downloaded once per pathway and cached, so asking for several systems
+    costs a single download.
+
     Parameters
     ----------
     pathway : str
@@ -73,36 +49,11 @@ def get_xref_list(pathway: str | None = None,
     if system_code not in _CODE_MAP:
         raise ValueError("Unsupported system code; see BridgeDb datasources.")
 
-    url = _BASE_URL.format(pathway=pathway)
-
-    try:
-        with urllib.request.urlopen(url) as response:
-            raw = response.read().decode("utf-8")
-    except urllib.error.HTTPError as exc:
-        raise RuntimeError(f"Failed to retrieve TSV data ({exc.code}).") from exc
-    except urllib.error.URLError as exc:
-        raise RuntimeError("Failed to retrieve TSV data (network error).") from exc
-
-    column = _CODE_MAP[system_code]
-    reader = csv.DictReader(io.StringIO(raw), delimiter="\t")
-    if not reader.fieldnames or column not in reader.fieldnames:
+    frame, present = _datanodes(pathway)
+    if system_code not in present:
         raise RuntimeError(
-            f"Column '{column}' is not present in the downloaded TSV file."
+            f"Column '{_CODE_MAP[system_code]}' is not present in the downloaded TSV file."
         )
 
-    values: List[str] = []
-    for row in reader:
-        raw_value = row.get(column)
-        if not raw_value:
-            continue
-        for item in raw_value.split(";"):
-            item = item.strip()
-            if item:
-                values.append(item)
-
-    unique_values = _unique_preserve_order(values)
-
-    if not compact:
-        unique_values = [re.sub(r".*:", "", value) for value in unique_values]
-
-    return unique_values
+    selected = frame[frame["system_code"].to_numpy() == system_code].drop_duplicates("xref")
+    return selected["xref" if compact else "identifier"].tolist()
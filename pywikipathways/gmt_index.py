@@ -0,0 +1,231 @@
+"""Sidecar offset index for random access to gene sets in large GMT files."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+import zipfile
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .tracing import span
+
+__all__ = ["GmtIndex", "build_gmt_index", "get_gene_set"]
+
+_FORMAT_VERSION = 1
+_SUFFIX = ".idx.npz"
+
+_indexes: Dict[str, "GmtIndex"] = {}
+_lock = threading.Lock()
+
+
+class GmtIndex:
+    """Byte offset and length of every line of a GMT file, by term and WPID.
+
+    Terms and the WPIDs of WikiPathways headers
+    (``name%version%WPID%organism``) are kept in sorted arrays, so a lookup
+    is a binary search followed by one slice of the memory-mapped file.
+
+    Parameters
+    ----------
+    file : str
+        The GMT file.
+    terms, wpids : numpy.ndarray
+        Term and WPID (empty for other GMTs) of every line.
+    offsets, lengths : numpy.ndarray
+        ``int64`` byte offset and length of every line.
+    stamp : tuple of int
+        Size and modification time (ns) of ``file`` when it was indexed.
+    """
+
+    def __init__(self, file: str, terms: np.ndarray, wpids: np.ndarray,
+                 offsets: np.ndarray, lengths: np.ndarray, stamp: Tuple[int, int]):
+        self.file = file
+        self.terms = terms
+        self.wpids = wpids
+        self.offsets = offsets
+        self.lengths = lengths
+        self.stamp = stamp
+        self._lookups = []
+        for keys in (terms, wpids):
+            order = np.argsort(keys, kind="stable")
+            self._lookups.append((keys[order], order))
+        self._map: mmap.mmap | None = None
+        self._map_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __repr__(self) -> str:
+        return f"GmtIndex('{self.file}', {len(self)} gene sets)"
+
+    def __contains__(self, term: str) -> bool:
+        return self._position(term) is not None
+
+    @property
+    def stale(self) -> bool:
+        """True if the GMT file changed since it was indexed."""
+        return _stamp(self.file) != self.stamp
+
+    def _position(self, term: str) -> int | None:
+        for ranked, order in self._lookups:
+            found = int(np.searchsorted(ranked, term))
+            if found < len(ranked) and ranked[found] == term:
+                return int(order[found])
+        return None
+
+    def _bytes(self, position: int) -> bytes:
+        start = int(self.offsets[position])
+        # Sliced under the lock so a concurrent close() cannot unmap mid-read.
+        with self._map_lock:
+            if self._map is None:
+                with open(self.file, "rb") as handle:
+                    self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._map[start:start + int(self.lengths[position])]
+
+    def record(self, term: str) -> List[str]:
+        """Return the ``[term, description, gene, ...]`` fields of ``term``.
+
+        ``term`` is a full GMT term or, for WikiPathways GMTs, a WPID.
+        """
+        position = self._position(term)
+        if position is None:
+            raise KeyError(term)
+        return self._bytes(position).decode("utf-8").rstrip("\r\n").split("\t")
+
+    def gene_set(self, term: str) -> List[str]:
+        """Return the genes of ``term`` (a full GMT term or a WPID)."""
+        return self.record(term)[2:]
+
+    def close(self) -> None:
+        """Release the memory map."""
+        with self._map_lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+    def save(self, path: str) -> None:
+        """Write the offsets to an ``.npz`` sidecar file, replacing it atomically."""
+        with open(path + ".tmp", "wb") as handle:
+            np.savez(handle, format_version=np.array(_FORMAT_VERSION), terms=self.terms,
+                     wpids=self.wpids, offsets=self.offsets, lengths=self.lengths,
+                     stamp=np.array(self.stamp, dtype=np.int64))
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, file: str, path: str) -> "GmtIndex":
+        """Read a sidecar written by ``save`` for ``file``."""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported GMT index format in '{path}'.")
+            return cls(file, data["terms"], data["wpids"], data["offsets"], data["lengths"],
+                       tuple(int(value) for value in data["stamp"]))
+
+
+def _stamp(file: str) -> Tuple[int, int]:
+    info = os.stat(file)
+    return info.st_size, info.st_mtime_ns
+
+
+def _scan(file: str) -> GmtIndex:
+    stamp = _stamp(file)
+    terms: List[str] = []
+    wpids: List[str] = []
+    offsets: List[int] = []
+    lengths: List[int] = []
+    offset = 0
+    with open(file, "rb") as handle:
+        for line in handle:
+            fields = line.rstrip(b"\r\n").split(b"\t", 2)
+            if len(fields) >= 2:
+                term = fields[0].decode("utf-8")
+                parts = term.split("%")
+                terms.append(term)
+                wpids.append(parts[2] if len(parts) == 4 else "")
+                offsets.append(offset)
+                lengths.append(len(line))
+            offset += len(line)
+    return GmtIndex(file, np.asarray(terms, dtype=str), np.asarray(wpids, dtype=str),
+                    np.asarray(offsets, dtype=np.int64), np.asarray(lengths, dtype=np.int64),
+                    stamp)
+
+
+def build_gmt_index(file: str, path: str | None = None) -> GmtIndex:
+    """Index the lines of a GMT file and save the offsets next to it.
+
+    Parameters
+    ----------
+    file : str
+        GMT file, e.g. from ``download_pathway_archive(format='gmt')`` or
+        ``compile_gmt``.
+    path : str, optional
+        Sidecar file; defaults to ``file + '.idx.npz'``. If it cannot be
+        written (e.g. a read-only directory) the index is only kept in
+        memory.
+
+    Returns
+    -------
+    GmtIndex
+    """
+    with span("index"):
+        index = _scan(file)
+    try:
+        index.save(path or file + _SUFFIX)
+    except OSError:
+        pass
+    return index
+
+
+def _index_for(file: str) -> GmtIndex:
+    """Return the index of ``file``: cached, read from its sidecar, or built."""
+    key = os.path.abspath(file)
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None and not index.stale:
+            return index
+        # A stale index is only dropped: other threads may still be reading
+        # through it, and its map is released when the last one is done.
+        index = None
+        sidecar = file + _SUFFIX
+        if os.path.exists(sidecar):
+            try:
+                index = GmtIndex.load(file, sidecar)
+            except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+                index = None
+        if index is None or index.stale:
+            index = build_gmt_index(file)
+        _indexes[key] = index
+        return index
+
+
+def get_gene_set(file: str, term: str) -> List[str]:
+    """Return the genes of one gene set of a GMT file without reading it all.
+
+    The first call builds a sidecar offset index (``file + '.idx.npz'``)
+    unless an up-to-date one exists; later calls binary-search it and read
+    only the requested line from a memory map. The index is rebuilt when
+    the GMT file changes.
+
+    Parameters
+    ----------
+    file : str
+        GMT file.
+    term : str
+        Full GMT term or, for WikiPathways GMTs, a WPID such as ``"WP554"``.
+
+    Returns
+    -------
+    list of str
+
+    Raises
+    ------
+    KeyError
+        If the file has no gene set for ``term``.
+
+    Examples
+    --------
+    >>> get_gene_set('wikipathways-20240110-gmt-Homo_sapiens.gmt', 'WP554')
+    """
+    return _index_for(file).gene_set(term)
@@ -0,0 +1,235 @@
+"""Local GPML store keyed by (WPID, revision) and deduplicated by content hash."""
+
+from __future__ import annotations
+
+import contextlib
+import datetime as _dt
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, Tuple
+
+from . import metrics
+from .get_recent_changes import _revision_index
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not POSIX
+    fcntl = None
+
+__all__ = ["GpmlStore", "use_gpml_store", "get_gpml_store"]
+
+_MANIFEST_FILE = "store.json"
+_LOCK_FILE = "refs.lock"
+_FORMAT_VERSION = 2
+
+_active: "GpmlStore | None" = None
+_revisions: Tuple[object, Dict[str, str]] | None = None
+
+
+def _today() -> str:
+    return _dt.datetime.now(_dt.timezone.utc).date().isoformat()
+
+
+def _revision_day(revision: str) -> str | None:
+    """Return the ISO date of a date-like revision, or None for an exact ID."""
+    text = revision.strip()
+    for fmt, width in (("%Y-%m-%d", 10), ("%Y%m%d", 8)):
+        try:
+            return _dt.datetime.strptime(text[:width], fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+class GpmlStore:
+    """A directory of GPML documents addressed by their SHA-256.
+
+    ``refs/<WPID>.json`` maps each revision of a pathway to the digest of
+    its GPML and the (UTC) day it was fetched; the documents live under
+    ``objects/<digest[:2]>/<digest>.gpml``, so a revision that only touched
+    metadata shares its GPML with the previous one. Ref files are updated
+    under an ``fcntl`` lock, so several processes can fill one store.
+
+    Parameters
+    ----------
+    path : str
+        Store directory. It is created if missing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(path, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(path, "refs"), exist_ok=True)
+        manifest = os.path.join(path, _MANIFEST_FILE)
+        try:
+            with open(manifest, encoding="utf-8") as handle:
+                state = json.load(handle)
+        except FileNotFoundError:
+            if os.path.exists(os.path.join(path, "refs.json")):
+                raise ValueError(f"Unsupported GPML store format in '{path}'.") from None
+            state = {"format_version": _FORMAT_VERSION}
+            with open(manifest + ".tmp", "w", encoding="utf-8") as handle:
+                json.dump(state, handle)
+            os.replace(manifest + ".tmp", manifest)
+        if state.get("format_version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported GPML store format in '{path}'.")
+
+    def __repr__(self) -> str:
+        count = sum(name.endswith(".json") for name in os.listdir(os.path.join(self.path, "refs")))
+        return f"GpmlStore('{self.path}', {count} pathways)"
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.path, "objects", digest[:2], digest + ".gpml")
+
+    def _ref_path(self, pathway: str) -> str:
+        return os.path.join(self.path, "refs", pathway + ".json")
+
+    def _refs(self, pathway: str) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self._ref_path(pathway), encoding="utf-8") as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return {}
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the thread lock and, on POSIX, an exclusive lock on the refs."""
+        with self._lock, open(os.path.join(self.path, _LOCK_FILE), "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def revisions(self, pathway: str) -> Dict[str, str]:
+        """Return the stored revisions of ``pathway`` as ``{revision: digest}``."""
+        return {revision: entry["digest"] for revision, entry in self._refs(pathway).items()}
+
+    def _entry(self, pathway: str, revision: str) -> Dict[str, str] | None:
+        return self._refs(pathway).get(str(revision))
+
+    def _read(self, digest: str) -> str | None:
+        try:
+            with open(self._object_path(digest), encoding="utf-8") as handle:
+                return handle.read()
+        except FileNotFoundError:
+            return None
+
+    def get(self, pathway: str, revision: str) -> str | None:
+        """Return the GPML of ``pathway`` at ``revision``, or None if not stored."""
+        entry = self._entry(pathway, revision)
+        return None if entry is None else self._read(entry["digest"])
+
+    def put(self, pathway: str, revision: str, gpml: str) -> str:
+        """Store ``gpml`` as ``pathway`` at ``revision`` and return its digest.
+
+        Only the ref file of ``pathway`` is rewritten, after re-reading it
+        under the store lock, so concurrent writers do not lose entries.
+        """
+        content = gpml.encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as handle:
+                handle.write(content)
+            os.replace(tmp, path)
+        with self._locked():
+            refs = self._refs(pathway)
+            refs[str(revision)] = {"digest": digest, "fetched": _today()}
+            ref_path = self._ref_path(pathway)
+            with open(ref_path + ".tmp", "w", encoding="utf-8") as handle:
+                json.dump(refs, handle, indent=2, sort_keys=True)
+            os.replace(ref_path + ".tmp", ref_path)
+        return digest
+
+
+def use_gpml_store(path: str | None) -> GpmlStore | None:
+    """Serve ``get_pathway`` from a local GPML store.
+
+    Before downloading, ``get_pathway`` looks up the pathway's current
+    revision in the ``getPathwayInfo`` table (shared with
+    ``get_recent_changes`` and refreshed every five minutes, or read from an
+    active snapshot). If that revision is stored, no GPML is downloaded;
+    otherwise the download is stored under it. If the table cannot be
+    retrieved, the GPML is downloaded without touching the store.
+
+    Notes
+    -----
+    Revisions in the table are dates, so two edits on the same day share a
+    revision. A stored copy is therefore only served once it was fetched on
+    a later (UTC) day than its revision date; until then every call
+    downloads the pathway and refreshes the copy. An edit published after
+    that fetch, on the revision day, is not detected.
+
+    Parameters
+    ----------
+    path : str or None
+        Store directory, or None to always download.
+
+    Returns
+    -------
+    GpmlStore or None
+
+    Examples
+    --------
+    >>> use_gpml_store('gpml-store')
+    >>> get_pathways(['WP554', 'WP4868'])
+    """
+    global _active
+    _active = None if path is None else GpmlStore(path)
+    return _active
+
+
+def get_gpml_store() -> GpmlStore | None:
+    """Return the store activated by ``use_gpml_store``."""
+    return _active
+
+
+def _known_revision(pathway: str) -> str | None:
+    """Return the current revision of ``pathway`` from the pathway info table."""
+    global _revisions
+    index = _revision_index()
+    if _revisions is None or _revisions[0] is not index:
+        frame = index.frame
+        known = {}
+        if "id" in frame.columns and "revision" in frame.columns:
+            known = dict(zip(frame["id"].astype(str), frame["revision"].astype(str)))
+        _revisions = (index, known)
+    return _revisions[1].get(pathway)
+
+
+def _settled(revision: str, entry: Dict[str, Any]) -> bool:
+    """True if no later edit can share ``revision`` with the stored copy."""
+    day = _revision_day(revision)
+    return day is None or entry.get("fetched", "") > day
+
+
+def _lookup(pathway: str) -> Tuple[GpmlStore | None, str | None, str | None]:
+    """Return the active store, the known revision and the stored GPML if any.
+
+    The revision is None when the pathway info table is unavailable, so the
+    caller downloads the GPML and leaves the store alone.
+    """
+    store = _active
+    if store is None:
+        return None, None, None
+    try:
+        revision = _known_revision(pathway)
+    except RuntimeError:
+        return store, None, None
+    if revision is None:
+        return store, None, None
+    entry = store._entry(pathway, revision)
+    gpml = None
+    if entry is not None and _settled(revision, entry):
+        gpml = store._read(entry["digest"])
+    if metrics._sinks:
+        metrics.record_cache("gpml_store", gpml is not None)
+    return store, revision, gpml
@@ -0,0 +1,204 @@
+"""Incremental decoding of the record arrays in WikiPathways JSON payloads."""
+
+from __future__ import annotations
+
+import codecs
+import contextlib
+import json
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+import requests
+
+from .utilities import wikipathways_get
+
+__all__ = ["iter_pathway_records"]
+
+_JSON_URL = "https://www.wikipathways.org/json/{endpoint}.json"
+_CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\r\n"
+_DECODER = json.JSONDecoder()
+
+# Location of the record array in each payload; the default is
+# {"pathwayInfo": [...]}. listPathways nests pathways under organisms.
+_RECORD_PATHS: Dict[str, Tuple[str, ...]] = {
+    "listPathways": ("organisms", "pathways"),
+    "listCommunities": ("communities",),
+    "listOrganisms": ("organisms",),
+    "getOntologyTermsByPathway": ("pathways",),
+    "getPathwaysByOntologyTerm": ("terms",),
+}
+
+
+class _JsonStream:
+    """A text buffer over byte chunks that decodes one JSON value at a time."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping consumed text. False at the end."""
+        if self.eof:
+            return False
+        text = ""
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                break
+        else:
+            text = self._decoder.decode(b"", final=True)
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON payload.")
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON payload, found {found!r}.")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A value ending exactly at the buffer end (e.g. a number) may
+            # continue in the next chunk.
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def _iter_array(stream: _JsonStream, path: Tuple[str, ...]) -> Iterator[Any]:
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.pos += 1
+        return
+    while True:
+        item = stream.value()
+        if len(path) > 1:
+            yield from _lookup(item, path[1:])
+        else:
+            yield item
+        if stream.peek() == ",":
+            stream.pos += 1
+            continue
+        stream.expect("]")
+        return
+
+
+def _lookup(item: Any, path: Tuple[str, ...]) -> Iterator[Any]:
+    for key in path[:-1]:
+        item = item.get(key) if isinstance(item, dict) else None
+    records = item.get(path[-1]) if isinstance(item, dict) else None
+    yield from records or ()
+
+
+def _iter_records(chunks: Iterable[bytes], path: Tuple[str, ...]) -> Iterator[Any]:
+    """Yield the elements of the array at ``path`` of a JSON object stream.
+
+    Only the array under ``path[0]`` is streamed; its elements (and any other
+    top-level members, which are skipped) are decoded one at a time. A
+    payload without that array raises RuntimeError.
+    """
+    stream = _JsonStream(chunks)
+    stream.expect("{")
+    found = False
+    if stream.peek() == "}":
+        stream.pos += 1
+    else:
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if key == path[0] and stream.peek() == "[":
+                found = True
+                yield from _iter_array(stream, path)
+            else:
+                stream.value()
+            if stream.peek() == ",":
+                stream.pos += 1
+                continue
+            stream.expect("}")
+            break
+    if not found:
+        raise RuntimeError(f"API response missing expected '{path[0]}' records.")
+
+
+def iter_pathway_records(endpoint: str = "getPathwayInfo",
+                         chunk_size: int = _CHUNK_SIZE) -> Iterator[Any]:
+    """Iterate the records of a WikiPathways JSON endpoint as they download.
+
+    Unlike the DataFrame functions, the payload is never decoded as a whole:
+    each record is parsed from the response stream and handed to the caller,
+    so per-record filters and projections keep peak memory proportional to
+    what the caller retains.
+
+    Parameters
+    ----------
+    endpoint : str, optional
+        Endpoint name such as ``"findPathwaysByText"`` (a ``.json`` suffix
+        or a full URL is accepted too).
+    chunk_size : int, optional
+        Bytes read from the socket at a time.
+
+    Yields
+    ------
+    dict or str
+        One record: a pathway (one pathway per organism for
+        ``listPathways``), community or ontology term dict, or an organism
+        name string for ``listOrganisms``.
+
+    Raises
+    ------
+    RuntimeError
+        If the endpoint cannot be retrieved or its payload lacks the
+        expected record array.
+    ValueError
+        If the payload is not valid JSON.
+
+    Examples
+    --------
+    >>> ids = [record['id'] for record in iter_pathway_records('findPathwaysByText')
+    ...        if 'cancer' in record['name'].lower()]
+    """
+    if "://" in endpoint:
+        url = endpoint
+    else:
+        endpoint = endpoint[:-5] if endpoint.endswith(".json") else endpoint
+        url = _JSON_URL.format(endpoint=endpoint)
+    name = url.rsplit("/", 1)[-1]
+    name = name[:-5] if name.endswith(".json") else name
+    path = _RECORD_PATHS.get(name, ("pathwayInfo",))
+
+    try:
+        response = wikipathways_get(url, stream=True, timeout=30)
+    except requests.HTTPError as exc:
+        status_code = exc.response.status_code if exc.response is not None else "unknown"
+        raise RuntimeError(f"Failed to retrieve {name} ({status_code}).") from exc
+    except requests.RequestException as exc:
+        raise RuntimeError(f"Failed to retrieve {name} (network error).") from exc
+
+    with contextlib.closing(response):
+        yield from _iter_records(response.iter_content(chunk_size), path)
@@ -1,6 +1,22 @@
 import requests
 import pandas
 
+from .backend import with_backend
+from .metrics import instrument
+from .snapshot import _snapshot_table
+from .utilities import wikipathways_get_json
+
+def _communities_frame():
+    data = wikipathways_get_json('https://www.wikipathways.org/json/listCommunities.json')
+
+    if 'communities' not in data:
+        print("API response missing expected communities data structure")
+        return None
+
+    return pandas.DataFrame(data['communities'])
+
+@instrument
+@with_backend
 def list_communities():
     """List Communities
     
@@ -17,33 +33,17 @@ def list_communities():
         1     COVID-19  COVID-19 Community                    NaN  Community portal for...
     """
     try:
-        response = requests.get('https://www.wikipathways.org/json/listCommunities.json')
-        response.raise_for_status()
-        data = response.json()
-        
-        if 'communities' not in data:
-            print("API response missing expected communities data structure")
+        communities = _snapshot_table('listCommunities', _communities_frame)
+        if communities is None:
             return None
-            
-        communities = data['communities']
         
         if len(communities) == 0:
             print("No results")
             return None
         
         # Extract community-level information (first 5 columns in R implementation)
-        community_info = []
-        for community in communities:
-            community_data = {
-                'display-name': community.get('display-name'),
-                'title': community.get('title'),
-                'short-description': community.get('short-description'),
-                'community-tag': community.get('community-tag'),
-                'editors': community.get('editors')
-            }
-            community_info.append(community_data)
-        
-        df = pandas.DataFrame(community_info).reset_index(drop=True)
+        columns = ['display-name', 'title', 'short-description', 'community-tag', 'editors']
+        df = communities.reindex(columns=columns).reset_index(drop=True)
         return df
         
     except requests.exceptions.RequestException as e:
@@ -54,6 +54,8 @@ def list_communities():
         return None
 
 
+@instrument
+@with_backend
 def get_pathways_by_community(community_tag=None):
     """Get Pathways By Community
     
@@ -76,29 +78,22 @@ def get_pathways_by_community(community_tag=None):
         return None
     
     try:
-        response = requests.get('https://www.wikipathways.org/json/listCommunities.json')
-        response.raise_for_status()
-        data = response.json()
-        
-        if 'communities' not in data:
-            print("API response missing expected communities data structure")
+        communities = _snapshot_table('listCommunities', _communities_frame)
+        if communities is None:
             return None
-            
-        communities = data['communities']
+        
+        tags = communities.get('community-tag', pandas.Series(dtype=object))
         
         # Find the specified community
-        target_community = None
-        for community in communities:
-            if community.get('community-tag') == community_tag:
-                target_community = community
-                break
+        matches = communities[tags == community_tag]
                 
-        if target_community is None:
-            print(f"Must provide a valid community_tag, e.g., AOP. Available tags: {[c.get('community-tag') for c in communities]}")
+        if matches.empty:
+            print(f"Must provide a valid community_tag, e.g., AOP. Available tags: {tags.tolist()}")
             return None
             
-        # Extract pathway information
-        pathways = target_community.get('pathways', [])
+        # Extract pathway information (snapshots hand nested lists back as arrays)
+        pathways = matches.iloc[0].get('pathways')
+        pathways = list(pathways) if pandas.api.types.is_list_like(pathways) else []
         
         if len(pathways) == 0:
             print(f"No pathways found for community: {community_tag}")
@@ -133,7 +128,7 @@ def get_pathway_ids_by_community(community_tag=None):
         1    WP1000
         Name: id, dtype: object
     """
-    res = get_pathways_by_community(community_tag)
+    res = get_pathways_by_community(community_tag, backend="pandas")
     if res is None:
         return None
     return res['id'] if 'id' in res.columns else None
@@ -157,7 +152,7 @@ def get_pathway_names_by_community(community_tag=None):
         1     Example pathway 2
         Name: name, dtype: object
     """
-    res = get_pathways_by_community(community_tag)
+    res = get_pathways_by_community(community_tag, backend="pandas")
     if res is None:
         return None
     return res['name'] if 'name' in res.columns else None
@@ -181,7 +176,7 @@ def get_pathway_urls_by_community(community_tag=None):
         1     https://www.wikipathways.org/index.php/Pathway...
         Name: url, dtype: object
     """
-    res = get_pathways_by_community(community_tag)
+    res = get_pathways_by_community(community_tag, backend="pandas")
     if res is None:
         return None
     return res['url'] if 'url' in res.columns else None
\ No newline at end of file
@@ -1,5 +1,15 @@
 import requests
+import pandas
 
+from .metrics import instrument
+from .snapshot import _snapshot_table
+from .utilities import wikipathways_get_json
+
+def _organisms_frame():
+    data = wikipathways_get_json("https://www.wikipathways.org/json/listOrganisms.json")
+    return pandas.DataFrame({'organism': data['organisms']})
+
+@instrument
 def list_organisms():
     """List Organisms.
 
@@ -12,9 +22,7 @@ def list_organisms():
         >>> list_organisms()
     """
     try:
-        res = requests.get("https://www.wikipathways.org/json/listOrganisms.json")
-        res.raise_for_status()
-        return res.json()['organisms']
+        return _snapshot_table('listOrganisms', _organisms_frame)['organism'].tolist()
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data: {e}")
         return None
@@ -1,7 +1,31 @@
 import requests
 import pandas
 
-def list_pathways(organism=""):
+from .backend import with_backend
+from .compact import _compact
+from .metrics import instrument
+from .snapshot import _pushdown_table, _snapshot_table
+from .tracing import span
+from .utilities import wikipathways_get_json
+
+def _list_pathways_frame():
+    data = wikipathways_get_json('https://www.wikipathways.org/json/listPathways.json')
+
+    if 'organisms' not in data:
+        print("API response missing expected organisms data structure")
+        return None
+
+    pathways = []
+    for organism_entry in data['organisms']:
+        # Each organism entry contains a list of pathway dictionaries
+        pathways.extend(organism_entry.get('pathways', []))
+
+    with span("dataframe"):
+        return pandas.DataFrame(pathways).reset_index(drop=True)
+
+@instrument
+@with_backend
+def list_pathways(organism="", columns=None, ids=None, compact=False):
     """List Pathways
 
     Retrieve list of pathways per species, including WPID, name,
@@ -9,6 +33,16 @@ def list_pathways(organism=""):
 
     Args:
         organism (str): A particular species.
+        columns (list of str, optional): Only return these columns. Records are
+            projected while the response is decoded.
+        ids (list of str, optional): Only return these WPIDs. Like ``organism``,
+            applied while the response is decoded when ``columns`` or ``ids``
+            is given.
+        compact (bool or str, optional): Return repetitive string columns such
+            as species as categoricals; ``"arrow"`` also stores the other string
+            columns Arrow-backed. See ``compact_frame``.
+        backend (str, optional): "pandas", "pyarrow" or "polars"; defaults to
+            ``get_backend()``.
 
     Returns:
         pandas.DataFrame or None: A dataframe of pathway information, or None if
@@ -31,33 +65,33 @@ def list_pathways(organism=""):
         235 rows × 5 columns
     """
     try:
-        response = requests.get('https://www.wikipathways.org/json/listPathways.json')
-        response.raise_for_status()
-        data = response.json()
+        if columns is not None or ids is not None:
+            filters = {'species': [organism]} if organism else {}
+            if ids is not None:
+                filters['id'] = ids
+            df = _pushdown_table('listPathways', columns, filters)
+            if len(df) == 0:
+                print(f"No results for organism: {organism}" if organism else "No results")
+                return None
+            return _compact(df, compact)
 
-        if 'organisms' not in data:
-            print("API response missing expected organisms data structure")
+        df = _snapshot_table('listPathways', _list_pathways_frame)
+        if df is None:
             return None
 
-        pathways = []
-        for organism_entry in data['organisms']:
-            # Each organism entry contains a list of pathway dictionaries
-            pathways.extend(organism_entry.get('pathways', []))
-
-        if len(pathways) == 0:
+        if len(df) == 0:
             print("No results")
             return None
 
-        df = pandas.DataFrame(pathways).reset_index(drop=True)
-
         if organism:
-            filtered_df = df[df['species'] == organism]
+            with span("filter"):
+                filtered_df = df[df['species'] == organism]
             if len(filtered_df) == 0:
                 print(f"No results for organism: {organism}")
                 return None
-            return filtered_df.reset_index(drop=True)
+            return _compact(filtered_df.reset_index(drop=True), compact)
 
-        return df
+        return _compact(df, compact)
 
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data: {e}")
@@ -93,7 +127,7 @@ def list_pathway_ids(organism=""):
         234     WP93
         Name: id, Length: 235, dtype: object
     """
-    res = list_pathways(organism)
+    res = list_pathways(organism, backend="pandas")
     if res is None:
         return None
     return res['id']
@@ -125,7 +159,7 @@ def list_pathway_names(organism=""):
         234                  IL-4 signaling pathway
         Name: name, Length: 235, dtype: object
     """
-    res = list_pathways(organism)
+    res = list_pathways(organism, backend="pandas")
     if res is None:
         return None
     return res['name']
@@ -157,7 +191,7 @@ def list_pathway_urls(organism=""):
         234    https://www.wikipathways.org/index.php/Pathway...
         Name: url, Length: 235, dtype: object
     """
-    res = list_pathways(organism)
+    res = list_pathways(organism, backend="pandas")
     if res is None:
         return None
     return res['url']
@@ -0,0 +1,206 @@
+"""Opt-in metrics for requests, bytes, cache hits, parse time and rows.
+
+Nothing is recorded until ``enable_metrics`` or ``add_metrics_callback`` is
+called; until then every hook is a single truthiness check.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from . import tracing
+
+_sinks: List[Callable[[str, Dict[str, str], float], None]] = []
+_registry: "MetricsRegistry | None" = None
+_current_function: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "pywikipathways_function", default=None
+)
+
+_HELP = {
+    "pywikipathways_calls_total": "Public function calls.",
+    "pywikipathways_call_seconds_total": "Wall time spent in public functions.",
+    "pywikipathways_requests_total": "HTTP requests by endpoint and status.",
+    "pywikipathways_request_seconds_total": "Time spent waiting for HTTP responses.",
+    "pywikipathways_response_bytes_total": "Response bytes downloaded.",
+    "pywikipathways_parse_seconds_total": "Time spent decoding JSON responses.",
+    "pywikipathways_cache_total": "Cache lookups by cache and result (hit/miss).",
+    "pywikipathways_rows_in_total": "Rows of the source tables read by a function.",
+    "pywikipathways_rows_out_total": "Rows or items returned by a function.",
+}
+
+
+class MetricsRegistry:
+    """Thread-safe counters keyed by metric name and label set."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+    def __call__(self, name: str, labels: Dict[str, str], value: float) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def as_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return ``{metric: [{**labels, "value": value}, ...]}``."""
+        with self._lock:
+            items = sorted(self._values.items())
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        for (name, labels), value in items:
+            result.setdefault(name, []).append({**dict(labels), "value": value})
+        return result
+
+    def to_prometheus(self) -> str:
+        """Return the counters in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name, samples in self.as_dict().items():
+            lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for sample in samples:
+                value = sample.pop("value")
+                labels = ",".join(
+                    f'{key}="{_escape(str(val))}"' for key, val in sample.items()
+                )
+                lines.append(f"{name}{{{labels}}} {value:g}" if labels else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _emit(name: str, labels: Dict[str, str], value: float) -> None:
+    for sink in list(_sinks):
+        sink(name, labels, value)
+
+
+def _function_label() -> str:
+    return _current_function.get() or "unknown"
+
+
+def record_request(endpoint: str, status: int | str, seconds: float, nbytes: int) -> None:
+    if not _sinks:
+        return
+    labels = {"function": _function_label(), "endpoint": endpoint}
+    _emit("pywikipathways_requests_total", {**labels, "status": str(status)}, 1)
+    _emit("pywikipathways_request_seconds_total", labels, seconds)
+    _emit("pywikipathways_response_bytes_total", labels, nbytes)
+
+
+def record_parse(endpoint: str, seconds: float) -> None:
+    if not _sinks:
+        return
+    _emit("pywikipathways_parse_seconds_total",
+          {"function": _function_label(), "endpoint": endpoint}, seconds)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    if not _sinks:
+        return
+    _emit("pywikipathways_cache_total",
+          {"function": _function_label(), "cache": cache, "result": "hit" if hit else "miss"}, 1)
+
+
+def record_rows_in(rows: int) -> None:
+    if not _sinks:
+        return
+    _emit("pywikipathways_rows_in_total", {"function": _function_label()}, rows)
+
+
+def instrument(func: Callable) -> Callable:
+    """Count calls, wall time and returned rows of a public function.
+
+    Nested instrumented calls are attributed to the outermost function. While
+    a tracer is installed the call is also wrapped in a span named after the
+    function.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if tracing._tracer is not None:
+            with tracing.span(name):
+                return _measured(*args, **kwargs)
+        return _measured(*args, **kwargs)
+
+    def _measured(*args, **kwargs):
+        if not _sinks or _current_function.get() is not None:
+            return func(*args, **kwargs)
+        token = _current_function.set(name)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            labels = {"function": name}
+            _emit("pywikipathways_calls_total", labels, 1)
+            _emit("pywikipathways_call_seconds_total", labels, time.perf_counter() - start)
+            _current_function.reset(token)
+        if result is not None and hasattr(result, "__len__") and not isinstance(result, str):
+            _emit("pywikipathways_rows_out_total", {"function": name}, len(result))
+        return result
+
+    return wrapper
+
+
+def enable_metrics(registry: MetricsRegistry | None = None) -> MetricsRegistry:
+    """Start recording metrics into ``registry`` (a new one by default).
+
+    Returns
+    -------
+    MetricsRegistry
+        The active registry; export it with ``as_dict()`` or
+        ``to_prometheus()``.
+
+    Examples
+    --------
+    >>> registry = enable_metrics()
+    >>> find_pathways_by_text('cancer')
+    >>> print(registry.to_prometheus())
+    """
+    global _registry
+    disable_metrics()
+    _registry = registry if registry is not None else MetricsRegistry()
+    _sinks.append(_registry)
+    return _registry
+
+
+def disable_metrics() -> None:
+    """Stop recording into the active registry. Callbacks stay registered."""
+    global _registry
+    if _registry is not None and _registry in _sinks:
+        _sinks.remove(_registry)
+    _registry = None
+
+
+def get_metrics() -> MetricsRegistry | None:
+    """Return the active registry, or None when metrics are disabled."""
+    return _registry
+
+
+def add_metrics_callback(callback: Callable[[str, Dict[str, str], float], None]) -> None:
+    """Call ``callback(name, labels, value)`` for every recorded sample."""
+    _sinks.append(callback)
+
+
+def remove_metrics_callback(callback: Callable[[str, Dict[str, str], float], None]) -> None:
+    """Unregister a callback added with ``add_metrics_callback``."""
+    if callback in _sinks:
+        _sinks.remove(callback)
+
+
+__all__ = [
+    "MetricsRegistry",
+    "enable_metrics",
+    "disable_metrics",
+    "get_metrics",
+    "add_metrics_callback",
+    "remove_metrics_callback",
+]
@@ -0,0 +1,158 @@
+"""Incremental local mirror of WikiPathways GPML and datanode TSV files."""
+
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List
+
+import requests
+
+from .get_pathway_info import get_pathway_info
+from .metrics import instrument
+from .utilities import wikipathways_get
+
+_STATE_FILE = "mirror-state.json"
+_ASSET_URL = "https://www.wikipathways.org/wikipathways-assets/pathways/{pathway}/{filename}"
+_FORMATS = {
+    "gpml": "{pathway}.gpml",
+    "tsv": "{pathway}-datanodes.tsv",
+}
+
+
+def _read_state(destpath: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(destpath, _STATE_FILE), encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {"last_synced": None, "revisions": {}}
+
+
+def _write_state(destpath: str, state: Dict[str, Any]) -> None:
+    path = os.path.join(destpath, _STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def _download(pathway: str, destpath: str, formats: Iterable[str]) -> None:
+    """Fetch every requested file for ``pathway``, replacing files atomically."""
+    for fmt in formats:
+        filename = _FORMATS[fmt].format(pathway=pathway)
+        url = _ASSET_URL.format(pathway=pathway, filename=filename)
+        response = wikipathways_get(url, timeout=30)
+        path = os.path.join(destpath, filename)
+        with open(path + ".tmp", "wb") as handle:
+            handle.write(response.content)
+        os.replace(path + ".tmp", path)
+
+
+def _remove(pathway: str, destpath: str) -> None:
+    for pattern in _FORMATS.values():
+        path = os.path.join(destpath, pattern.format(pathway=pathway))
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@instrument
+def sync_mirror(destpath: str = "./wikipathways-mirror",
+                organism: str | None = None,
+                formats: Iterable[str] = ("gpml", "tsv"),
+                max_workers: int = 8) -> Dict[str, Any]:
+    """Bring a local mirror of pathway files up to date.
+
+    The mirror directory keeps a ``mirror-state.json`` file with the time of
+    the last sync and the revision of every mirrored WPID. Each call compares
+    those revisions with the ``getPathwayInfo`` table, downloads only pathways
+    whose revision changed (concurrently), and deletes files of pathways that
+    are no longer listed there. Switching ``organism`` between calls keeps
+    the files of organisms mirrored earlier.
+
+    Parameters
+    ----------
+    destpath : str, optional
+        Mirror directory. It is created if missing.
+    organism : str, optional
+        Only mirror pathways of this species, e.g. ``"Homo sapiens"``.
+    formats : iterable of str, optional
+        Files to mirror per pathway: ``"gpml"`` and/or ``"tsv"`` (datanodes).
+    max_workers : int, optional
+        Number of concurrent downloads.
+
+    Returns
+    -------
+    dict
+        ``updated`` and ``removed`` WPID lists, ``failed`` (WPID -> error
+        message), ``unchanged`` count and the new ``last_synced`` stamp.
+
+    Examples
+    --------
+    >>> sync_mirror('mirror/human', organism='Homo sapiens')
+    """
+    formats = list(formats)
+    unknown = [fmt for fmt in formats if fmt not in _FORMATS]
+    if unknown or not formats:
+        raise ValueError(f"formats must be drawn from: {', '.join(_FORMATS)}.")
+
+    os.makedirs(destpath, exist_ok=True)
+    state = _read_state(destpath)
+    synced: Dict[str, str] = state.get("revisions", {})
+    started = _dt.datetime.now(_dt.timezone.utc).strftime("%Y%m%d%H%M%S")
+
+    # The full table, not get_recent_changes: that one drops pathways whose
+    # revision is not a parseable date, which must not be retired.
+    current = get_pathway_info(columns=["id", "revision", "species"], backend="pandas")
+    listed = set(current["id"].astype(str))
+    if organism is not None:
+        current = current[current["species"] == organism]
+        if current.empty:
+            raise ValueError(f"No pathways found for organism: {organism}")
+    revisions = dict(zip(current["id"].astype(str), current["revision"].astype(str)))
+
+    # A different set of formats invalidates every mirrored pathway.
+    formats_changed = sorted(state.get("formats", formats)) != sorted(formats)
+    changed = [
+        wpid for wpid, revision in revisions.items()
+        if formats_changed or synced.get(wpid) != revision
+    ]
+    # Pathways of other organisms mirrored by earlier calls are kept; only
+    # pathways no longer listed at all are retired.
+    retired = sorted(set(synced) - listed)
+
+    failed: Dict[str, str] = {}
+    updated: List[str] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {wpid: pool.submit(_download, wpid, destpath, formats) for wpid in changed}
+        for wpid, future in futures.items():
+            try:
+                future.result()
+            except (requests.RequestException, OSError) as exc:
+                failed[wpid] = str(exc)
+                continue
+            synced[wpid] = revisions[wpid]
+            updated.append(wpid)
+
+    for wpid in retired:
+        _remove(wpid, destpath)
+        synced.pop(wpid, None)
+
+    state = {"last_synced": started, "formats": formats, "organism": organism,
+             "revisions": synced}
+    _write_state(destpath, state)
+    return {
+        "updated": sorted(updated),
+        "removed": retired,
+        "failed": failed,
+        "unchanged": len(revisions) - len(changed),
+        "last_synced": started,
+    }
+
+
+def mirror_state(destpath: str = "./wikipathways-mirror") -> Dict[str, Any]:
+    """Return the stored sync state (last sync stamp and WPID revisions)."""
+    return _read_state(destpath)
+
+
+__all__ = ["sync_mirror", "mirror_state"]
@@ -0,0 +1,293 @@
+"""In-memory index over the WikiPathways ontology term annotations."""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import metrics, snapshot
+from .get_ontology_terms import _ontology_terms_frame, _pathways_by_ontology_term_frame
+from .get_recent_changes import _INDEX_MAX_AGE
+from .metrics import instrument
+from .snapshot import _snapshot_table
+
+_ONTOLOGY_PREFIXES = {
+    "PW": "Pathway Ontology",
+    "DOID": "Disease Ontology",
+    "CL": "Cell Type Ontology",
+}
+
+_cached: Tuple[object, "OntologyIndex"] | None = None
+_cached_terms: Tuple[object, "_TermTable"] | None = None
+
+
+def _as_list(value) -> List[str]:
+    if isinstance(value, str):
+        return [value] if value else []
+    if pd.api.types.is_list_like(value):
+        return [str(item) for item in value if isinstance(item, str) and item]
+    return []
+
+
+def _row_positions(frame: pd.DataFrame, column: str) -> Dict[str, np.ndarray]:
+    """Return ``value -> row positions`` for the string values of ``column``."""
+    if column not in frame.columns:
+        return {}
+    values = frame[column].map(lambda value: value if isinstance(value, str) else None)
+    return values.groupby(values, sort=False).indices
+
+
+class OntologyIndex:
+    """Term/pathway maps plus the transitive closure of the term hierarchy.
+
+    Terms are keyed by their identifier (e.g. ``"DOID:162"``). Parents that
+    are only known by name and never annotated directly are keyed by that
+    name. Every lookup accepts either an identifier or a term name.
+
+    Attributes
+    ----------
+    terms : pandas.DataFrame
+        One row per term with ``id``, ``name``, ``ontology`` and ``parent``.
+    term_pathways : dict
+        Term key -> WPIDs annotated with exactly that term.
+    pathway_terms : dict
+        WPID -> term keys annotated on the pathway.
+    ancestors, descendants : dict
+        Term key -> transitive closure of parent / child terms.
+    frame : pandas.DataFrame
+        The ontology-terms-by-pathway table the index was built from.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        required = {"id", "terms_id"}
+        if not required.issubset(frame.columns):
+            raise RuntimeError("Ontology table is missing pathway or term identifiers.")
+
+        self.built = time.monotonic()
+        self.frame = frame.reset_index(drop=True)
+        self._parent_rows = _row_positions(self.frame, "terms_parent")
+
+        annotations = frame.dropna(subset=["id", "terms_id"])
+        columns = {"terms_id": "id"}
+        for field in ("name", "parent", "ontology"):
+            if f"terms_{field}" in annotations.columns:
+                columns[f"terms_{field}"] = field
+        terms = annotations[list(columns)].rename(columns=columns)
+        terms = terms.drop_duplicates(subset="id").reset_index(drop=True)
+        for field in ("name", "parent", "ontology"):
+            if field not in terms.columns:
+                terms[field] = None
+        prefixes = terms["id"].astype(str).str.split(":", n=1).str[0]
+        terms["ontology"] = terms["ontology"].fillna(prefixes.map(_ONTOLOGY_PREFIXES))
+        self.terms = terms[["id", "name", "ontology", "parent"]]
+
+        pairs = annotations[["terms_id", "id"]].drop_duplicates()
+        self.term_pathways: Dict[str, Tuple[str, ...]] = {
+            term: tuple(sorted(group)) for term, group in pairs.groupby("terms_id")["id"]
+        }
+        self.pathway_terms: Dict[str, Tuple[str, ...]] = {
+            wpid: tuple(sorted(group)) for wpid, group in pairs.groupby("id")["terms_id"]
+        }
+
+        self._by_name: Dict[str, str] = {}
+        for term_id, name in zip(self.terms["id"], self.terms["name"]):
+            if isinstance(name, str):
+                self._by_name.setdefault(name.lower(), term_id)
+
+        parents: Dict[str, Set[str]] = {term_id: set() for term_id in self.terms["id"]}
+        for term_id, parent in zip(self.terms["id"], self.terms["parent"]):
+            for item in _as_list(parent):
+                key = item if item in parents else self._by_name.get(item.lower(), item)
+                if key != term_id:
+                    parents[term_id].add(key)
+                    parents.setdefault(key, set())
+        self._parents = parents
+
+        self.ancestors: Dict[str, FrozenSet[str]] = {}
+        for term in parents:
+            self._close(term)
+        children: Dict[str, Set[str]] = {term: set() for term in parents}
+        for term, closure in self.ancestors.items():
+            for ancestor in closure:
+                children[ancestor].add(term)
+        self.descendants: Dict[str, FrozenSet[str]] = {
+            term: frozenset(members) for term, members in children.items()
+        }
+        self._branch_pathways: Dict[str, Tuple[str, ...]] = {}
+        for term, members in self.descendants.items():
+            wpids = set(self.term_pathways.get(term, ()))
+            for member in members:
+                wpids.update(self.term_pathways.get(member, ()))
+            self._branch_pathways[term] = tuple(sorted(wpids))
+
+    def _close(self, term: str) -> FrozenSet[str]:
+        """Walk the parents of ``term``, reusing closures that are already complete.
+
+        Only finished closures are stored, so a cycle in the hierarchy cannot
+        leave a partial one behind for later terms.
+        """
+        if term in self.ancestors:
+            return self.ancestors[term]
+        closure: Set[str] = set()
+        stack = list(self._parents.get(term, ()))
+        while stack:
+            parent = stack.pop()
+            if parent in closure:
+                continue
+            closure.add(parent)
+            known = self.ancestors.get(parent)
+            if known is not None:
+                closure.update(known)
+            else:
+                stack.extend(self._parents.get(parent, ()))
+        closure.discard(term)
+        self.ancestors[term] = frozenset(closure)
+        return self.ancestors[term]
+
+    def resolve(self, term: str) -> str:
+        """Return the term key for an identifier or a (case-insensitive) name."""
+        if term in self._parents:
+            return term
+        key = self._by_name.get(str(term).lower())
+        if key is None:
+            raise ValueError(f"Unknown ontology term: {term!r}")
+        return key
+
+    def pathways(self, term: str, include_descendants: bool = True) -> List[str]:
+        """Return WPIDs annotated with ``term`` or, by default, any term below it."""
+        key = self.resolve(term)
+        if include_descendants:
+            return list(self._branch_pathways.get(key, ()))
+        return list(self.term_pathways.get(key, ()))
+
+    def terms_for(self, pathway: str, include_ancestors: bool = False) -> List[str]:
+        """Return the term keys annotated on ``pathway``, optionally with ancestors."""
+        direct = self.pathway_terms.get(pathway, ())
+        if not include_ancestors:
+            return list(direct)
+        closure: Set[str] = set(direct)
+        for term in direct:
+            closure.update(self.ancestors.get(term, ()))
+        return sorted(closure)
+
+    def rows_with_parent(self, parent: str | None = None) -> pd.DataFrame:
+        """Return the rows of ``frame`` whose ``terms_parent`` is ``parent`` (all if None)."""
+        if parent is None:
+            return self.frame
+        return self.frame.iloc[self._parent_rows.get(parent, [])]
+
+    def ancestors_of(self, term: str) -> List[str]:
+        return sorted(self.ancestors[self.resolve(term)])
+
+    def descendants_of(self, term: str) -> List[str]:
+        return sorted(self.descendants[self.resolve(term)])
+
+
+class _TermTable:
+    """The pathways-by-ontology-term table with its rows grouped by term."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.built = time.monotonic()
+        self.frame = frame.reset_index(drop=True)
+        self._rows = _row_positions(self.frame, "id")
+
+    def rows(self, term: str | None = None) -> pd.DataFrame:
+        """Return the rows of ``term`` (all if None)."""
+        if term is None:
+            return self.frame
+        return self.frame.iloc[self._rows.get(term, [])]
+
+
+def _stale(cached: Tuple[object, "OntologyIndex | _TermTable"] | None) -> bool:
+    """True if ``cached`` belongs to another snapshot or is an old live build."""
+    owner = snapshot._active
+    return (
+        cached is None
+        or cached[0] is not owner
+        or (owner is None and time.monotonic() - cached[1].built > _INDEX_MAX_AGE)
+    )
+
+
+def build_ontology_index(frame: pd.DataFrame | None = None) -> OntologyIndex:
+    """Build an ``OntologyIndex`` from the ontology-terms-by-pathway table.
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame, optional
+        Exploded table as returned by ``get_ontology_terms()``. Fetched from
+        the active snapshot or WikiPathways when omitted.
+
+    Returns
+    -------
+    OntologyIndex
+    """
+    if frame is None:
+        frame = _snapshot_table("getOntologyTermsByPathway", _ontology_terms_frame)
+    return OntologyIndex(frame)
+
+
+def get_ontology_index(refresh: bool = False) -> OntologyIndex:
+    """Return the ontology index for the active snapshot, building it once.
+
+    The index is rebuilt when a different snapshot is activated with
+    ``use_snapshot`` or when ``refresh`` is True. Without a snapshot, the
+    index built from the live endpoint is reused for five minutes, like the
+    revision index behind ``get_recent_changes``.
+    """
+    global _cached
+    rebuild = refresh or _stale(_cached)
+    if metrics._sinks:
+        metrics.record_cache("ontology_index", not rebuild)
+    if rebuild:
+        _cached = (snapshot._active, build_ontology_index())
+    return _cached[1]
+
+
+def _term_table(refresh: bool = False) -> _TermTable:
+    """Return the pathways-by-ontology-term table, cached like the index."""
+    global _cached_terms
+    rebuild = refresh or _stale(_cached_terms)
+    if metrics._sinks:
+        metrics.record_cache("ontology_terms", not rebuild)
+    if rebuild:
+        frame = _snapshot_table("getPathwaysByOntologyTerm", _pathways_by_ontology_term_frame)
+        _cached_terms = (snapshot._active, _TermTable(frame))
+    return _cached_terms[1]
+
+
+@instrument
+def get_pathway_ids_by_ontology_branch(term: str, include_descendants: bool = True) -> List[str]:
+    """Get Pathway WPIDs by Ontology Branch
+
+    Retrieve the WPIDs of pathways annotated with an ontology term or with any
+    term in the branch below it, e.g. every pathway under a disease class.
+
+    Parameters
+    ----------
+    term : str
+        Ontology term identifier (e.g. ``"DOID:162"``) or name (e.g. ``"cancer"``).
+    include_descendants : bool, optional
+        When False only pathways annotated with ``term`` itself are returned.
+
+    Returns
+    -------
+    list of str
+        Sorted WPIDs.
+
+    Examples
+    --------
+    >>> get_pathway_ids_by_ontology_branch('DOID:162')
+    >>> get_pathway_ids_by_ontology_branch('signaling pathway')
+    """
+    return get_ontology_index().pathways(term, include_descendants)
+
+
+__all__ = [
+    "OntologyIndex",
+    "build_ontology_index",
+    "get_ontology_index",
+    "get_pathway_ids_by_ontology_branch",
+]
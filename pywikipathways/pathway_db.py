@@ -0,0 +1,303 @@
+"""Endpoint tables in one SQLite file, with FTS5 indexes for the find functions.
+
+``export_database`` writes every snapshot table (pathway info, the four
+``find*`` tables, ontology terms, communities, ...) into a single SQLite
+file. The searchable columns of the ``find*`` tables are indexed with an
+FTS5 trigram index, which answers the same case-insensitive substring
+queries as the in-memory scans. After ``use_database``, the
+``find_pathways_by_*`` functions run indexed SQL against the file, and
+every other function reads its table from it as from a snapshot. Any
+number of processes can share the file read-only.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List
+
+import pandas as pd
+
+from . import metrics, snapshot
+from ._version import __version__
+from .snapshot import _TABLES, _build_table
+from .tracing import span
+
+__all__ = ["export_database", "use_database", "database_info"]
+
+_FORMAT_VERSION = 1
+_MANIFEST_TABLE = "_manifest"
+
+# Searchable columns per table; None means "id" through "citedIn", the
+# columns find_pathways_by_text scans.
+_FTS_COLUMNS: Dict[str, List[str] | None] = {
+    "findPathwaysByText": None,
+    "findPathwaysByXref": ["ensembl", "ncbigene", "hgnc", "uniprot", "wikidata", "chebi",
+                           "inchikey"],
+    "findPathwaysByLiterature": ["refs", "citations"],
+    "findPathwaysByOrcid": ["orcids"],
+}
+# Trigram queries need at least this many characters.
+_MIN_TRIGRAM = 3
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _fts_columns(name: str, frame: pd.DataFrame) -> List[str]:
+    columns = _FTS_COLUMNS[name]
+    if columns is None:
+        columns = list(frame.columns)
+        if {"id", "citedIn"}.issubset(columns):
+            columns = columns[columns.index("id"):columns.index("citedIn") + 1]
+    return [column for column in columns if column in frame.columns]
+
+
+def _encode(frame: pd.DataFrame) -> tuple:
+    """Return ``frame`` with list/dict columns as JSON text, and those columns."""
+    encoded = []
+    frame = frame.copy()
+    for column in frame.columns:
+        values = frame[column]
+        if values.dtype == object and values.map(lambda v: isinstance(v, (list, dict))).any():
+            frame[column] = values.map(
+                lambda v: None if v is None or (isinstance(v, float) and v != v)
+                else json.dumps(v, default=str)
+            )
+            encoded.append(column)
+    return frame, encoded
+
+
+def _write_table(connection: sqlite3.Connection, name: str, frame: pd.DataFrame,
+                 trigram: bool) -> Dict[str, Any]:
+    frame, encoded = _encode(frame)
+    frame.to_sql(name, connection, index=False)
+    entry: Dict[str, Any] = {"rows": len(frame), "json_columns": encoded}
+    if name in _FTS_COLUMNS and trigram:
+        columns = _fts_columns(name, frame)
+        fts = _quote(name + "_fts")
+        connection.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5("
+            f"{', '.join(_quote(column) for column in columns)}, "
+            f"content={_quote(name)}, content_rowid='rowid', tokenize='trigram')"
+        )
+        connection.execute(f"INSERT INTO {fts}({fts}) VALUES('rebuild')")
+        entry["fts_columns"] = columns
+    return entry
+
+
+def _has_trigram(connection: sqlite3.Connection) -> bool:
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp._probe USING fts5(x, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    connection.execute("DROP TABLE temp._probe")
+    return True
+
+
+def export_database(path: str = "./wikipathways.sqlite",
+                    tables: Iterable[str] | None = None) -> str:
+    """Download endpoint tables into one SQLite database.
+
+    The file is written next to ``path`` and moved into place when complete,
+    so processes reading an older version are not disturbed.
+
+    Parameters
+    ----------
+    path : str, optional
+        Database file.
+    tables : iterable of str, optional
+        Endpoint tables to export (see ``export_snapshot``). Defaults to
+        every supported table.
+
+    Returns
+    -------
+    str
+        Path of the database.
+
+    Raises
+    ------
+    ValueError
+        If a table name is not supported.
+    RuntimeError
+        If an endpoint table cannot be retrieved.
+
+    Examples
+    --------
+    >>> export_database('wikipathways.sqlite')
+    >>> use_database('wikipathways.sqlite')
+    >>> find_pathways_by_text('insulin')  # FTS5 query
+    """
+    names: List[str] = list(_TABLES) if tables is None else list(tables)
+    unknown = [name for name in names if name not in _TABLES]
+    if unknown:
+        raise ValueError(f"Unsupported database tables: {', '.join(unknown)}.")
+
+    frames = {name: _build_table(name) for name in names}
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    connection = sqlite3.connect(tmp)
+    try:
+        trigram = _has_trigram(connection)
+        with span("write"):
+            entries = {name: _write_table(connection, name, frame, trigram)
+                       for name, frame in frames.items()}
+        manifest = {
+            "format_version": _FORMAT_VERSION,
+            "pywikipathways": __version__,
+            "created": _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
+            "sqlite": sqlite3.sqlite_version,
+            "tables": entries,
+        }
+        connection.execute(f"CREATE TABLE {_MANIFEST_TABLE} (manifest TEXT)")
+        connection.execute(f"INSERT INTO {_MANIFEST_TABLE} VALUES (?)", (json.dumps(manifest),))
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmp, path)
+    return path
+
+
+class _Database:
+    """An opened database; serves tables like a snapshot and runs searches."""
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise ValueError(f"No database found at '{path}'.")
+        self.path = path
+        self._local = threading.local()
+        self._frames: Dict[str, pd.DataFrame] = {}
+        try:
+            row = self._connection().execute(
+                f"SELECT manifest FROM {_MANIFEST_TABLE}"
+            ).fetchone()
+        except sqlite3.DatabaseError as exc:
+            raise ValueError(f"'{path}' is not a pywikipathways database.") from exc
+        self.manifest = json.loads(row[0])
+        if self.manifest.get("format_version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported database format in '{path}'.")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            uri = pathlib.Path(os.path.abspath(self.path)).as_uri() + "?mode=ro"
+            connection = sqlite3.connect(uri, uri=True)
+            self._local.connection = connection
+        return connection
+
+    def _read(self, name: str, sql: str, params: List[Any]) -> pd.DataFrame:
+        with span("sql"):
+            frame = pd.read_sql_query(sql, self._connection(), params=params)
+        for column in self.manifest["tables"][name]["json_columns"]:
+            frame[column] = frame[column].map(lambda v: None if v is None else json.loads(v))
+        return frame
+
+    def table(self, name: str) -> pd.DataFrame | None:
+        if name not in self.manifest["tables"]:
+            return None
+        if name not in self._frames:
+            self._frames[name] = self._read(name, f"SELECT * FROM {_quote(name)}", [])
+        return self._frames[name]
+
+    def columns(self, name: str) -> List[str] | None:
+        if name not in self.manifest["tables"]:
+            return None
+        cursor = self._connection().execute(f"SELECT * FROM {_quote(name)} LIMIT 0")
+        return [column[0] for column in cursor.description]
+
+    def search(self, name: str, terms: List[str], columns: List[str] | None = None
+               ) -> pd.DataFrame:
+        """Return the rows of ``name`` whose ``columns`` contain any of ``terms``."""
+        entry = self.manifest["tables"][name]
+        indexed = entry.get("fts_columns")
+        available = self.columns(name)
+        if columns is None:
+            columns = indexed if indexed is not None else _FTS_COLUMNS[name] or available
+        columns = [column for column in columns if column in available]
+        terms = [term.lower() for term in terms if term]
+        if not columns or not terms:
+            return self._read(name, f"SELECT * FROM {_quote(name)} LIMIT 0", [])
+
+        conditions: List[str] = []
+        params: List[Any] = []
+        fts = indexed is not None and all(column in indexed for column in columns)
+        matched = [term for term in terms if fts and len(term) >= _MIN_TRIGRAM]
+        if matched:
+            expression = " OR ".join(_quote(term) for term in matched)
+            if columns != indexed:
+                expression = "{" + " ".join(_quote(c) for c in columns) + "} : (" + expression + ")"
+            fts = _quote(name + "_fts")
+            conditions.append(f"rowid IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)")
+            params.append(expression)
+        for term in terms:
+            if term in matched:
+                continue
+            for column in columns:
+                conditions.append(f"instr(lower({_quote(column)}), ?) > 0")
+                params.append(term)
+        sql = (f"SELECT * FROM {_quote(name)} WHERE {' OR '.join(conditions)} "
+               f"ORDER BY rowid")
+        frame = self._read(name, sql, params)
+        if metrics._sinks:
+            metrics.record_rows_in(len(frame))
+        return frame
+
+
+def _database() -> _Database | None:
+    active = snapshot._active
+    return active if isinstance(active, _Database) else None
+
+
+def _search(name: str, terms: List[str], columns: List[str] | None = None
+            ) -> pd.DataFrame | None:
+    """Search ``name`` in the active database; None when no database serves it."""
+    database = _database()
+    if database is None or name not in database.manifest["tables"]:
+        return None
+    if metrics._sinks:
+        metrics.record_cache("database", True)
+    return database.search(name, terms, columns)
+
+
+def _columns(name: str) -> List[str] | None:
+    """Return the columns of ``name`` in the active database, if it has the table."""
+    database = _database()
+    return None if database is None else database.columns(name)
+
+
+def use_database(path: str | None) -> Dict[str, Any] | None:
+    """Serve endpoint tables and searches from a database file.
+
+    The database takes the place of an active snapshot: tables it lacks are
+    still fetched from WikiPathways, and ``use_snapshot`` replaces it.
+
+    Parameters
+    ----------
+    path : str or None
+        Database written by ``export_database``, or None to go back to
+        fetching every table from the network.
+
+    Returns
+    -------
+    dict or None
+        The database manifest, including its creation stamp.
+    """
+    if path is None:
+        snapshot._active = None
+        return None
+    snapshot._active = _Database(path)
+    return snapshot._active.manifest
+
+
+def database_info(path: str | None = None) -> Dict[str, Any] | None:
+    """Return the manifest of ``path``, or of the active database if omitted."""
+    if path is not None:
+        return _Database(path).manifest
+    database = _database()
+    return None if database is None else database.manifest
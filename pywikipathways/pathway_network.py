@@ -0,0 +1,264 @@
+"""Organism-wide interaction network merged across pathways by xref."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+from lxml import etree as ET
+
+from .metrics import instrument
+from .pathway_graph import pathway_graph
+from .snapshot import _require_pyarrow
+from .tracing import span
+
+__all__ = ["PathwayNetwork", "build_pathway_network", "load_pathway_network"]
+
+_WPID = re.compile(r"WP\d+")
+_MANIFEST = "network.json"
+_FORMAT_VERSION = 1
+_CHUNK_SIZE = 16
+_NODE_COLUMNS = ["pathway", "key", "label", "database", "identifier"]
+_EDGE_COLUMNS = ["pathway", "source", "target", "interaction"]
+
+# GPML Xref databases -> normalized prefix used in node keys.
+_DATABASES = {
+    "entrez gene": "ncbigene",
+    "ncbi gene": "ncbigene",
+    "ncbigene": "ncbigene",
+    "ensembl": "ensembl",
+    "hgnc": "hgnc",
+    "hgnc accession": "hgnc.accession",
+    "uniprot-trembl": "uniprot",
+    "uniprot/trembl": "uniprot",
+    "uniprot": "uniprot",
+    "wikidata": "wikidata",
+    "chebi": "chebi",
+    "hmdb": "hmdb",
+    "pubchem-compound": "pubchem.compound",
+    "pubchem.compound": "pubchem.compound",
+    "kegg compound": "kegg.compound",
+    "kegg.compound": "kegg.compound",
+    "chemspider": "chemspider",
+    "lipidmaps": "lipidmaps",
+    "inchikey": "inchikey",
+}
+
+
+def _node_keys(wpid: str, nodes: pd.DataFrame) -> pd.Series:
+    """Return ``prefix:identifier`` keys; nodes without an xref stay pathway-local."""
+    database = nodes["database"].fillna("").str.strip().str.lower()
+    identifier = nodes["identifier"].fillna("").str.strip()
+    prefix = database.map(_DATABASES).fillna(database.str.replace(" ", "_"))
+    # ChEBI ids appear both as "CHEBI:15422" and "15422".
+    identifier = identifier.where(prefix != "chebi", identifier.str.replace(r"(?i)^chebi:", "", regex=True))
+    keys = prefix + ":" + identifier
+    local = (database == "") | (identifier == "")
+    return keys.where(~local, wpid + ":" + nodes["graph_id"].fillna(nodes.index.to_series().astype(str)))
+
+
+def _pathway_tables(item: Tuple[str, bytes]
+                    ) -> Tuple[str, pd.DataFrame | None, pd.DataFrame | None, str | None]:
+    """Parse one GPML into its node and edge rows (runs in a worker process).
+
+    A GPML that cannot be parsed yields no rows and the error message, since
+    lxml errors do not survive the trip back from the worker.
+    """
+    wpid, gpml = item
+    try:
+        graph = pathway_graph(gpml)
+    except ET.XMLSyntaxError as exc:
+        return wpid, None, None, str(exc)
+    keys = _node_keys(wpid, graph.nodes)
+    nodes = pd.DataFrame({
+        "pathway": wpid,
+        "key": keys,
+        "label": graph.nodes["label"],
+        "database": graph.nodes["database"],
+        "identifier": graph.nodes["identifier"],
+    }).drop_duplicates("key")
+    edges = graph.edges()
+    edges = pd.DataFrame({
+        "pathway": wpid,
+        "source": keys.to_numpy()[edges["source"].to_numpy()],
+        "target": keys.to_numpy()[edges["target"].to_numpy()],
+        "interaction": edges["type"].to_numpy(),
+    })
+    edges = edges[edges["source"] != edges["target"]].drop_duplicates()
+    return wpid, nodes, edges, None
+
+
+class PathwayNetwork:
+    """The union of the interactions of many pathways.
+
+    Attributes
+    ----------
+    nodes : pandas.DataFrame
+        ``key`` (normalized ``prefix:identifier``, or ``WPID:GraphId`` for
+        nodes without an xref), ``label``, ``database``, ``identifier`` and
+        ``pathways`` (sorted WPID list).
+    edges : pandas.DataFrame
+        Deduplicated ``source``, ``target``, ``interaction`` and
+        ``pathways`` (sorted WPID list).
+    hashes : dict
+        WPID -> SHA-1 of the GPML it was built from.
+    failed : dict
+        WPID -> parse error of GPMLs left out by ``build_pathway_network``.
+    """
+
+    def __init__(self, pathway_nodes: pd.DataFrame, pathway_edges: pd.DataFrame,
+                 hashes: Dict[str, str]):
+        self.pathway_nodes = pathway_nodes
+        self.pathway_edges = pathway_edges
+        self.hashes = hashes
+        self.failed: Dict[str, str] = {}
+        with span("merge"):
+            self.nodes = _merge(pathway_nodes, ["key"], ["label", "database", "identifier"])
+            self.edges = _merge(pathway_edges, ["source", "target", "interaction"], [])
+
+    def __repr__(self) -> str:
+        return (f"PathwayNetwork({len(self.hashes)} pathways, {len(self.nodes)} nodes, "
+                f"{len(self.edges)} edges)")
+
+    def save(self, path: str) -> None:
+        """Write the network as Parquet tables plus a manifest into ``path``."""
+        _require_pyarrow()
+        os.makedirs(path, exist_ok=True)
+        self.pathway_nodes.to_parquet(os.path.join(path, "pathway_nodes.parquet"), index=False)
+        self.pathway_edges.to_parquet(os.path.join(path, "pathway_edges.parquet"), index=False)
+        self.edges.to_parquet(os.path.join(path, "edges.parquet"), index=False)
+        with open(os.path.join(path, _MANIFEST), "w", encoding="utf-8") as handle:
+            json.dump({"format_version": _FORMAT_VERSION, "hashes": self.hashes},
+                      handle, indent=2, sort_keys=True)
+
+    @classmethod
+    def load(cls, path: str) -> "PathwayNetwork":
+        """Read a network written by ``save``."""
+        _require_pyarrow()
+        with open(os.path.join(path, _MANIFEST), encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        if manifest.get("format_version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported network format in '{path}'.")
+        return cls(
+            pd.read_parquet(os.path.join(path, "pathway_nodes.parquet")),
+            pd.read_parquet(os.path.join(path, "pathway_edges.parquet")),
+            manifest["hashes"],
+        )
+
+
+def _merge(rows: pd.DataFrame, keys: List[str], first: List[str]) -> pd.DataFrame:
+    if rows.empty:
+        return pd.DataFrame(columns=keys + first + ["pathways"])
+    grouped = rows.sort_values("pathway").groupby(keys, sort=True)
+    merged = grouped[first].first() if first else grouped.size().to_frame().iloc[:, :0]
+    merged["pathways"] = grouped["pathway"].agg(lambda values: sorted(set(values)))
+    return merged.reset_index()
+
+
+def _iter_gpml(source: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield ``(wpid, gpml)`` from a GPML archive (.zip) or directory."""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for name in sorted(archive.namelist()):
+                match = _WPID.search(os.path.basename(name))
+                if name.endswith(".gpml") and match:
+                    yield match.group(0), archive.read(name)
+        return
+    for name in sorted(os.listdir(source)):
+        match = _WPID.search(name)
+        if name.endswith(".gpml") and match:
+            with open(os.path.join(source, name), "rb") as handle:
+                yield match.group(0), handle.read()
+
+
+@instrument
+def build_pathway_network(source: str,
+                          previous: "PathwayNetwork | str | None" = None,
+                          path: str | None = None,
+                          max_workers: int | None = None) -> PathwayNetwork:
+    """Merge the interactions of every pathway of a GPML archive or mirror.
+
+    Each GPML is turned into a ``pathway_graph`` in a process pool. Nodes are
+    merged across pathways by normalized xref (``ncbigene:1636``,
+    ``chebi:15422``, ...), so the result has one row per distinct
+    interaction with the pathways that draw it.
+
+    Parameters
+    ----------
+    source : str
+        A GPML archive from ``download_pathway_archive`` or a directory of
+        ``.gpml`` files such as a ``sync_mirror`` mirror.
+    previous : PathwayNetwork or str, optional
+        Earlier network (or the directory it was saved to). Pathways whose
+        GPML is unchanged reuse its rows; only new or changed ones are parsed.
+    path : str, optional
+        Save the network to this directory as Parquet (requires pyarrow).
+    max_workers : int, optional
+        Worker processes; defaults to the number of CPUs.
+
+    Returns
+    -------
+    PathwayNetwork
+        The ``failed`` attribute maps WPIDs whose GPML could not be parsed
+        to the error message; they are left out of the network.
+
+    Examples
+    --------
+    >>> archive = download_pathway_archive(organism='Homo sapiens', format='gpml')
+    >>> network = build_pathway_network(archive, path='human-network')
+    >>> network.edges.head()
+    """
+    if isinstance(previous, str):
+        previous = PathwayNetwork.load(previous)
+
+    hashes: Dict[str, str] = {}
+    changed: List[Tuple[str, bytes]] = []
+    for wpid, gpml in _iter_gpml(source):
+        digest = hashlib.sha1(gpml).hexdigest()
+        hashes[wpid] = digest
+        if previous is None or previous.hashes.get(wpid) != digest:
+            changed.append((wpid, gpml))
+
+    node_parts: List[pd.DataFrame] = []
+    edge_parts: List[pd.DataFrame] = []
+    failed: Dict[str, str] = {}
+    if previous is not None:
+        kept = [wpid for wpid, digest in hashes.items() if previous.hashes.get(wpid) == digest]
+        node_parts.append(previous.pathway_nodes[previous.pathway_nodes["pathway"].isin(kept)])
+        edge_parts.append(previous.pathway_edges[previous.pathway_edges["pathway"].isin(kept)])
+
+    with span("parse", pathways=len(changed)):
+        if changed:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                parsed = pool.map(_pathway_tables, changed, chunksize=_CHUNK_SIZE)
+                for wpid, nodes, edges, error in parsed:
+                    if error is not None:
+                        # Not hashed, so the next incremental build retries it.
+                        failed[wpid] = error
+                        del hashes[wpid]
+                        continue
+                    node_parts.append(nodes)
+                    edge_parts.append(edges)
+
+    node_parts = [part for part in node_parts if not part.empty]
+    edge_parts = [part for part in edge_parts if not part.empty]
+    pathway_nodes = (pd.concat(node_parts, ignore_index=True) if node_parts
+                     else pd.DataFrame(columns=_NODE_COLUMNS))
+    pathway_edges = (pd.concat(edge_parts, ignore_index=True) if edge_parts
+                     else pd.DataFrame(columns=_EDGE_COLUMNS))
+    network = PathwayNetwork(pathway_nodes, pathway_edges, hashes)
+    network.failed = failed
+    if path is not None:
+        network.save(path)
+    return network
+
+
+def load_pathway_network(path: str) -> PathwayNetwork:
+    """Load a network saved by ``build_pathway_network(path=...)``."""
+    return PathwayNetwork.load(path)
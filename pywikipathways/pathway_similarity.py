@@ -0,0 +1,248 @@
+"""All-pairs similarity between pathway gene sets."""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .read_gmt import read_gmt
+from .read_pathway_gmt import read_pathway_gmt
+
+_METHODS = ("jaccard", "overlap")
+_MODES = ("exact", "minhash")
+_SET_COLUMNS = ("wpid", "term", "pathway", "id")
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_PERM_BLOCK = 16
+
+
+def _load_gene_sets(gene_sets: Any) -> pd.DataFrame:
+    """Return a two-column (set, gene) frame from any supported input."""
+    if isinstance(gene_sets, (str, os.PathLike)):
+        frame = read_pathway_gmt(gene_sets, backend="pandas")
+        if frame["wpid"].notna().all():
+            return frame[["wpid", "gene"]].set_axis(["set", "gene"], axis=1)
+        return read_gmt(gene_sets, backend="pandas").set_axis(["set", "gene"], axis=1)
+
+    if isinstance(gene_sets, dict):
+        records = [(key, gene) for key, genes in gene_sets.items() for gene in genes]
+        return pd.DataFrame(records, columns=["set", "gene"])
+
+    if isinstance(gene_sets, pd.DataFrame):
+        if "gene" not in gene_sets.columns:
+            raise ValueError("Gene set frame must contain a 'gene' column.")
+        for column in _SET_COLUMNS:
+            if column in gene_sets.columns:
+                return gene_sets[[column, "gene"]].set_axis(["set", "gene"], axis=1)
+        raise ValueError(
+            f"Gene set frame must contain one of: {', '.join(_SET_COLUMNS)}."
+        )
+
+    raise ValueError("gene_sets must be a GMT path, a dict or a DataFrame.")
+
+
+def _incidence(frame: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, pd.Index, int]:
+    """Factorize (set, gene) pairs into deduplicated integer codes."""
+    frame = frame.dropna().drop_duplicates()
+    set_codes, set_labels = pd.factorize(frame["set"].astype(str), sort=True)
+    gene_codes, gene_labels = pd.factorize(frame["gene"].astype(str))
+    order = np.lexsort((gene_codes, set_codes))
+    return set_codes[order], gene_codes[order], set_labels, len(gene_labels)
+
+
+def _score(intersection: np.ndarray, size_a: np.ndarray, size_b: np.ndarray,
+           method: str) -> np.ndarray:
+    intersection = intersection.astype(float)
+    if method == "jaccard":
+        return intersection / (size_a + size_b - intersection)
+    return intersection / np.minimum(size_a, size_b)
+
+
+def _exact_pairs(set_codes: np.ndarray, gene_codes: np.ndarray, n_sets: int,
+                 n_genes: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return upper-triangle pair intersections via a sparse self-product."""
+    try:
+        from scipy import sparse
+    except ImportError as exc:
+        raise ImportError(
+            "Exact pathway similarity requires scipy; install it or use mode='minhash'."
+        ) from exc
+
+    data = np.ones(len(set_codes), dtype=np.int32)
+    incidence = sparse.csr_matrix(
+        (data, (set_codes, gene_codes)), shape=(n_sets, n_genes)
+    )
+    product = sparse.triu(incidence @ incidence.T, k=1).tocoo()
+    return product.row, product.col, product.data
+
+
+def _minhash_signatures(set_codes: np.ndarray, gene_hashes: np.ndarray,
+                        n_sets: int, num_perm: int, seed: int) -> np.ndarray:
+    """Return a ``(num_perm, n_sets)`` MinHash signature matrix."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    starts = np.flatnonzero(np.r_[True, set_codes[1:] != set_codes[:-1]])
+
+    signatures = np.empty((num_perm, n_sets), dtype=np.uint64)
+    for block in range(0, num_perm, _PERM_BLOCK):
+        rows = slice(block, min(block + _PERM_BLOCK, num_perm))
+        permuted = (a[rows, None] * gene_hashes[None, :] + b[rows, None]) % _MERSENNE_PRIME
+        signatures[rows] = np.minimum.reduceat(permuted, starts, axis=1)
+    return signatures
+
+
+def _lsh_candidates(signatures: np.ndarray, bands: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return candidate pairs sharing at least one identical LSH band."""
+    num_perm, n_sets = signatures.shape
+    rows = num_perm // bands
+    encoded = []
+    for band in range(bands):
+        chunk = np.ascontiguousarray(signatures[band * rows:(band + 1) * rows].T)
+        keys = chunk.view(np.dtype((np.void, chunk.dtype.itemsize * rows))).ravel()
+        _, buckets, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        members = np.flatnonzero(counts[buckets] > 1)
+        if len(members) == 0:
+            continue
+        members = members[np.argsort(buckets[members], kind="stable")]
+        member_buckets = buckets[members]
+        splits = np.flatnonzero(np.diff(member_buckets)) + 1
+        for group in np.split(members, splits):
+            left, right = np.triu_indices(len(group), k=1)
+            encoded.append(group[left].astype(np.int64) * n_sets + group[right])
+
+    if not encoded:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    pairs = np.unique(np.concatenate(encoded))
+    return pairs // n_sets, pairs % n_sets
+
+
+def _edge_frame(labels: pd.Index, left: np.ndarray, right: np.ndarray,
+                similarity: np.ndarray, top_k: int | None,
+                threshold: float | None) -> pd.DataFrame:
+    if threshold is not None:
+        keep = similarity >= threshold
+        left, right, similarity = left[keep], right[keep], similarity[keep]
+
+    if top_k is not None:
+        # Each unordered pair is a neighbour of both of its members.
+        source = np.concatenate([left, right])
+        target = np.concatenate([right, left])
+        similarity = np.concatenate([similarity, similarity])
+        order = np.lexsort((target, -similarity, source))
+        source, target, similarity = source[order], target[order], similarity[order]
+        starts = np.flatnonzero(np.r_[True, source[1:] != source[:-1]])
+        rank = np.arange(len(source)) - np.repeat(starts, np.diff(np.r_[starts, len(source)]))
+        keep = rank < top_k
+        left, right, similarity = source[keep], target[keep], similarity[keep]
+    else:
+        order = np.lexsort((right, -similarity, left))
+        left, right, similarity = left[order], right[order], similarity[order]
+
+    return pd.DataFrame({
+        "source": labels.take(left),
+        "target": labels.take(right),
+        "similarity": similarity,
+    })
+
+
+def _default_bands(num_perm: int, threshold: float | None) -> int:
+    """Pick the banding whose S-curve midpoint is closest to ``threshold``."""
+    if threshold is None:
+        threshold = 0.5
+    divisors = [b for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(divisors, key=lambda b: abs((1.0 / b) ** (b / num_perm) - threshold))
+
+
+def pathway_similarity(gene_sets: Any,
+                       method: str = "jaccard",
+                       mode: str = "exact",
+                       top_k: int | None = None,
+                       threshold: float | None = None,
+                       num_perm: int = 128,
+                       bands: int | None = None,
+                       seed: int = 1) -> pd.DataFrame:
+    """Compute pairwise similarity between pathway gene sets.
+
+    Parameters
+    ----------
+    gene_sets : str, dict or pandas.DataFrame
+        A GMT file path, a mapping of set identifier to genes, or a frame such
+        as the output of ``read_pathway_gmt`` (``wpid``/``gene``) or
+        ``read_gmt`` (``term``/``gene``).
+    method : str, optional
+        ``"jaccard"`` (default) or ``"overlap"`` coefficient.
+    mode : str, optional
+        ``"exact"`` (default) computes every intersection with a sparse
+        matrix product (requires scipy). ``"minhash"`` estimates similarity
+        from MinHash signatures and only scores pairs proposed by LSH banding,
+        which scales to large cross-organism collections.
+    top_k : int, optional
+        Return only the ``top_k`` most similar neighbours of each set. Pairs
+        are then listed once per direction.
+    threshold : float, optional
+        Drop pairs whose similarity is below this value. In ``"minhash"``
+        mode it also tunes the default LSH banding.
+    num_perm : int, optional
+        Number of MinHash permutations (``"minhash"`` mode only).
+    bands : int, optional
+        Number of LSH bands; must divide ``num_perm``. Defaults to a banding
+        whose collision threshold approximates ``threshold``.
+    seed : int, optional
+        Seed for the MinHash permutations.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Edge list with ``source``, ``target`` and ``similarity`` columns,
+        excluding self pairs and pairs with no shared genes.
+
+    Examples
+    --------
+    >>> gmt = read_pathway_gmt('wikipathways-Homo_sapiens.gmt')
+    >>> pathway_similarity(gmt, threshold=0.5)
+    >>> pathway_similarity(gmt, method='overlap', top_k=5)
+    >>> pathway_similarity(gmt, mode='minhash', threshold=0.7)
+    """
+    if method not in _METHODS:
+        raise ValueError(f"method must be one of: {', '.join(_METHODS)}.")
+    if mode not in _MODES:
+        raise ValueError(f"mode must be one of: {', '.join(_MODES)}.")
+    if top_k is not None and top_k < 1:
+        raise ValueError("top_k must be a positive integer.")
+
+    set_codes, gene_codes, labels, n_genes = _incidence(_load_gene_sets(gene_sets))
+    n_sets = len(labels)
+    sizes = np.bincount(set_codes, minlength=n_sets).astype(float)
+
+    if n_sets < 2:
+        left = right = np.empty(0, dtype=np.int64)
+        similarity = np.empty(0, dtype=float)
+    elif mode == "exact":
+        left, right, intersection = _exact_pairs(set_codes, gene_codes, n_sets, n_genes)
+        similarity = _score(intersection, sizes[left], sizes[right], method)
+    else:
+        if bands is None:
+            bands = _default_bands(num_perm, threshold)
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm.")
+        hashes = pd.util.hash_array(np.arange(n_genes, dtype=np.int64)) % _MERSENNE_PRIME
+        gene_hashes = hashes[gene_codes]
+        signatures = _minhash_signatures(set_codes, gene_hashes, n_sets, num_perm, seed)
+        left, right = _lsh_candidates(signatures, bands)
+        jaccard = (signatures[:, left] == signatures[:, right]).mean(axis=0)
+        if method == "jaccard":
+            similarity = jaccard
+        else:
+            intersection = jaccard / (1.0 + jaccard) * (sizes[left] + sizes[right])
+            similarity = np.minimum(intersection / np.minimum(sizes[left], sizes[right]), 1.0)
+        nonzero = similarity > 0
+        left, right, similarity = left[nonzero], right[nonzero], similarity[nonzero]
+
+    return _edge_frame(labels, left, right, similarity, top_k, threshold)
+
+
+__all__ = ["pathway_similarity"]
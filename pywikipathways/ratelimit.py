@@ -0,0 +1,200 @@
+"""Client-side token-bucket rate limiting for the HTTP transport.
+
+Limits are configured per host with ``set_rate_limit`` and applied by
+``utilities.wikipathways_get``. Nothing is limited until a limit is set.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator
+from urllib.parse import urlsplit
+
+from .tracing import span
+
+_limits: Dict[str, "_HostLimit"] = {}
+_lock = threading.Lock()
+
+_DEFAULT_HOST = "*"
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    A caller that finds the bucket empty reserves the next token and sleeps
+    until it is due, so waiting callers are served in arrival order instead
+    of retrying in a loop.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1.")
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+
+    def _reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> float:
+        """Block until a token is available; return the seconds waited."""
+        delay = self._reserve()
+        if delay:
+            with span("rate_limit"):
+                time.sleep(delay)
+        return delay
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket whose state lives in ``path`` so processes share a budget.
+
+    The file holds the token count and the wall-clock time of the last
+    update and is guarded by an exclusive ``fcntl`` lock, so every worker
+    process on a node draws from the same bucket. POSIX only.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None, path: str = ""):
+        super().__init__(rate, burst)
+        try:
+            import fcntl  # noqa: F401
+        except ImportError as exc:
+            raise ImportError(
+                "The file-lock rate limit backend requires fcntl (POSIX)."
+            ) from exc
+        if not path:
+            raise ValueError("Must provide a lock file path.")
+        self.path = path
+
+    def _reserve(self) -> float:
+        import fcntl
+
+        with self._lock, open(self.path, "a+", encoding="ascii") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                fields = handle.read().split()
+                now = time.time()
+                if len(fields) == 2:
+                    tokens, stamp = float(fields[0]), float(fields[1])
+                    tokens = min(self.burst, tokens + max(0.0, now - stamp) * self.rate)
+                else:
+                    tokens = self.burst
+                tokens -= 1
+                handle.seek(0)
+                handle.truncate()
+                handle.write(f"{tokens!r} {now!r}\n")
+                handle.flush()
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+        return max(0.0, -tokens / self.rate)
+
+
+class _HostLimit:
+    def __init__(self, bucket: TokenBucket | None, max_concurrency: int | None):
+        self.bucket = bucket
+        self.max_concurrency = max_concurrency
+        self.slots = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+
+    @contextlib.contextmanager
+    def __call__(self) -> Iterator[None]:
+        if self.slots is not None:
+            self.slots.acquire()
+        try:
+            if self.bucket is not None:
+                self.bucket.acquire()
+            yield
+        finally:
+            if self.slots is not None:
+                self.slots.release()
+
+
+def set_rate_limit(host: str | None = None,
+                   rate: float | None = None,
+                   burst: float | None = None,
+                   max_concurrency: int | None = None,
+                   lock_file: str | None = None) -> None:
+    """Limit the request rate and concurrency towards ``host``.
+
+    Parameters
+    ----------
+    host : str, optional
+        Host name such as ``"www.wikipathways.org"``. Defaults to every host
+        without a limit of its own.
+    rate : float, optional
+        Sustained requests per second. None leaves the rate unlimited.
+    burst : float, optional
+        Bucket size, i.e. how many requests may start back to back after an
+        idle period. Defaults to ``max(1, rate)``.
+    max_concurrency : int, optional
+        Maximum number of requests in flight at once from this process.
+    lock_file : str, optional
+        Share the token bucket across processes through this file (POSIX).
+
+    Examples
+    --------
+    >>> set_rate_limit('www.wikipathways.org', rate=10, max_concurrency=4)
+    """
+    if rate is None and max_concurrency is None:
+        raise ValueError("Must provide rate and/or max_concurrency.")
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+    if rate is None:
+        bucket = None
+    elif lock_file is not None:
+        bucket = FileTokenBucket(rate, burst, os.fspath(lock_file))
+    else:
+        bucket = TokenBucket(rate, burst)
+    with _lock:
+        _limits[host or _DEFAULT_HOST] = _HostLimit(bucket, max_concurrency)
+
+
+def clear_rate_limit(host: str | None = None) -> None:
+    """Remove the limit of ``host``, or every limit when ``host`` is None."""
+    with _lock:
+        if host is None:
+            _limits.clear()
+        else:
+            _limits.pop(host, None)
+
+
+def get_rate_limits() -> Dict[str, Dict[str, Any]]:
+    """Return the configured limits as ``{host: {rate, burst, max_concurrency}}``."""
+    with _lock:
+        items = list(_limits.items())
+    return {
+        host: {
+            "rate": limit.bucket.rate if limit.bucket else None,
+            "burst": limit.bucket.burst if limit.bucket else None,
+            "max_concurrency": limit.max_concurrency,
+        }
+        for host, limit in items
+    }
+
+
+def _limit_for(url: str) -> "_HostLimit | None":
+    host = urlsplit(url).hostname or ""
+    return _limits.get(host) or _limits.get(_DEFAULT_HOST)
+
+
+__all__ = [
+    "TokenBucket",
+    "FileTokenBucket",
+    "set_rate_limit",
+    "clear_rate_limit",
+    "get_rate_limits",
+]
@@ -0,0 +1,254 @@
+"""Precomputed upstream/downstream reachability over a merged pathway network."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+from .metrics import instrument
+from .pathway_graph import _gather
+from .pathway_network import PathwayNetwork
+from .tracing import span
+
+__all__ = ["ReachabilityIndex", "build_reachability_index"]
+
+
+def _require_scipy():
+    try:
+        from scipy import sparse
+        from scipy.sparse import csgraph
+    except ImportError as exc:
+        raise ImportError(
+            "Reachability indexes require scipy; install it with 'pip install scipy'."
+        ) from exc
+    return sparse, csgraph
+
+
+def _set_bits(row: np.ndarray, positions: np.ndarray) -> None:
+    np.bitwise_or.at(row, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+
+
+class ReachabilityIndex:
+    """Transitive closure of a ``PathwayNetwork`` for constant-time queries.
+
+    Strongly connected components are condensed into a DAG and every
+    component stores the set of components it reaches as a packed bitset,
+    filled in reverse topological order. ``reachable`` is then a single bit
+    test; ``explain`` adds the pathways that show the connection.
+
+    Parameters
+    ----------
+    network : PathwayNetwork
+        Merged network from ``build_pathway_network``.
+    interactions : iterable of str, optional
+        Only follow these interaction types (e.g. ``"mim-conversion"``,
+        ``"Arrow"``). All types by default.
+    """
+
+    def __init__(self, network: PathwayNetwork, interactions: Iterable[str] | None = None):
+        sparse, csgraph = _require_scipy()
+        self.network = network
+        self.keys = network.nodes["key"].to_numpy()
+        self._positions = {key: i for i, key in enumerate(self.keys)}
+        self._labels: Dict[str, int] = {}
+        for i, label in enumerate(network.nodes["label"]):
+            if label:
+                self._labels.setdefault(label, i)
+
+        edges, pathway_edges = network.edges, network.pathway_edges
+        if interactions is not None:
+            interactions = set(interactions)
+            edges = edges[edges["interaction"].isin(interactions)]
+            pathway_edges = pathway_edges[pathway_edges["interaction"].isin(interactions)]
+        size = len(self.keys)
+        sources = edges["source"].map(self._positions).to_numpy(dtype=np.int64)
+        targets = edges["target"].map(self._positions).to_numpy(dtype=np.int64)
+        adjacency = sparse.csr_matrix(
+            (np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(size, size)
+        )
+        self.indptr = adjacency.indptr.astype(np.int64)
+        self.indices = adjacency.indices.astype(np.int64)
+        self._pathway_edges = dict(tuple(pathway_edges.groupby("pathway")))
+        self._hops = edges.set_index(["source", "target"])["pathways"].sort_index()
+
+        with span("condense"):
+            count, self.components = csgraph.connected_components(
+                adjacency, directed=True, connection="strong"
+            )
+            self._component_size = np.bincount(self.components, minlength=count)
+            self._cyclic = self._component_size > 1
+            self._cyclic[self.components[sources[sources == targets]]] = True
+            dag = np.unique(
+                np.stack([self.components[sources], self.components[targets]]), axis=1
+            )
+            dag = dag[:, dag[0] != dag[1]]
+        with span("closure"):
+            self.reach = self._closure(count, dag[0], dag[1])
+
+    @staticmethod
+    def _closure(count: int, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        order = np.argsort(sources, kind="stable")
+        sources, targets = sources[order], targets[order]
+        indptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=count), out=indptr[1:])
+        indegree = np.bincount(targets, minlength=count)
+
+        # Kahn's algorithm; rows are then filled from the sinks upwards.
+        queue = deque(np.flatnonzero(indegree == 0).tolist())
+        topological: List[int] = []
+        while queue:
+            component = queue.popleft()
+            topological.append(component)
+            for successor in targets[indptr[component]:indptr[component + 1]]:
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    queue.append(int(successor))
+
+        reach = np.zeros((count, (count + 7) // 8), dtype=np.uint8)
+        for component in reversed(topological):
+            successors = targets[indptr[component]:indptr[component + 1]]
+            if len(successors):
+                row = reach[component]
+                np.bitwise_or.reduce(reach[successors], axis=0, out=row)
+                _set_bits(row, successors)
+        return reach
+
+    def __repr__(self) -> str:
+        return (f"ReachabilityIndex({len(self.keys)} nodes, "
+                f"{len(self._component_size)} components)")
+
+    def node_index(self, node: str) -> int:
+        """Return the position of a node key (``"ncbigene:1636"``) or label."""
+        if node in self._positions:
+            return self._positions[node]
+        if node in self._labels:
+            return self._labels[node]
+        raise KeyError(node)
+
+    def _reaches(self, source: int, target: int) -> bool:
+        a, b = self.components[source], self.components[target]
+        if a == b:
+            return bool(self._cyclic[a])
+        return bool(self.reach[a, b >> 3] >> (b & 7) & 1)
+
+    def reachable(self, source: str, target: str) -> bool:
+        """Return True if ``target`` is downstream of ``source``."""
+        return self._reaches(self.node_index(source), self.node_index(target))
+
+    def downstream(self, node: str) -> List[str]:
+        """Return the keys of every node reachable from ``node``."""
+        position = self.node_index(node)
+        component = self.components[position]
+        bits = np.unpackbits(self.reach[component], bitorder="little")[:len(self._cyclic)]
+        if self._cyclic[component]:
+            bits[component] = 1
+        return self.keys[np.flatnonzero(bits[self.components])].tolist()
+
+    def upstream(self, node: str) -> List[str]:
+        """Return the keys of every node from which ``node`` is reachable."""
+        position = self.node_index(node)
+        component = self.components[position]
+        bits = (self.reach[:, component >> 3] >> (component & 7)) & 1
+        if self._cyclic[component]:
+            bits[component] = 1
+        return self.keys[np.flatnonzero(bits[self.components])].tolist()
+
+    def shortest_path(self, source: str, target: str) -> List[str]:
+        """Return one shortest path of node keys, or an empty list.
+
+        For ``source == target`` on a cycle, the path is the shortest cycle
+        through that node, starting and ending with it.
+        """
+        start, goal = self.node_index(source), self.node_index(target)
+        if not self._reaches(start, goal):
+            return []
+        parent = np.full(len(self.keys), -1, dtype=np.int64)
+        if start != goal:
+            # Left unmarked for a cycle, so the search can come back to it.
+            parent[start] = start
+        frontier = np.array([start], dtype=np.int64)
+        while parent[goal] < 0 and len(frontier):
+            lengths = self.indptr[frontier + 1] - self.indptr[frontier]
+            reached = _gather(self.indptr, self.indices, frontier)
+            origins = np.repeat(frontier, lengths)
+            fresh = parent[reached] < 0
+            reached, origins = reached[fresh], origins[fresh]
+            reached, first = np.unique(reached, return_index=True)
+            parent[reached] = origins[first]
+            frontier = reached
+        path = [goal, int(parent[goal])]
+        while path[-1] != start:
+            path.append(int(parent[path[-1]]))
+        return self.keys[path[::-1]].tolist()
+
+    def explain(self, source: str, target: str) -> Dict[str, Any]:
+        """Return whether and how ``target`` is downstream of ``source``.
+
+        Returns
+        -------
+        dict
+            ``reachable``; ``pathways``, the WPIDs in which ``source`` reaches
+            ``target`` using only that pathway's interactions; ``path``, a
+            shortest path of node keys in the merged network; and
+            ``path_pathways``, the WPIDs drawing each hop of that path.
+        """
+        start, goal = self.node_index(source), self.node_index(target)
+        source_key, target_key = self.keys[start], self.keys[goal]
+        if not self._reaches(start, goal):
+            return {"reachable": False, "pathways": [], "path": [], "path_pathways": []}
+
+        nodes = self.network.nodes
+        shared = set(nodes.at[start, "pathways"]) & set(nodes.at[goal, "pathways"])
+        witnesses = [
+            wpid for wpid in sorted(shared)
+            if wpid in self._pathway_edges
+            and _connected(self._pathway_edges[wpid], source_key, target_key)
+        ]
+
+        path = self.shortest_path(source_key, target_key)
+        hops = [
+            sorted({wpid for values in self._hops.loc[[(a, b)]] for wpid in values})
+            for a, b in zip(path, path[1:])
+        ]
+        return {"reachable": True, "pathways": witnesses, "path": path, "path_pathways": hops}
+
+
+def _connected(edges, source: str, target: str) -> bool:
+    successors: Dict[str, List[str]] = {}
+    for a, b in zip(edges["source"], edges["target"]):
+        successors.setdefault(a, []).append(b)
+    seen = {source}
+    queue = deque([source])
+    while queue:
+        for nxt in successors.get(queue.popleft(), ()):
+            if nxt == target:
+                return True
+            if nxt not in seen:
+                seen.add(nxt)
+                queue.append(nxt)
+    return False
+
+
+@instrument
+def build_reachability_index(network: PathwayNetwork | str,
+                             interactions: Iterable[str] | None = None) -> ReachabilityIndex:
+    """Build a ``ReachabilityIndex`` over a merged network.
+
+    Parameters
+    ----------
+    network : PathwayNetwork or str
+        Network from ``build_pathway_network`` or the directory it was saved to.
+    interactions : iterable of str, optional
+        Only follow these interaction types.
+
+    Examples
+    --------
+    >>> index = build_reachability_index('human-network')
+    >>> index.reachable('ncbigene:183', 'ncbigene:1636')
+    >>> index.explain('AGT', 'AGTR1')['pathways']
+    """
+    if isinstance(network, str):
+        network = PathwayNetwork.load(network)
+    return ReachabilityIndex(network, interactions)
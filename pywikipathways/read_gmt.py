@@ -1,5 +1,7 @@
 import pandas as pd
 
+from .backend import with_backend
+
 
 def _read_gmt_records(file):
     rows = []
@@ -15,6 +17,7 @@ def _read_gmt_records(file):
     return rows
 
 
+@with_backend
 def read_gmt(file):
     """Read a generic GMT file as term-gene associations."""
     rows = _read_gmt_records(file)
@@ -26,6 +29,7 @@ def read_gmt(file):
     return pd.DataFrame(records, columns=["term", "gene"])
 
 
+@with_backend
 def read_gmtnames(file):
     """Read a generic GMT file as term-name associations."""
     rows = _read_gmt_records(file)
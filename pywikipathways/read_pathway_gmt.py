@@ -1,10 +1,17 @@
 import pandas as pd
 
+from .backend import with_backend
+from .compact import _compact
 from .read_gmt import _read_gmt_records
 
 
-def read_pathway_gmt(file):
-    """Read a WikiPathways GMT file as pathway-gene associations."""
+@with_backend
+def read_pathway_gmt(file, compact=False):
+    """Read a WikiPathways GMT file as pathway-gene associations.
+
+    Pass ``compact=True`` to store the repeated name, version, wpid and org
+    values as categoricals (``"arrow"`` also makes gene Arrow-backed).
+    """
     rows = _read_gmt_records(file)
     records = []
     for parts in rows:
@@ -19,4 +26,4 @@ def read_pathway_gmt(file):
     split = frame["pathway"].str.split("%", n=3, expand=True)
     split = split.reindex(columns=[0, 1, 2, 3])
     split.columns = ["name", "version", "wpid", "org"]
-    return pd.concat([split, frame[["gene"]]], axis=1)
+    return _compact(pd.concat([split, frame[["gene"]]], axis=1), compact)
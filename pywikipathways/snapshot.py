@@ -0,0 +1,454 @@
+"""Columnar snapshots of the WikiPathways JSON endpoint tables.
+
+A snapshot is a directory holding one Arrow IPC (Feather) or Parquet file per
+endpoint table plus a ``snapshot.json`` manifest with a version stamp. Once a
+snapshot is activated with ``use_snapshot``, the ``list_*``, ``get_*`` and
+``find_*`` functions read their tables from it instead of downloading and
+decoding the JSON endpoints. Tables are memory mapped: filtered lookups
+(``ids=``, ``columns=``, ...) select rows and columns in Arrow and convert
+only those, while functions that scan a whole table convert it to pandas
+once. List columns come back as lists and columns Arrow cannot type are
+stored as JSON, so snapshot tables match the live ones.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import importlib
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List
+
+import pandas as pd
+
+from . import metrics
+from ._version import __version__
+from .tracing import span
+
+_MANIFEST = "snapshot.json"
+_FORMAT_VERSION = 1
+_EXTENSIONS = {"feather": ".arrow", "parquet": ".parquet"}
+
+# Table name (the JSON endpoint it mirrors) -> (module, frame builder).
+_TABLES = {
+    "listPathways": ("list_pathways", "_list_pathways_frame"),
+    "getPathwayInfo": ("get_pathway_info", "_pathway_info_frame"),
+    "findPathwaysByText": ("find_pathways_by_text", "_find_pathways_by_text_frame"),
+    "findPathwaysByXref": ("find_pathways_by_xref", "_find_pathways_by_xref_frame"),
+    "findPathwaysByLiterature": (
+        "find_pathways_by_literature", "_find_pathways_by_literature_frame"
+    ),
+    "findPathwaysByOrcid": ("find_pathways_by_orcid", "_find_pathways_by_orcid_frame"),
+    "getOntologyTermsByPathway": ("get_ontology_terms", "_ontology_terms_frame"),
+    "getPathwaysByOntologyTerm": ("get_ontology_terms", "_pathways_by_ontology_term_frame"),
+    "listCommunities": ("list_communities", "_communities_frame"),
+    "listOrganisms": ("list_organisms", "_organisms_frame"),
+    "getCounts": ("get_counts", "_counts_frame"),
+}
+
+_active = None
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError(
+            "Snapshots require pyarrow; install it with 'pip install pyarrow'."
+        ) from exc
+    return pyarrow
+
+
+class _Snapshot:
+    """An opened snapshot directory whose tables are loaded on first use."""
+
+    def __init__(self, path: str, manifest: Dict[str, Any]):
+        self.path = path
+        self.manifest = manifest
+        self._arrow: Dict[str, Any] = {}
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def json_columns(self, name: str) -> List[str]:
+        return self.manifest["tables"][name].get("json_columns", [])
+
+    def arrow(self, name: str):
+        """Return the memory-mapped Arrow table of ``name``, or None."""
+        if name not in self._arrow:
+            entry = self.manifest["tables"].get(name)
+            if entry is None:
+                return None
+            _require_pyarrow()
+            self._arrow[name] = _read_arrow(
+                os.path.join(self.path, entry["file"]), self.manifest["format"]
+            )
+        return self._arrow[name]
+
+    def table(self, name: str) -> pd.DataFrame | None:
+        if name not in self._frames:
+            table = self.arrow(name)
+            if table is None:
+                return None
+            with span("snapshot_read", file=self.manifest["tables"][name]["file"]):
+                self._frames[name] = _arrow_to_pandas(table, self.json_columns(name))
+        return self._frames[name]
+
+
+def _read_manifest(path: str) -> Dict[str, Any]:
+    manifest_path = os.path.join(path, _MANIFEST)
+    try:
+        with open(manifest_path, encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except FileNotFoundError as exc:
+        raise ValueError(f"'{path}' is not a pywikipathways snapshot.") from exc
+    if manifest.get("format_version") != _FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot format version {manifest.get('format_version')}."
+        )
+    return manifest
+
+
+def _read_arrow(path: str, fmt: str):
+    if fmt == "parquet":
+        from pyarrow import parquet
+        table = parquet.read_table(path, memory_map=True)
+    else:
+        from pyarrow import feather
+        table = feather.read_table(path, memory_map=True)
+    return table
+
+
+def _is_null(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _encode_value(value: Any) -> str | None:
+    if _is_null(value):
+        return None
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def _encode_json(value: Any) -> str | None:
+    return None if _is_null(value) else json.dumps(value, default=str)
+
+
+def _to_arrow(frame: pd.DataFrame, json_columns: List[str] | None = None):
+    """Convert a frame to Arrow, stringifying columns Arrow cannot infer.
+
+    When ``json_columns`` is a list, those columns are stored as JSON text
+    and their names appended to it, so ``_arrow_to_pandas`` can decode them.
+    """
+    pyarrow = _require_pyarrow()
+    try:
+        return pyarrow.Table.from_pandas(frame, preserve_index=False)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        pass
+    frame = frame.copy()
+    for column in frame.columns:
+        try:
+            pyarrow.array(frame[column], from_pandas=True)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            if json_columns is None:
+                frame[column] = frame[column].map(_encode_value)
+            else:
+                frame[column] = frame[column].map(_encode_json)
+                json_columns.append(column)
+    return pyarrow.Table.from_pandas(frame, preserve_index=False)
+
+
+def _arrow_to_pandas(table, json_columns: Iterable[str] = ()) -> pd.DataFrame:
+    """Convert a snapshot table to pandas with the values the endpoint decodes to.
+
+    ``to_pandas`` turns list columns into numpy arrays; they are rebuilt as
+    lists, and JSON-encoded columns are decoded.
+    """
+    pyarrow = _require_pyarrow()
+    frame = table.to_pandas()
+    for field in table.schema:
+        if pyarrow.types.is_list(field.type) or pyarrow.types.is_large_list(field.type):
+            frame[field.name] = pd.Series(
+                table.column(field.name).to_pylist(), index=frame.index, dtype=object
+            )
+    for column in json_columns:
+        if column in frame.columns:
+            frame[column] = frame[column].map(
+                lambda value: json.loads(value) if isinstance(value, str) else None
+            )
+    return frame
+
+
+def _filter_arrow(table, accepted: Dict[str, set]):
+    """Return the rows of ``table`` whose columns hold one of the accepted values."""
+    pyarrow = _require_pyarrow()
+    from pyarrow import compute
+
+    mask = None
+    for column, values in accepted.items():
+        wanted = [value for value in values if value is not None]
+        if column in table.column_names:
+            data = table.column(column)
+            value_set = pyarrow.array(wanted)
+            try:
+                if data.type != value_set.type:
+                    data = compute.cast(data, value_set.type)
+                hit = compute.fill_null(compute.is_in(data, value_set=value_set), False)
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError):
+                hit = pyarrow.array([False] * table.num_rows)
+            if None in values:
+                hit = compute.or_(hit, compute.is_null(data))
+        else:
+            hit = pyarrow.array([None in values] * table.num_rows)
+        mask = hit if mask is None else compute.and_(mask, hit)
+    return table if mask is None else table.filter(mask)
+
+
+def _build_table(name: str) -> pd.DataFrame:
+    module_name, builder_name = _TABLES[name]
+    module = importlib.import_module(f"{__package__}.{module_name}")
+    frame = getattr(module, builder_name)()
+    if frame is None:
+        raise RuntimeError(f"Failed to build the '{name}' table.")
+    return frame
+
+
+def _snapshot_table(name: str, builder: Callable[[], pd.DataFrame | None]) -> pd.DataFrame | None:
+    """Return ``name`` from the active snapshot, or build it with ``builder``."""
+    frame = _active.table(name) if _active is not None else None
+    hit = frame is not None
+    frame = frame.copy(deep=False) if hit else builder()
+    if metrics._sinks:
+        metrics.record_cache("snapshot", hit)
+        if frame is not None:
+            metrics.record_rows_in(len(frame))
+    return frame
+
+
+def _flatten_arrow(table):
+    """Flatten struct columns to dotted names, as ``pd.json_normalize`` does."""
+    pyarrow = _require_pyarrow()
+    while any(pyarrow.types.is_struct(field.type) for field in table.schema):
+        table = table.flatten()
+    return table
+
+
+def _project_arrow(table, columns: List[str] | None):
+    """Select ``columns`` in order; missing ones become null columns."""
+    pyarrow = _require_pyarrow()
+    if columns is None:
+        return table
+    arrays = [table.column(column) if column in table.column_names
+              else pyarrow.nulls(table.num_rows) for column in columns]
+    return pyarrow.table(arrays, names=columns)
+
+
+def _record_pushdown(hit: bool, rows_in: int) -> None:
+    if metrics._sinks:
+        metrics.record_cache("snapshot", hit)
+        metrics.record_rows_in(rows_in)
+
+
+def _pushdown_table(name: str,
+                    columns: Iterable[str] | None = None,
+                    filters: Dict[str, Iterable[Any]] | None = None,
+                    normalize: Callable[[List[Dict[str, Any]]], pd.DataFrame] = pd.DataFrame,
+                    ) -> Any:
+    """Return the rows of ``name`` matching ``filters``, restricted to ``columns``.
+
+    ``filters`` maps a column to its accepted values. The memory-mapped
+    snapshot table is filtered and projected in Arrow, and only the result is
+    converted; otherwise the endpoint records are streamed and filtered and
+    projected one at a time. Either way, unselected rows and fields are never
+    turned into DataFrame cells. Nested fields may be requested
+    with dotted names (``"a.b"``) when ``normalize`` flattens them. A filter
+    on a missing column treats its values as None on both paths.
+
+    Inside a call for the pyarrow or polars backend the result is a
+    ``pyarrow.Table`` built straight from the snapshot or the streamed
+    records, without a pandas intermediate.
+    """
+    from .backend import _arrow_requested
+    from .iter_pathway_records import iter_pathway_records
+
+    columns = list(columns) if columns is not None else None
+    accepted = {column: set(values) for column, values in (filters or {}).items()}
+    arrow = getattr(_active, "arrow", None)
+    table = arrow(name) if arrow is not None else None
+    frame = _active.table(name) if table is None and _active is not None else None
+    hit = table is not None or frame is not None
+    as_arrow = _arrow_requested()
+    if table is not None:
+        rows_in = table.num_rows
+        with span("filter"):
+            table = _filter_arrow(table, accepted)
+        if as_arrow:
+            _record_pushdown(hit, rows_in)
+            return _project_arrow(table, columns)
+        if columns is not None:
+            table = table.select([column for column in dict.fromkeys(columns)
+                                  if column in table.column_names])
+        with span("dataframe"):
+            frame = _arrow_to_pandas(table, _active.json_columns(name))
+    elif hit:
+        rows_in = len(frame)
+        mask = pd.Series(True, index=frame.index)
+        with span("filter"):
+            for column, values in accepted.items():
+                if column in frame.columns:
+                    mask &= frame[column].isin(values)
+                elif None not in values:
+                    mask &= False
+        frame = frame[mask]
+    else:
+        keep = None if columns is None else {column.split(".", 1)[0] for column in columns}
+        records: List[Dict[str, Any]] = []
+        rows_in = 0
+        with span("stream"):
+            for record in iter_pathway_records(name):
+                rows_in += 1
+                if any(record.get(column) not in values for column, values in accepted.items()):
+                    continue
+                if keep is not None:
+                    record = {key: record[key] for key in keep if key in record}
+                records.append(record)
+        if as_arrow:
+            pyarrow = _require_pyarrow()
+            try:
+                with span("arrow"):
+                    table = pyarrow.Table.from_pylist(records)
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+                table = None
+            if table is not None:
+                if normalize is pd.json_normalize:
+                    table = _flatten_arrow(table)
+                _record_pushdown(hit, rows_in)
+                return _project_arrow(table, columns)
+        with span("dataframe"):
+            frame = normalize(records)
+    _record_pushdown(hit, rows_in)
+    if columns is not None:
+        frame = frame.reindex(columns=columns)
+    return frame.reset_index(drop=True)
+
+
+def export_snapshot(destpath: str = "./wikipathways-snapshot",
+                    tables: Iterable[str] | None = None,
+                    format: str = "feather") -> str:
+    """Download endpoint tables and write them as a columnar snapshot.
+
+    Parameters
+    ----------
+    destpath : str, optional
+        Directory to write the snapshot to. It is created if missing.
+    tables : iterable of str, optional
+        Endpoint tables to export, e.g. ``["listPathways", "getPathwayInfo"]``.
+        Defaults to every supported table.
+    format : str, optional
+        ``"feather"`` (default, uncompressed Arrow IPC that can be memory
+        mapped) or ``"parquet"``.
+
+    Returns
+    -------
+    str
+        Path of the snapshot directory.
+
+    Raises
+    ------
+    ValueError
+        If a table name or the format is not supported.
+    RuntimeError
+        If an endpoint table cannot be retrieved.
+
+    Examples
+    --------
+    >>> export_snapshot('snapshots/current')
+    >>> use_snapshot('snapshots/current')
+    >>> list_pathways('Mus musculus')  # served from the snapshot
+    """
+    if format not in _EXTENSIONS:
+        raise ValueError(f"format must be one of: {', '.join(_EXTENSIONS)}.")
+    names: List[str] = list(_TABLES) if tables is None else list(tables)
+    unknown = [name for name in names if name not in _TABLES]
+    if unknown:
+        raise ValueError(f"Unsupported snapshot tables: {', '.join(unknown)}.")
+    _require_pyarrow()
+
+    os.makedirs(destpath, exist_ok=True)
+    entries: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        json_columns: List[str] = []
+        table = _to_arrow(_build_table(name), json_columns)
+        filename = name + _EXTENSIONS[format]
+        path = os.path.join(destpath, filename)
+        if format == "parquet":
+            from pyarrow import parquet
+            parquet.write_table(table, path)
+        else:
+            from pyarrow import feather
+            feather.write_feather(table, path, compression="uncompressed")
+        entries[name] = {"file": filename, "rows": table.num_rows, "json_columns": json_columns}
+
+    manifest = {
+        "format_version": _FORMAT_VERSION,
+        "pywikipathways": __version__,
+        "created": _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
+        "format": format,
+        "tables": entries,
+    }
+    with open(os.path.join(destpath, _MANIFEST), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+    return destpath
+
+
+def load_snapshot(path: str, tables: Iterable[str] | None = None) -> Dict[str, pd.DataFrame]:
+    """Load snapshot tables into DataFrames.
+
+    Parameters
+    ----------
+    path : str
+        Snapshot directory written by ``export_snapshot``.
+    tables : iterable of str, optional
+        Tables to load. Defaults to every table in the snapshot.
+
+    Returns
+    -------
+    dict of str to pandas.DataFrame
+        Mapping of table name to its frame.
+    """
+    snapshot = _Snapshot(path, _read_manifest(path))
+    names = snapshot.manifest["tables"] if tables is None else tables
+    return {name: snapshot.table(name) for name in names}
+
+
+def use_snapshot(path: str | None) -> Dict[str, Any] | None:
+    """Serve endpoint tables from a snapshot instead of the network.
+
+    Tables missing from the snapshot are still fetched from WikiPathways.
+
+    Parameters
+    ----------
+    path : str or None
+        Snapshot directory written by ``export_snapshot``, or None to go back
+        to fetching every table from the network.
+
+    Returns
+    -------
+    dict or None
+        The snapshot manifest, including its version stamp.
+    """
+    global _active
+    if path is None:
+        _active = None
+        return None
+    _active = _Snapshot(path, _read_manifest(path))
+    return _active.manifest
+
+
+def snapshot_info(path: str | None = None) -> Dict[str, Any] | None:
+    """Return the manifest of ``path``, or of the active snapshot if omitted."""
+    if path is not None:
+        return _read_manifest(path)
+    return None if _active is None else _active.manifest
+
+
+__all__ = ["export_snapshot", "load_snapshot", "use_snapshot", "snapshot_info"]
@@ -0,0 +1,190 @@
+"""Nested timing spans around the stages of each public function.
+
+Spans are only created while a tracer is installed with ``set_tracer`` or
+``profile``; otherwise ``span`` returns a shared no-op context manager.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+
+_tracer: "Tracer | None" = None
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "pywikipathways_span", default=None
+)
+
+
+class Span:
+    """A timed stage with optional attributes and child spans."""
+
+    __slots__ = ("name", "attributes", "parent", "children", "start", "end")
+
+    def __init__(self, name: str, parent: "Span | None", attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.children: List[Span] = []
+        self.start = time.perf_counter()
+        self.end: float | None = None
+
+    @property
+    def duration(self) -> float:
+        """Elapsed seconds (up to now while the span is still open)."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, {self.duration * 1000:.3f} ms)"
+
+
+class Tracer:
+    """Base class for span consumers; override ``on_start``/``on_end``."""
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        pass
+
+
+class InMemoryRecorder(Tracer):
+    """Keep finished root spans (with their children) in memory."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: List[Span] = []
+
+    def on_end(self, span: Span) -> None:
+        if span.parent is None:
+            with self._lock:
+                self.spans.append(span)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Aggregate spans by their path, e.g. ``get_pathway/parse``.
+
+        Returns
+        -------
+        list of dict
+            ``path``, ``count``, ``total`` and ``mean`` seconds per path,
+            sorted by total time, slowest first.
+        """
+        totals: Dict[str, List[float]] = {}
+
+        def visit(span: Span, prefix: str) -> None:
+            path = f"{prefix}/{span.name}" if prefix else span.name
+            entry = totals.setdefault(path, [0, 0.0])
+            entry[0] += 1
+            entry[1] += span.duration
+            for child in span.children:
+                visit(child, path)
+
+        with self._lock:
+            roots = list(self.spans)
+        for root in roots:
+            visit(root, "")
+        rows = [
+            {"path": path, "count": count, "total": total, "mean": total / count}
+            for path, (count, total) in totals.items()
+        ]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def report(self) -> str:
+        """Return ``summary()`` as a fixed-width text table."""
+        lines = [f"{'total ms':>10} {'count':>6} {'mean ms':>10}  path"]
+        for row in self.summary():
+            lines.append(
+                f"{row['total'] * 1000:10.3f} {row['count']:6d} "
+                f"{row['mean'] * 1000:10.3f}  {row['path']}"
+            )
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+@contextlib.contextmanager
+def _active_span(name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+    tracer = _tracer
+    parent = _current_span.get()
+    current = Span(name, parent, attributes)
+    if parent is not None:
+        parent.children.append(current)
+    token = _current_span.set(current)
+    tracer.on_start(current)
+    try:
+        yield current
+    finally:
+        current.end = time.perf_counter()
+        _current_span.reset(token)
+        tracer.on_end(current)
+
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def span(name: str, **attributes: Any):
+    """Return a context manager timing the enclosed stage as ``name``.
+
+    Examples
+    --------
+    >>> with span("filter", rows=len(df)):
+    ...     df = df[mask]
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _active_span(name, attributes)
+
+
+def set_tracer(tracer: Tracer | None) -> Tracer | None:
+    """Install ``tracer`` (None disables tracing) and return the previous one."""
+    global _tracer
+    previous = _tracer
+    _tracer = tracer
+    return previous
+
+
+def get_tracer() -> Tracer | None:
+    """Return the installed tracer, or None when tracing is disabled."""
+    return _tracer
+
+
+@contextlib.contextmanager
+def profile(tracer: Tracer | None = None) -> Iterator[Tracer]:
+    """Record spans for the enclosed block.
+
+    Parameters
+    ----------
+    tracer : Tracer, optional
+        Tracer to install for the block. Defaults to a new
+        ``InMemoryRecorder``.
+
+    Examples
+    --------
+    >>> with profile() as recorder:
+    ...     find_pathways_by_text('cancer')
+    >>> print(recorder.report())
+    """
+    recorder = tracer if tracer is not None else InMemoryRecorder()
+    previous = set_tracer(recorder)
+    try:
+        yield recorder
+    finally:
+        set_tracer(previous)
+
+
+__all__ = [
+    "Span",
+    "Tracer",
+    "InMemoryRecorder",
+    "span",
+    "set_tracer",
+    "get_tracer",
+    "profile",
+]
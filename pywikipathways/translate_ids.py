@@ -0,0 +1,149 @@
+"""Offline identifier translation through the datanodes cross-references."""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import pandas as pd
+
+from .get_datanodes import _CODE_MAP
+from .metrics import instrument
+from .tracing import span
+from .xref_index import _read_datanode_frames
+
+__all__ = ["build_id_mapping", "load_id_mapping", "translate_ids"]
+
+_COLUMNS = ["node", "system_code", "identifier"]
+_mapping: pd.DataFrame | None = None
+
+
+def _mapping_from_frames(frames) -> pd.DataFrame:
+    """Collapse datanodes tables into one row per (node, system, identifier).
+
+    A node is a datanode of some pathway; nodes with exactly the same set of
+    identifiers (the same gene drawn in many pathways) are merged.
+    """
+    parts = [
+        frame[["node", "system_code", "identifier"]].assign(pathway=wpid)
+        for wpid, frame in frames.items() if not frame.empty
+    ]
+    if not parts:
+        return pd.DataFrame(columns=_COLUMNS)
+    table = pd.concat(parts, ignore_index=True)
+    table["node"] = table.groupby(["pathway", "node"], sort=False).ngroup()
+    table = table.drop(columns="pathway").drop_duplicates()
+    table = table.sort_values(_COLUMNS, ignore_index=True)
+
+    signature = (table["system_code"] + ":" + table["identifier"]).groupby(table["node"]).agg("|".join)
+    unique_nodes = signature.drop_duplicates().index
+    table = table[table["node"].isin(unique_nodes)]
+    table["node"] = pd.factorize(table["node"])[0]
+    return table.reset_index(drop=True)
+
+
+@instrument
+def build_id_mapping(organism: str | None = None,
+                     mirror: str | None = None,
+                     path: str | None = None,
+                     max_workers: int = 8) -> pd.DataFrame:
+    """Build the cross-reference table used by ``translate_ids``.
+
+    Every datanode row of every pathway links the identifiers it carries in
+    the different systems (Ensembl, NCBI gene, HGNC, UniProt, Wikidata,
+    ChEBI, HMDB, ...). The rows are collected, deduplicated and kept as the
+    default mapping of ``translate_ids``.
+
+    Parameters
+    ----------
+    organism : str, optional
+        Species whose pathways are downloaded, e.g. ``"Homo sapiens"``.
+    mirror : str, optional
+        Read the ``*-datanodes.tsv`` files of a ``sync_mirror`` directory
+        instead of downloading.
+    path : str, optional
+        Also save the table as TSV (gzip-compressed for a ``.gz`` suffix).
+    max_workers : int, optional
+        Number of concurrent downloads or file reads.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``node``, ``system_code`` and ``identifier``; identifiers sharing a
+        ``node`` refer to the same entity.
+
+    Examples
+    --------
+    >>> build_id_mapping('Homo sapiens', path='human-idmap.tsv.gz')
+    >>> translate_ids(['1636', '59272'], 'L', 'S')
+    """
+    global _mapping
+    frames, _ = _read_datanode_frames(organism, mirror, max_workers)
+    with span("dedupe"):
+        mapping = _mapping_from_frames(frames)
+    if path is not None:
+        mapping.to_csv(path, sep="\t", index=False)
+    _mapping = mapping
+    return mapping
+
+
+def _read_id_mapping(path: str) -> pd.DataFrame:
+    return pd.read_csv(path, sep="\t", dtype={"system_code": str, "identifier": str})
+
+
+def load_id_mapping(path: str) -> pd.DataFrame:
+    """Load a table saved by ``build_id_mapping`` and make it the default."""
+    global _mapping
+    _mapping = _read_id_mapping(path)
+    return _mapping
+
+
+@instrument
+def translate_ids(ids: Iterable[str],
+                  from_code: str,
+                  to_code: str,
+                  mapping: pd.DataFrame | str | None = None) -> pd.DataFrame:
+    """Translate identifiers between BridgeDb systems without remote calls.
+
+    Parameters
+    ----------
+    ids : iterable of str
+        Identifiers of ``from_code``; datasource prefixes are ignored.
+    from_code, to_code : str
+        BridgeDb system codes, e.g. ``"L"`` (NCBI gene) and ``"S"``
+        (UniProt). See ``get_xref_list`` for the supported codes.
+    mapping : pandas.DataFrame or str, optional
+        Table from ``build_id_mapping`` or the path it was saved to; a path
+        is read for this call only. Defaults to the table built or loaded
+        last.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ``from_id`` and ``to_id`` in input order, one row per translation;
+        identifiers without a translation get a missing ``to_id``.
+
+    Raises
+    ------
+    ValueError
+        If a system code is unsupported or no mapping is available.
+    """
+    for code in (from_code, to_code):
+        if code not in _CODE_MAP:
+            raise ValueError("Unsupported system code; see BridgeDb datasources.")
+    if isinstance(mapping, str):
+        mapping = _read_id_mapping(mapping)
+    elif mapping is None:
+        mapping = _mapping
+    if mapping is None:
+        raise ValueError("No id mapping available; call build_id_mapping first.")
+
+    query = pd.Series(list(ids), dtype=object).astype(str).str.replace(r".*:", "", regex=True)
+    source = mapping[mapping["system_code"] == from_code][["node", "identifier"]]
+    target = mapping[mapping["system_code"] == to_code][["node", "identifier"]]
+    with span("join"):
+        pairs = source.merge(target, on="node", suffixes=("_from", "_to"))
+        pairs = pairs[["identifier_from", "identifier_to"]].drop_duplicates()
+        result = pd.DataFrame({"from_id": query}).merge(
+            pairs, how="left", left_on="from_id", right_on="identifier_from", sort=False
+        )
+    return result[["from_id", "identifier_to"]].rename(columns={"identifier_to": "to_id"})
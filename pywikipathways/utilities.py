@@ -0,0 +1,134 @@
+"""Shared HTTP access to the WikiPathways JSON endpoints and asset server."""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Any
+
+import requests
+
+from . import metrics, ratelimit
+from .tracing import span
+
+_WPID = re.compile(r"WP\d+")
+
+
+def _endpoint_label(url: str) -> str:
+    """Return a low-cardinality label such as ``getPathwayInfo.json``."""
+    name = url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+    return _WPID.sub("{pathway}", name)
+
+
+def wikipathways_get(url: str, **kwargs: Any) -> requests.Response:
+    """Perform a GET request and raise on network or HTTP errors.
+
+    Parameters
+    ----------
+    url : str
+        Absolute URL to fetch.
+    **kwargs
+        Passed on to ``requests.get`` (e.g. ``timeout``).
+
+    Returns
+    -------
+    requests.Response
+
+    Raises
+    ------
+    requests.RequestException
+        If the request fails or the server answers with an error status.
+
+    Notes
+    -----
+    Limits configured with ``set_rate_limit`` are applied before the
+    request is sent.
+    """
+    limit = ratelimit._limit_for(url) if ratelimit._limits else None
+    if limit is None:
+        return _get(url, kwargs)
+    with limit():
+        return _get(url, kwargs)
+
+
+def _get(url: str, kwargs: Any) -> requests.Response:
+    start = time.perf_counter()
+    try:
+        with span("fetch", endpoint=_endpoint_label(url)):
+            response = requests.get(url, **kwargs)
+    except requests.RequestException:
+        if metrics._sinks:
+            metrics.record_request(_endpoint_label(url), "error", time.perf_counter() - start, 0)
+        raise
+    if metrics._sinks:
+        # Do not consume a streamed body just to count it.
+        nbytes = (int(response.headers.get("Content-Length") or 0)
+                  if kwargs.get("stream") else len(response.content))
+        metrics.record_request(
+            _endpoint_label(url), response.status_code,
+            time.perf_counter() - start, nbytes,
+        )
+    response.raise_for_status()
+    return response
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+
+    def do(self, key: Any, func, *args: Any) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func(*args)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+_json_flight = _SingleFlight()
+
+
+def wikipathways_get_json(url: str, **kwargs: Any) -> Any:
+    """Fetch ``url`` with ``wikipathways_get`` and decode the JSON body.
+
+    Concurrent calls for the same URL share one download and decode, so the
+    returned object must be treated as read-only.
+    """
+    return _json_flight.do((url, repr(kwargs.get("params"))), _get_json, url, kwargs)
+
+
+def _get_json(url: str, kwargs: Any) -> Any:
+    response = wikipathways_get(url, **kwargs)
+    start = time.perf_counter()
+    with span("decode"):
+        data = response.json()
+    if metrics._sinks:
+        metrics.record_parse(_endpoint_label(url), time.perf_counter() - start)
+    return data
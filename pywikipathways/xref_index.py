@@ -0,0 +1,237 @@
+"""Organism-wide (system, identifier) -> pathways index over datanodes TSVs."""
+
+from __future__ import annotations
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .get_datanodes import _CODE_MAP, _fetch_datanodes, _parse_datanodes
+from .metrics import instrument
+from .tracing import span
+
+__all__ = ["XrefIndex", "build_xref_index", "load_xref_index"]
+
+_FORMAT_VERSION = 1
+_DATANODES_SUFFIX = "-datanodes.tsv"
+_PREFIX = re.compile(r".*:")
+
+
+class XrefIndex:
+    """Postings from (system code, identifier) to pathways.
+
+    For each system the identifiers are kept in one sorted string array;
+    identifier ``i`` owns ``postings[offsets[i]:offsets[i + 1]]``, a sorted
+    run of ``int32`` positions into ``pathways``. A lookup is one binary
+    search plus a slice.
+
+    Parameters
+    ----------
+    pathways : array-like of str
+        WPIDs referenced by the postings.
+    systems : dict
+        ``{code: (keys, offsets, postings)}`` as described above.
+    """
+
+    def __init__(self, pathways: Iterable[str],
+                 systems: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]):
+        self.pathways = np.asarray(list(pathways), dtype=str)
+        self._systems = systems
+        self.failed: Dict[str, str] = {}
+
+    @property
+    def systems(self) -> List[str]:
+        """System codes present in the index."""
+        return sorted(self._systems)
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys, _, _ in self._systems.values())
+
+    def __repr__(self) -> str:
+        return (f"XrefIndex({len(self.pathways)} pathways, {len(self)} identifiers, "
+                f"systems={self.systems})")
+
+    def _postings(self, identifier: str, system_code: str) -> np.ndarray:
+        entry = self._systems.get(system_code)
+        if entry is None:
+            if system_code not in _CODE_MAP:
+                raise ValueError("Unsupported system code; see BridgeDb datasources.")
+            return np.empty(0, dtype=np.int32)
+        keys, offsets, postings = entry
+        key = _PREFIX.sub("", str(identifier))
+        position = int(np.searchsorted(keys, key))
+        if position == len(keys) or keys[position] != key:
+            return np.empty(0, dtype=np.int32)
+        return postings[offsets[position]:offsets[position + 1]]
+
+    def lookup(self, identifier: str, system_code: str) -> List[str]:
+        """Return the WPIDs containing ``identifier`` of ``system_code``.
+
+        A datasource prefix such as ``"uniprot:"`` is ignored.
+        """
+        return self.pathways[self._postings(identifier, system_code)].tolist()
+
+    def find_pathways(self, identifiers: Iterable[str], system_code: str) -> pd.DataFrame:
+        """Return the pathways containing any of ``identifiers``.
+
+        Returns
+        -------
+        pandas.DataFrame
+            ``pathway`` and ``hits`` (number of query identifiers found in
+            it), most hits first.
+        """
+        runs = [self._postings(identifier, system_code) for identifier in set(identifiers)]
+        if not runs:
+            return pd.DataFrame({"pathway": [], "hits": []})
+        counts = np.bincount(np.concatenate(runs), minlength=len(self.pathways))
+        found = np.flatnonzero(counts)
+        order = np.lexsort((found, -counts[found]))
+        return pd.DataFrame({
+            "pathway": self.pathways[found[order]],
+            "hits": counts[found[order]],
+        })
+
+    def save(self, path: str) -> None:
+        """Write the index to an ``.npz`` file."""
+        arrays = {"format_version": np.array(_FORMAT_VERSION), "pathways": self.pathways}
+        for code, (keys, offsets, postings) in self._systems.items():
+            arrays[f"{code}.keys"] = keys
+            arrays[f"{code}.offsets"] = offsets
+            arrays[f"{code}.postings"] = postings
+        with open(path, "wb") as handle:
+            np.savez(handle, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "XrefIndex":
+        """Read an index written by ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported xref index format in '{path}'.")
+            codes = {name.split(".", 1)[0] for name in data.files if "." in name}
+            systems = {
+                code: (data[f"{code}.keys"], data[f"{code}.offsets"], data[f"{code}.postings"])
+                for code in codes
+            }
+            return cls(data["pathways"], systems)
+
+
+def _postings_for(identifiers: np.ndarray, pathway_ids: np.ndarray
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    keys, key_ids = np.unique(identifiers.astype(str), return_inverse=True)
+    order = np.lexsort((pathway_ids, key_ids))
+    key_ids, pathway_ids = key_ids[order], pathway_ids[order]
+    keep = np.ones(len(key_ids), dtype=bool)
+    keep[1:] = (key_ids[1:] != key_ids[:-1]) | (pathway_ids[1:] != pathway_ids[:-1])
+    key_ids, pathway_ids = key_ids[keep], pathway_ids[keep]
+    offsets = np.searchsorted(key_ids, np.arange(len(keys) + 1)).astype(np.int64)
+    return keys, offsets, pathway_ids.astype(np.int32)
+
+
+def _index_frames(frames: Dict[str, pd.DataFrame]) -> XrefIndex:
+    pathways = sorted(frames)
+    parts = [
+        frame[["system_code", "identifier"]].assign(pathway=position)
+        for position, frame in enumerate(frames[wpid] for wpid in pathways)
+        if not frame.empty
+    ]
+    systems = {}
+    if parts:
+        table = pd.concat(parts, ignore_index=True)
+        for code, group in table.groupby("system_code", sort=True):
+            systems[code] = _postings_for(
+                group["identifier"].to_numpy(), group["pathway"].to_numpy(dtype=np.int64)
+            )
+    return XrefIndex(pathways, systems)
+
+
+def _read_local(path: str) -> str:
+    with open(path, encoding="utf-8") as handle:
+        return handle.read()
+
+
+def _read_datanode_frames(organism: str | None, mirror: str | None, max_workers: int
+                          ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """Parse the datanodes TSV of every pathway; return frames and failures."""
+    if mirror is not None:
+        files = sorted(
+            name for name in os.listdir(mirror) if name.endswith(_DATANODES_SUFFIX)
+        )
+        sources = {
+            name[:-len(_DATANODES_SUFFIX)]: os.path.join(mirror, name) for name in files
+        }
+        read = _read_local
+    else:
+        from .list_pathways import list_pathways
+
+        listing = list_pathways(organism or "", columns=["id"], backend="pandas")
+        if listing is None:
+            raise RuntimeError("Failed to list the pathways of the organism.")
+        sources = {wpid: wpid for wpid in listing["id"]}
+        read = _fetch_datanodes
+
+    def load(source: str) -> pd.DataFrame:
+        return _parse_datanodes(read(source))[0]
+
+    frames: Dict[str, pd.DataFrame] = {}
+    failed: Dict[str, str] = {}
+    with span("read"), ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {wpid: pool.submit(load, source) for wpid, source in sources.items()}
+        for wpid, future in futures.items():
+            try:
+                frames[wpid] = future.result()
+            except (RuntimeError, OSError, ValueError) as exc:
+                failed[wpid] = str(exc)
+    return frames, failed
+
+
+@instrument
+def build_xref_index(organism: str | None = None,
+                     mirror: str | None = None,
+                     path: str | None = None,
+                     max_workers: int = 8) -> XrefIndex:
+    """Index the datanode identifiers of every pathway of an organism.
+
+    All twelve systems of the datanodes TSVs (see ``get_xref_list``) are
+    indexed, not only the seven supported by ``find_pathways_by_xref``.
+
+    Parameters
+    ----------
+    organism : str, optional
+        Species whose pathways are downloaded, e.g. ``"Homo sapiens"``.
+        Ignored together with ``mirror``.
+    mirror : str, optional
+        Read every ``*-datanodes.tsv`` of a directory kept by ``sync_mirror``
+        instead of downloading. Scope the mirror with its own ``organism``.
+    path : str, optional
+        Also save the index to this ``.npz`` file (see ``load_xref_index``).
+    max_workers : int, optional
+        Number of concurrent downloads or file reads.
+
+    Returns
+    -------
+    XrefIndex
+        The ``failed`` attribute maps WPIDs that could not be read to the
+        error message.
+
+    Examples
+    --------
+    >>> index = build_xref_index('Homo sapiens', path='human-xrefs.npz')
+    >>> index.lookup('P12821', 'S')
+    >>> index.find_pathways(uniprot_ids, 'S').head()
+    """
+    frames, failed = _read_datanode_frames(organism, mirror, max_workers)
+    with span("index"):
+        index = _index_frames(frames)
+    index.failed = failed
+    if path is not None:
+        index.save(path)
+    return index
+
+
+def load_xref_index(path: str) -> XrefIndex:
+    """Load an index saved by ``build_xref_index(path=...)``."""
+    return XrefIndex.load(path)
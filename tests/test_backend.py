@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from pywikipathways.backend import get_backend, set_backend
+from pywikipathways.read_pathway_gmt import read_pathway_gmt
+
+
+def _gmt(tmp_path):
+    gmt_file = tmp_path / "pathway.gmt"
+    gmt_file.write_text(
+        "Pathway One%20240101%WP1%Homo sapiens\tDesc\t111\t222\n"
+        "Pathway Two%20240101%WP2%Homo sapiens\tDesc\t333\n",
+        encoding="utf-8",
+    )
+    return str(gmt_file)
+
+
+def test_per_call_pyarrow_backend(tmp_path):
+    import pyarrow
+
+    table = read_pathway_gmt(_gmt(tmp_path), compact=True, backend="pyarrow")
+    assert isinstance(table, pyarrow.Table)
+    assert table.column("gene").to_pylist() == ["111", "222", "333"]
+    assert pyarrow.types.is_dictionary(table.schema.field("org").type)
+
+
+def test_global_polars_backend(tmp_path):
+    polars = pytest.importorskip("polars")
+
+    previous = set_backend("polars")
+    try:
+        frame = read_pathway_gmt(_gmt(tmp_path))
+        assert isinstance(frame, polars.DataFrame)
+        assert frame["wpid"].to_list() == ["WP1", "WP1", "WP2"]
+        assert read_pathway_gmt(_gmt(tmp_path), backend="pandas").shape == (3, 5)
+    finally:
+        set_backend(previous)
+    assert get_backend() == "pandas"
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        set_backend("spark")
+
+
+def test_pushdown_builds_arrow_without_pandas(tmp_path, monkeypatch):
+    import importlib
+    import json
+
+    import pyarrow
+
+    from pywikipathways.get_pathway_info import get_pathway_info
+    from pywikipathways.snapshot import export_snapshot, use_snapshot
+
+    snapshot = importlib.import_module("pywikipathways.snapshot")
+    utilities = importlib.import_module("pywikipathways.utilities")
+    info_module = importlib.import_module("pywikipathways.get_pathway_info")
+    records = [
+        {"id": "WP1", "species": "Mus musculus", "revision": "10", "meta": {"lab": "a"}},
+        {"id": "WP2", "species": "Homo sapiens", "revision": "20", "meta": {"lab": "b"}},
+        {"id": "WP3", "species": "Homo sapiens", "revision": "30", "meta": {"lab": "c"}},
+    ]
+    body = json.dumps({"pathwayInfo": records}).encode()
+
+    class _StreamResponse:
+        status_code = 200
+        headers = {}
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            yield body
+
+        def close(self):
+            pass
+
+    def no_pandas(*args, **kwargs):
+        raise AssertionError("pandas intermediate built")
+
+    monkeypatch.setattr(utilities.requests, "get", lambda url, **kwargs: _StreamResponse())
+    monkeypatch.setattr(snapshot, "_arrow_to_pandas", no_pandas)
+    streamed = get_pathway_info(species="Homo sapiens", columns=["id", "meta.lab", "missing"],
+                                backend="pyarrow")
+    assert isinstance(streamed, pyarrow.Table)
+    assert streamed.column_names == ["id", "meta.lab", "missing"]
+    assert streamed.column("meta.lab").to_pylist() == ["b", "c"]
+    assert streamed.column("missing").null_count == 2
+
+    monkeypatch.setattr(info_module, "_pathway_info_frame",
+                        lambda: pd.json_normalize(records))
+    export_snapshot(str(tmp_path), tables=["getPathwayInfo"])
+    use_snapshot(str(tmp_path))
+    try:
+        served = get_pathway_info(ids=["WP3", "WP2"], columns=["id", "species"], compact=True,
+                                  backend="pyarrow")
+    finally:
+        use_snapshot(None)
+    assert served.column("id").to_pylist() == ["WP2", "WP3"]
+    assert pyarrow.types.is_dictionary(served.schema.field("species").type)
@@ -0,0 +1,52 @@
+import importlib
+import json
+
+from pywikipathways.cli import main
+
+get_pathway_module = importlib.import_module("pywikipathways.get_pathway")
+
+
+def _records(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_gmt_convert_and_merge(tmp_path, capsys):
+    first = tmp_path / "a.gmt"
+    second = tmp_path / "b.gmt"
+    first.write_text("T1\tOne\tA\tB\nT2\tTwo\tC\n", encoding="utf-8")
+    second.write_text("T2\tOther\tZ\nT3\tThree\tD\n", encoding="utf-8")
+
+    assert main(["-f", "tsv", "gmt", "convert", str(first)]) == 0
+    assert capsys.readouterr().out == "term\tgene\nT1\tA\nT1\tB\nT2\tC\n"
+
+    merged = tmp_path / "merged.gmt"
+    assert main(["gmt", "merge", str(first), str(second), "-o", str(merged)]) == 0
+    assert _records(capsys.readouterr().out) == [{"path": str(merged), "terms": 3}]
+    assert merged.read_text(encoding="utf-8").splitlines()[1] == "T2\tTwo\tC"
+
+
+def test_fetch_streams_one_record_per_pathway(tmp_path, capsys, monkeypatch):
+    class _Response:
+        content = b'<?xml version="1.0" encoding="UTF-8"?>\n<Pathway/>'
+
+    def fake_get(url, **kwargs):
+        if "WP2" in url:
+            raise get_pathway_module.requests.ConnectionError("down")
+        return _Response()
+
+    monkeypatch.setattr(get_pathway_module, "wikipathways_get", fake_get)
+    ids = tmp_path / "ids.txt"
+    ids.write_text("WP1\nWP2\n\nWP1\n", encoding="utf-8")
+
+    status = main(["-j", "2", "fetch", "--ids-file", str(ids), "--dest", str(tmp_path / "out")])
+    records = sorted(_records(capsys.readouterr().out), key=lambda record: record["id"])
+
+    assert status == 1
+    assert [record["id"] for record in records] == ["WP1", "WP2"]
+    assert (tmp_path / "out" / "WP1.gpml").read_text(encoding="utf-8").endswith("<Pathway/>")
+    assert "network error" in records[1]["error"]
+
+
+def test_errors_are_reported_without_traceback(capsys):
+    assert main(["fetch"]) == 1
+    assert "No pathway identifiers given" in capsys.readouterr().err
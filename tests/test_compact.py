@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from pywikipathways.compact import compact_frame
+from pywikipathways.read_pathway_gmt import read_pathway_gmt
+
+
+def _frame():
+    return pd.DataFrame({
+        "id": [f"WP{i}" for i in range(8)],
+        "species": ["Homo sapiens"] * 6 + ["Mus musculus", None],
+        "revision": range(8),
+        "authors": [["a"], ["b"]] * 4,
+    })
+
+
+def test_compact_frame_makes_repetitive_strings_categorical():
+    frame = _frame()
+    compacted = compact_frame(frame)
+
+    assert isinstance(compacted["species"].dtype, pd.CategoricalDtype)
+    assert not isinstance(compacted["id"].dtype, pd.CategoricalDtype)
+    assert compacted["revision"].dtype == frame["revision"].dtype
+    assert compacted["authors"].tolist() == frame["authors"].tolist()
+    assert compacted["species"].astype(object).tolist()[:7] == frame["species"].tolist()[:7]
+    assert not isinstance(frame["species"].dtype, pd.CategoricalDtype)
+
+
+def test_compact_frame_arrow_strings():
+    pytest.importorskip("pyarrow")
+    compacted = compact_frame(_frame(), arrow_strings=True)
+    assert compacted["id"].dtype == "string[pyarrow]"
+
+
+def test_read_pathway_gmt_compact(tmp_path):
+    gmt_file = tmp_path / "pathway.gmt"
+    gmt_file.write_text(
+        "Pathway One%20240101%WP1%Homo sapiens\tDesc\t111\t222\t333\n",
+        encoding="utf-8",
+    )
+    frame = read_pathway_gmt(str(gmt_file), compact=True)
+    assert isinstance(frame["org"].dtype, pd.CategoricalDtype)
+    assert frame["gene"].tolist() == ["111", "222", "333"]
+    with pytest.raises(ValueError):
+        read_pathway_gmt(str(gmt_file), compact="yes")
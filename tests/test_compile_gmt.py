@@ -0,0 +1,85 @@
+import importlib
+import os
+import zipfile
+
+import pandas as pd
+
+from pywikipathways.compile_gmt import compile_gmt
+from pywikipathways.read_pathway_gmt import read_pathway_gmt
+
+compile_module = importlib.import_module("pywikipathways.compile_gmt")
+
+_GPML = '''<?xml version="1.0" encoding="UTF-8"?>
+<Pathway xmlns="http://pathvisio.org/GPML/2013a" Name="{name}" Organism="{organism}">
+  <DataNode TextLabel="ACE" GraphId="n1" Type="GeneProduct"><Xref Database="Entrez Gene" ID="1636"/></DataNode>
+  <DataNode TextLabel="AGT" GraphId="n2" Type="GeneProduct"><Xref Database="Ensembl" ID="ENSG00000135744"/></DataNode>
+  <DataNode TextLabel="Ang II" GraphId="n3" Type="Metabolite"><Xref Database="ChEBI" ID="CHEBI:2719"/></DataNode>
+  <DataNode TextLabel="ACE" GraphId="n4" Type="GeneProduct"><Xref Database="Entrez Gene" ID="1636"/></DataNode>
+</Pathway>'''
+
+
+class _InlineExecutor:
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, func, items, chunksize=1):
+        return map(func, items)
+
+
+def _archive(tmp_path):
+    archive = tmp_path / "wikipathways-20240110-gpml-Mixed.zip"
+    with zipfile.ZipFile(archive, "w") as handle:
+        handle.writestr("Hs_Renin_WP554_1.gpml", _GPML.format(name="Renin", organism="Homo sapiens"))
+        handle.writestr("Mm_Renin_WP1_2.gpml", _GPML.format(name="Renin", organism="Mus musculus"))
+    return str(archive)
+
+
+def test_compile_gmt_per_organism_and_system(tmp_path, monkeypatch):
+    monkeypatch.setattr(compile_module, "ProcessPoolExecutor", _InlineExecutor)
+    summary = compile_gmt(_archive(tmp_path), systems=["L", "Ce"], destpath=str(tmp_path / "gmt"))
+    paths = summary["paths"]
+    assert summary["failed"] == {}
+
+    assert [os.path.basename(path) for path in paths] == [
+        "wikipathways-20240110-gmt-Homo_sapiens-Ce.gmt",
+        "wikipathways-20240110-gmt-Homo_sapiens-L.gmt",
+        "wikipathways-20240110-gmt-Mus_musculus-Ce.gmt",
+        "wikipathways-20240110-gmt-Mus_musculus-L.gmt",
+    ]
+    frame = read_pathway_gmt(paths[1])
+    assert frame.iloc[0].to_dict() == {
+        "name": "Renin", "version": "WikiPathways_20240110", "wpid": "WP554",
+        "org": "Homo sapiens", "gene": "1636",
+    }
+    assert read_pathway_gmt(paths[0])["gene"].tolist() == ["2719"]
+
+
+def test_compile_gmt_translates_with_id_mapping(tmp_path, monkeypatch):
+    monkeypatch.setattr(compile_module, "ProcessPoolExecutor", _InlineExecutor)
+    mapping = pd.DataFrame({
+        "node": [0, 0, 1, 1],
+        "system_code": ["L", "En", "L", "En"],
+        "identifier": ["1636", "ENSG00000159640", "183", "ENSG00000135744"],
+    })
+    path = compile_gmt(_archive(tmp_path), systems=["En"], destpath=str(tmp_path),
+                       mapping=mapping, version="20250101")["paths"][0]
+
+    assert os.path.basename(path) == "wikipathways-20250101-gmt-Homo_sapiens-En.gmt"
+    assert read_pathway_gmt(path)["gene"].tolist() == ["ENSG00000159640", "ENSG00000135744"]
+
+
+def test_compile_gmt_skips_malformed_gpml(tmp_path):
+    archive = tmp_path / "wikipathways-20240110-gpml-Homo_sapiens.zip"
+    with zipfile.ZipFile(archive, "w") as handle:
+        handle.writestr("Hs_Renin_WP554_1.gpml", _GPML.format(name="Renin", organism="Homo sapiens"))
+        handle.writestr("Hs_Broken_WP2_1.gpml", _GPML[:120])
+    summary = compile_gmt(str(archive), destpath=str(tmp_path / "gmt"), max_workers=2)
+
+    assert list(summary["failed"]) == ["WP2"]
+    assert read_pathway_gmt(summary["paths"][0])["wpid"].unique().tolist() == ["WP554"]
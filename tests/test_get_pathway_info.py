@@ -10,4 +10,43 @@ def test_get_pathway_info():
     # get WP554 (again)
     info = get_pathway_info(pathway="WP554")
     assert info['id'][0] == 'WP554'
-    
\ No newline at end of file
+    
+
+def test_get_pathway_info_pushdown(monkeypatch):
+    import importlib
+    import json
+
+    utilities = importlib.import_module("pywikipathways.utilities")
+    body = json.dumps({"pathwayInfo": [
+        {"id": "WP1", "species": "Mus musculus", "revision": "10", "description": "x" * 100},
+        {"id": "WP2", "species": "Homo sapiens", "revision": "20", "description": "y"},
+        {"id": "WP3", "species": "Homo sapiens", "revision": "30", "description": "z"},
+    ]}).encode()
+
+    class _StreamResponse:
+        status_code = 200
+        headers = {}
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            yield body
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(utilities.requests, "get", lambda url, **kwargs: _StreamResponse())
+
+    info = get_pathway_info(species="Homo sapiens", columns=["id", "revision"])
+    assert list(info.columns) == ["id", "revision"]
+    assert info["id"].tolist() == ["WP2", "WP3"]
+
+    info = get_pathway_info(ids=["WP3", "WP1"], columns=["id", "missing"])
+    assert info["id"].tolist() == ["WP1", "WP3"]
+    assert info["missing"].isna().all()
+
+    assert get_pathway_info("WP2", ids=["WP2", "WP3"], columns=["id"])["id"].tolist() == ["WP2"]
+    assert get_pathway_info("WP1", ids=["WP2", "WP3"], columns=["id"]).empty
+
+    assert get_pathway_info("WP2", species="Mus musculus").empty
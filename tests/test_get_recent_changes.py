@@ -5,3 +5,30 @@ def test_get_by_date():
     info = get_recent_changes('20180201000000')
     # Should not crash, either returns None (network error) or valid results
     assert len(info) > 0
+
+
+def test_get_recent_changes_ranges(monkeypatch):
+    import importlib
+
+    import pandas as pd
+
+    module = importlib.import_module("pywikipathways.get_recent_changes")
+    frame = pd.DataFrame(
+        {
+            "id": ["WP1", "WP2", "WP3", "WP4"],
+            "revision": ["2024-03-05", "20240101", "not a date", "2024-01-31T10:00:00Z"],
+            "description": ["d1", "d2", "d3", "d4"],
+        }
+    )
+    monkeypatch.setattr(module, "_cached_index", None)
+    monkeypatch.setattr(module, "_recent_changes_frame", lambda: frame)
+
+    changes = get_recent_changes("20240101", refresh=True)
+    assert changes["id"].tolist() == ["WP1", "WP4"]
+    assert "description" not in changes.columns
+
+    assert get_recent_changes_ids(start="20240101", end="20240131") == ["WP2", "WP4"]
+    assert get_recent_changes_ids(end="20240131") == ["WP2", "WP4"]
+    assert get_recent_changes_ids("20240301") == ["WP1"]
+    with pytest.raises(ValueError):
+        get_recent_changes("20240101", start="20240101")
@@ -24,3 +24,41 @@ def test_get_xref_list_keyword_arguments():
         pytest.skip("WikiPathways endpoint unavailable.")
 
     assert "Q15633" in xrefs
+
+
+def test_get_xref_list_projects_one_cached_download(monkeypatch):
+    """Several systems of one pathway should share a single TSV download."""
+    import importlib
+
+    from pywikipathways.get_datanodes import get_datanodes
+
+    datanodes = importlib.import_module("pywikipathways.get_datanodes")
+    tsv = (
+        "Label\tType\tIdentifier\tComment\tEnsembl\tNCBI gene\tUniProt\n"
+        "ACE\tGeneProduct\t1636\t\tensembl:ENSG1\tncbigene:1636\tuniprot:P12821\n"
+        "ACE2\tGeneProduct\t59272\t\tensembl:ENSG2;ensembl:ENSG3\tncbigene:59272\t\n"
+        "AGT\tGeneProduct\t183\t\t\tncbigene:183\tuniprot:P01019;uniprot:P12821\n"
+    )
+    calls = []
+
+    class _Response:
+        content = tsv.encode("utf-8")
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return _Response()
+
+    monkeypatch.setattr(datanodes, "wikipathways_get", fake_get)
+    monkeypatch.setattr(datanodes, "_cache", type(datanodes._cache)())
+
+    assert get_xref_list("WP0", "En") == ["ENSG1", "ENSG2", "ENSG3"]
+    assert get_xref_list("WP0", "S", compact=True) == ["uniprot:P12821", "uniprot:P01019"]
+    with pytest.raises(RuntimeError):
+        get_xref_list("WP0", "Ce")
+    assert len(calls) == 1
+
+    nodes = get_datanodes("WP0")
+    assert list(nodes.columns) == [
+        "node", "label", "type", "system_code", "system", "xref", "identifier",
+    ]
+    assert nodes[nodes["label"] == "ACE2"]["identifier"].tolist() == ["ENSG2", "ENSG3", "59272"]
@@ -0,0 +1,75 @@
+import importlib
+import os
+
+import pytest
+
+from pywikipathways.gmt_index import GmtIndex, build_gmt_index, get_gene_set
+
+
+def _write(path, lines):
+    path.write_bytes("".join(line + "\n" for line in lines).encode("utf-8"))
+
+
+def test_get_gene_set_by_term_and_wpid(tmp_path):
+    gmt = tmp_path / "pathways.gmt"
+    _write(gmt, [
+        "Renin%WikiPathways_20240110%WP554%Homo sapiens\turl\t1636\t183",
+        "Apoptosis%WikiPathways_20240110%WP254%Homo sapiens\turl\t842",
+        "",
+        "Custom set\tdesc\tA\tB\tC",
+    ])
+
+    assert get_gene_set(str(gmt), "WP254") == ["842"]
+    assert get_gene_set(str(gmt), "Renin%WikiPathways_20240110%WP554%Homo sapiens") == ["1636", "183"]
+    assert get_gene_set(str(gmt), "Custom set") == ["A", "B", "C"]
+    assert os.path.exists(str(gmt) + ".idx.npz")
+    with pytest.raises(KeyError):
+        get_gene_set(str(gmt), "WP1")
+
+    loaded = GmtIndex.load(str(gmt), str(gmt) + ".idx.npz")
+    assert len(loaded) == 3 and not loaded.stale
+    assert loaded.record("WP554")[:2] == ["Renin%WikiPathways_20240110%WP554%Homo sapiens", "url"]
+    loaded.close()
+
+
+def test_index_is_rebuilt_when_the_file_changes(tmp_path):
+    gmt = tmp_path / "sets.gmt"
+    _write(gmt, ["T1\td\tA"])
+    assert get_gene_set(str(gmt), "T1") == ["A"]
+
+    _write(gmt, ["T0\td\tZ", "T1\td\tA\tB"])
+    assert get_gene_set(str(gmt), "T1") == ["A", "B"]
+
+    index = build_gmt_index(str(gmt), path=str(tmp_path / "other.npz"))
+    assert "T0" in index and index.gene_set("T0") == ["Z"]
+    index.close()
+
+
+def test_corrupt_sidecar_is_rebuilt(tmp_path):
+    gmt = tmp_path / "corrupt.gmt"
+    _write(gmt, ["Apoptosis%WikiPathways_20240110%WP254%Homo sapiens\turl\t842"])
+    sidecar = str(gmt) + ".idx.npz"
+    build_gmt_index(str(gmt))
+    with open(sidecar, "rb") as handle:
+        content = handle.read()
+    with open(sidecar, "wb") as handle:
+        handle.write(content[:len(content) // 2])
+
+    assert get_gene_set(str(gmt), "WP254") == ["842"]
+    assert GmtIndex.load(str(gmt), sidecar).gene_set("WP254") == ["842"]
+    assert not os.path.exists(sidecar + ".tmp")
+
+
+def test_stale_index_stays_readable(tmp_path):
+    gmt = tmp_path / "stale.gmt"
+    _write(gmt, ["Apoptosis%WikiPathways_20240110%WP254%Homo sapiens\turl\t842"])
+    gmt_index = importlib.import_module("pywikipathways.gmt_index")
+    old = gmt_index._index_for(str(gmt))
+    assert old.gene_set("WP254") == ["842"]
+
+    _write(gmt, ["Apoptosis%WikiPathways_20240110%WP254%Homo sapiens\turl\t842\t843"])
+    os.utime(gmt, ns=(1, 1))
+    assert get_gene_set(str(gmt), "WP254") == ["842", "843"]
+    # A reader still holding the old index is not cut off.
+    assert old._map is not None
+    assert old.record("WP254")[0].startswith("Apoptosis")
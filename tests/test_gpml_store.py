@@ -0,0 +1,105 @@
+import importlib
+
+import pandas as pd
+import pytest
+
+from pywikipathways.get_pathway import get_pathway, get_pathways
+from pywikipathways.gpml_store import GpmlStore, use_gpml_store
+
+get_pathway_module = importlib.import_module("pywikipathways.get_pathway")
+recent_changes = importlib.import_module("pywikipathways.get_recent_changes")
+
+_GPML = '<?xml version="1.0" encoding="UTF-8"?>\n<Pathway Name="{name}"/>'
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Fake pathway info and GPML endpoints; returns the mutable state."""
+    state = {"revisions": {"WP1": "2024-01-01", "WP2": "2024-01-01"}, "fetched": []}
+
+    class _Response:
+        def __init__(self, content):
+            self.content = content
+
+    def fake_get(url, **kwargs):
+        wpid = url.rsplit("/", 1)[1][:-len(".gpml")]
+        state["fetched"].append(wpid)
+        return _Response(_GPML.format(name=wpid).encode("utf-8"))
+
+    def fake_info():
+        return pd.DataFrame({"id": list(state["revisions"]),
+                             "revision": list(state["revisions"].values())})
+
+    monkeypatch.setattr(get_pathway_module, "wikipathways_get", fake_get)
+    monkeypatch.setattr(recent_changes, "_recent_changes_frame", fake_info)
+    monkeypatch.setattr(recent_changes, "_cached_index", None)
+    yield state
+    use_gpml_store(None)
+
+
+def test_get_pathway_serves_known_revisions_from_store(tmp_path, service):
+    use_gpml_store(str(tmp_path))
+    first = get_pathway("WP1")
+    assert get_pathway("WP1") == first
+    assert service["fetched"] == ["WP1"]
+
+    # A new revision is fetched once; identical content shares one object.
+    service["revisions"]["WP1"] = "2024-02-01"
+    recent_changes._revision_index(refresh=True)
+    assert get_pathway("WP1") == first
+    assert service["fetched"] == ["WP1", "WP1"]
+
+    store = GpmlStore(str(tmp_path))
+    revisions = store.revisions("WP1")
+    assert sorted(revisions) == ["2024-01-01", "2024-02-01"]
+    assert len(set(revisions.values())) == 1
+    assert store.get("WP1", "2024-01-01") == first
+    assert store.get("WP1", "2023-12-01") is None
+
+
+def test_get_pathways_downloads_only_missing(tmp_path, service):
+    use_gpml_store(str(tmp_path))
+    get_pathway("WP1")
+    gpml = get_pathways(["WP2", "WP1", "WP2"], max_workers=2)
+
+    assert list(gpml) == ["WP2", "WP1"]
+    assert 'Name="WP2"' in gpml["WP2"]
+    assert sorted(service["fetched"]) == ["WP1", "WP2"]
+
+
+def test_get_pathway_without_store_always_downloads(service):
+    get_pathway("WP1")
+    get_pathway("WP1")
+    assert service["fetched"] == ["WP1", "WP1"]
+
+
+def test_get_pathway_refetches_revisions_dated_today(tmp_path, service, monkeypatch):
+    gpml_store = importlib.import_module("pywikipathways.gpml_store")
+    monkeypatch.setattr(gpml_store, "_today", lambda: "2024-01-01")
+    use_gpml_store(str(tmp_path))
+    get_pathway("WP1")
+    get_pathway("WP1")
+    assert service["fetched"] == ["WP1", "WP1"]
+
+    # Fetched on a later day, the copy is final.
+    monkeypatch.setattr(gpml_store, "_today", lambda: "2024-01-02")
+    get_pathway("WP1")
+    get_pathway("WP1")
+    assert service["fetched"] == ["WP1", "WP1", "WP1"]
+
+
+def test_get_pathway_downloads_when_pathway_info_is_unavailable(tmp_path, service, monkeypatch):
+    def outage():
+        raise RuntimeError("Failed to retrieve JSON data (network error).")
+
+    monkeypatch.setattr(recent_changes, "_recent_changes_frame", outage)
+    use_gpml_store(str(tmp_path))
+    assert 'Name="WP1"' in get_pathway("WP1")
+    assert GpmlStore(str(tmp_path)).revisions("WP1") == {}
+
+
+def test_put_merges_refs_written_by_another_store(tmp_path):
+    first, second = GpmlStore(str(tmp_path)), GpmlStore(str(tmp_path))
+    first.put("WP1", "2024-01-01", _GPML.format(name="a"))
+    second.put("WP1", "2024-02-01", _GPML.format(name="b"))
+    assert sorted(first.revisions("WP1")) == ["2024-01-01", "2024-02-01"]
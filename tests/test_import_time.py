@@ -0,0 +1,42 @@
+"""Import-time guard for the lazily loaded package namespace."""
+
+import subprocess
+import sys
+
+import pywikipathways
+
+HEAVY_MODULES = ("requests", "pandas", "lxml", "webbrowser")
+IMPORT_BUDGET_US = 200_000
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+
+
+def test_import_does_not_load_heavy_dependencies():
+    result = _run(
+        "import sys, pywikipathways; "
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_import_time_budget():
+    result = _run("import pywikipathways")
+    cumulative = [
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.rstrip().endswith("| pywikipathways")
+    ]
+    assert cumulative and cumulative[0] < IMPORT_BUDGET_US
+
+
+def test_lazy_attributes_resolve_to_functions():
+    from pywikipathways.list_pathways import list_pathway_ids
+
+    assert callable(pywikipathways.list_pathways)
+    assert pywikipathways.list_pathway_ids is list_pathway_ids
+    assert set(pywikipathways.__all__) <= set(dir(pywikipathways))
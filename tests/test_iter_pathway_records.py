@@ -0,0 +1,105 @@
+import importlib
+import json
+
+import pytest
+
+from pywikipathways.iter_pathway_records import iter_pathway_records
+
+utilities = importlib.import_module("pywikipathways.utilities")
+
+_PAYLOAD = {
+    "lastUpdated": 20240101,
+    "pathwayInfo": [
+        {"id": "WP1", "name": "Statin pathway", "species": "Mus musculus", "revision": 117947},
+        {"id": "WP2", "name": "Signalisation é", "species": "Homo sapiens", "revision": 1},
+    ],
+    "trailer": {"nested": [1, 2, 3]},
+}
+
+
+class _StreamResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, body, size):
+        self._body = body
+        self._size = size
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self._body), self._size):
+            yield self._body[start:start + self._size]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 4096])
+def test_records_are_decoded_across_chunk_boundaries(monkeypatch, size):
+    body = json.dumps(_PAYLOAD, indent=1, ensure_ascii=False).encode("utf-8")
+    seen = {}
+
+    def fake_get(url, **kwargs):
+        seen.update(url=url, **kwargs)
+        return _StreamResponse(body, size)
+
+    monkeypatch.setattr(utilities.requests, "get", fake_get)
+    records = list(iter_pathway_records("findPathwaysByText.json"))
+
+    assert records == _PAYLOAD["pathwayInfo"]
+    assert seen["url"] == "https://www.wikipathways.org/json/findPathwaysByText.json"
+    assert seen["stream"] is True
+
+
+def test_list_pathways_records_are_flattened(monkeypatch):
+    body = json.dumps({"organisms": [
+        {"name": "Mus musculus", "pathways": [{"id": "WP1"}, {"id": "WP10"}]},
+        {"name": "Homo sapiens", "pathways": []},
+        {"name": "Bos taurus", "pathways": [{"id": "WP3"}]},
+    ]}).encode()
+    monkeypatch.setattr(utilities.requests, "get", lambda url, **kwargs: _StreamResponse(body, 5))
+
+    assert [record["id"] for record in iter_pathway_records("listPathways")] == ["WP1", "WP10", "WP3"]
+
+
+def test_truncated_payload_raises(monkeypatch):
+    body = b'{"pathwayInfo": [{"id": "WP1"}, {"id": '
+    monkeypatch.setattr(utilities.requests, "get", lambda url, **kwargs: _StreamResponse(body, 4))
+
+    records = iter_pathway_records()
+    assert next(records) == {"id": "WP1"}
+    with pytest.raises(ValueError):
+        next(records)
+
+
+def test_ontology_terms_by_pathway(monkeypatch):
+    body = json.dumps({"pathways": [
+        {"id": "WP1", "terms": [{"id": "PW:0000001"}]},
+        {"id": "WP2", "terms": []},
+    ]}).encode()
+    monkeypatch.setattr(utilities.requests, "get", lambda url, **kwargs: _StreamResponse(body, 7))
+
+    records = list(iter_pathway_records("getOntologyTermsByPathway"))
+    assert [record["id"] for record in records] == ["WP1", "WP2"]
+
+
+def test_pathways_by_ontology_term(monkeypatch):
+    body = json.dumps({"terms": [
+        {"id": "PW:0000001", "pathways": [{"id": "WP1"}]},
+        {"id": "PW:0000002", "pathways": []},
+    ]}).encode()
+    monkeypatch.setattr(utilities.requests, "get", lambda url, **kwargs: _StreamResponse(body, 7))
+
+    records = list(iter_pathway_records("getPathwaysByOntologyTerm"))
+    assert [record["id"] for record in records] == ["PW:0000001", "PW:0000002"]
+
+
+def test_missing_record_array_raises(monkeypatch):
+    body = json.dumps({"terms": []}).encode()
+    monkeypatch.setattr(utilities.requests, "get", lambda url, **kwargs: _StreamResponse(body, 7))
+
+    with pytest.raises(RuntimeError):
+        list(iter_pathway_records("getOntologyTermsByPathway"))
@@ -0,0 +1,62 @@
+import importlib
+
+from pywikipathways.list_pathways import list_pathways
+from pywikipathways.metrics import (
+    add_metrics_callback,
+    disable_metrics,
+    enable_metrics,
+    remove_metrics_callback,
+)
+
+utilities = importlib.import_module("pywikipathways.utilities")
+
+
+class _Response:
+    status_code = 200
+    content = b'{"organisms": []}'
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"organisms": [{"pathways": [
+            {"id": "WP1", "species": "Mus musculus"},
+            {"id": "WP2", "species": "Homo sapiens"},
+        ]}]}
+
+
+def test_metrics_registry_records_requests_and_rows(monkeypatch):
+    monkeypatch.setattr(utilities.requests, "get", lambda url, **kwargs: _Response())
+    events = []
+    callback = lambda name, labels, value: events.append(name)
+    add_metrics_callback(callback)
+    registry = enable_metrics()
+    try:
+        result = list_pathways("Mus musculus")
+    finally:
+        disable_metrics()
+        remove_metrics_callback(callback)
+
+    assert len(result) == 1
+    metrics = registry.as_dict()
+    request = metrics["pywikipathways_requests_total"][0]
+    assert request["function"] == "list_pathways"
+    assert request["endpoint"] == "listPathways.json"
+    assert request["status"] == "200"
+    assert metrics["pywikipathways_rows_in_total"][0]["value"] == 2
+    assert metrics["pywikipathways_rows_out_total"][0]["value"] == 1
+    assert metrics["pywikipathways_cache_total"][0]["result"] == "miss"
+    assert "pywikipathways_parse_seconds_total" in metrics
+    assert "pywikipathways_calls_total" in events
+
+    text = registry.to_prometheus()
+    assert "# TYPE pywikipathways_requests_total counter" in text
+    assert 'status="200"' in text
+
+
+def test_metrics_disabled_records_nothing(monkeypatch):
+    monkeypatch.setattr(utilities.requests, "get", lambda url, **kwargs: _Response())
+    registry = enable_metrics()
+    disable_metrics()
+    list_pathways()
+    assert registry.as_dict() == {}
@@ -0,0 +1,92 @@
+import importlib
+
+import pandas as pd
+import requests
+
+mirror = importlib.import_module("pywikipathways.mirror")
+
+
+class _Response:
+    def __init__(self, url):
+        self.content = url.encode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+
+def _patch(monkeypatch, frame, calls):
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        if "WP3" in url:
+            raise requests.ConnectionError("boom")
+        return _Response(url)
+
+    def fake_info(columns=None, species=None, backend=None):
+        selected = frame if species is None else frame[frame["species"] == species]
+        return selected[columns]
+
+    monkeypatch.setattr(mirror, "get_pathway_info", fake_info)
+    monkeypatch.setattr(mirror.requests, "get", fake_get)
+
+
+def test_sync_mirror_fetches_only_changed_pathways(tmp_path, monkeypatch):
+    calls = []
+    frame = pd.DataFrame(
+        {"id": ["WP1", "WP2"], "species": ["Homo sapiens"] * 2,
+         "revision": ["2024-01-01", "2024-01-02"]}
+    )
+    _patch(monkeypatch, frame, calls)
+    summary = mirror.sync_mirror(str(tmp_path), formats=["gpml"])
+    assert summary["updated"] == ["WP1", "WP2"]
+    assert (tmp_path / "WP1.gpml").exists()
+
+    calls.clear()
+    frame = pd.DataFrame(
+        {"id": ["WP1", "WP3"], "species": ["Homo sapiens"] * 2,
+         "revision": ["2024-03-01", "2024-03-01"]}
+    )
+    _patch(monkeypatch, frame, calls)
+    summary = mirror.sync_mirror(str(tmp_path), formats=["gpml"])
+    assert summary["updated"] == ["WP1"]
+    assert summary["removed"] == ["WP2"]
+    assert list(summary["failed"]) == ["WP3"]
+    assert not (tmp_path / "WP2.gpml").exists()
+    assert mirror.mirror_state(str(tmp_path))["revisions"] == {"WP1": "2024-03-01"}
+
+    calls.clear()
+    summary = mirror.sync_mirror(str(tmp_path), formats=["gpml"])
+    assert summary["unchanged"] == 1
+    assert all("WP1" not in url for url in calls)
+
+
+def test_sync_mirror_keeps_pathways_with_unparseable_revisions(tmp_path, monkeypatch):
+    calls = []
+    frame = pd.DataFrame(
+        {"id": ["WP1", "WP2"], "species": ["Homo sapiens"] * 2,
+         "revision": ["2024-01-01", "not a date"]}
+    )
+    _patch(monkeypatch, frame, calls)
+    mirror.sync_mirror(str(tmp_path), formats=["gpml"])
+
+    summary = mirror.sync_mirror(str(tmp_path), formats=["gpml"])
+    assert summary["removed"] == []
+    assert summary["unchanged"] == 2
+    assert (tmp_path / "WP2.gpml").exists()
+
+
+def test_sync_mirror_keeps_other_organisms_on_switch(tmp_path, monkeypatch):
+    calls = []
+    frame = pd.DataFrame(
+        {"id": ["WP1", "WP2"], "species": ["Homo sapiens", "Mus musculus"],
+         "revision": ["2024-01-01", "2024-01-01"]}
+    )
+    _patch(monkeypatch, frame, calls)
+    mirror.sync_mirror(str(tmp_path), formats=["gpml"])
+
+    summary = mirror.sync_mirror(str(tmp_path), organism="Homo sapiens", formats=["gpml"])
+    assert summary["removed"] == []
+    assert summary["unchanged"] == 1
+    assert (tmp_path / "WP2.gpml").exists()
+    state = mirror.mirror_state(str(tmp_path))
+    assert state["organism"] == "Homo sapiens"
+    assert sorted(state["revisions"]) == ["WP1", "WP2"]
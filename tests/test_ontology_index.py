@@ -0,0 +1,103 @@
+import pandas as pd
+import pytest
+
+from pywikipathways.ontology_index import build_ontology_index
+
+TERMS = pd.DataFrame(
+    {
+        "id": ["WP1", "WP1", "WP2", "WP3", "WP4"],
+        "name": ["Lung cancer", "Lung cancer", "Carcinoma", "Disease", "Signaling"],
+        "terms_id": ["DOID:1324", "PW:0000003", "DOID:305", "DOID:4", "PW:0000003"],
+        "terms_name": ["lung cancer", "signaling pathway", "carcinoma", "disease",
+                       "signaling pathway"],
+        "terms_parent": ["carcinoma", "regulatory pathway", "disease", None,
+                         "regulatory pathway"],
+    }
+)
+
+
+def test_ontology_index_maps():
+    index = build_ontology_index(TERMS)
+    assert index.term_pathways["PW:0000003"] == ("WP1", "WP4")
+    assert index.pathway_terms["WP1"] == ("DOID:1324", "PW:0000003")
+    assert set(index.terms["ontology"]) == {"Disease Ontology", "Pathway Ontology"}
+
+
+def test_ontology_index_closure():
+    index = build_ontology_index(TERMS)
+    assert index.ancestors_of("DOID:1324") == ["DOID:305", "DOID:4"]
+    assert index.descendants_of("disease") == ["DOID:1324", "DOID:305"]
+    assert index.pathways("DOID:4") == ["WP1", "WP2", "WP3"]
+    assert index.pathways("DOID:4", include_descendants=False) == ["WP3"]
+    assert index.pathways("regulatory pathway") == ["WP1", "WP4"]
+    assert index.terms_for("WP2", include_ancestors=True) == ["DOID:305", "DOID:4"]
+
+
+def test_ontology_index_unknown_term():
+    index = build_ontology_index(TERMS)
+    with pytest.raises(ValueError):
+        index.pathways("not a term")
+
+
+def test_ontology_index_closure_with_cycle():
+    frame = pd.DataFrame(
+        {
+            "id": ["WP1", "WP2", "WP3"],
+            "terms_id": ["T:A", "T:B", "T:C"],
+            "terms_name": ["a", "b", "c"],
+            "terms_parent": ["b", "a", "a"],
+        }
+    )
+    index = build_ontology_index(frame)
+    assert index.ancestors_of("T:C") == ["T:A", "T:B"]
+    assert index.ancestors_of("T:B") == ["T:A"]
+    assert index.ancestors_of("T:A") == ["T:B"]
+
+
+@pytest.fixture
+def endpoints(monkeypatch):
+    """Fake both ontology tables; returns the list of tables fetched."""
+    import importlib
+
+    module = importlib.import_module("pywikipathways.ontology_index")
+    calls = []
+    by_term = pd.DataFrame({"id": ["PW:0000003", "DOID:4"], "pathways_id": ["WP1", "WP3"]})
+    monkeypatch.setattr(module, "_ontology_terms_frame",
+                        lambda: calls.append("byPathway") or TERMS)
+    monkeypatch.setattr(module, "_pathways_by_ontology_term_frame",
+                        lambda: calls.append("byTerm") or by_term)
+    monkeypatch.setattr(module, "_cached", None)
+    monkeypatch.setattr(module, "_cached_terms", None)
+    return calls
+
+
+def test_ontology_functions_use_cached_tables(endpoints):
+    from pywikipathways.get_ontology_terms import (
+        get_ontology_term_ids,
+        get_ontology_term_names,
+        get_pathway_ids_by_ontology_term,
+        get_pathways_by_parent_ontology_term,
+    )
+
+    assert get_pathway_ids_by_ontology_term("DOID:4") == ["WP3"]
+    assert get_pathway_ids_by_ontology_term("PW:0000003") == ["WP1"]
+    assert endpoints == ["byTerm"]
+
+    rows = get_pathways_by_parent_ontology_term("regulatory pathway")
+    assert rows["id"].tolist() == ["WP1", "WP4"]
+    assert get_pathways_by_parent_ontology_term("nothing").empty
+    assert get_ontology_term_ids("WP1") == ["DOID:1324", "PW:0000003"]
+    assert get_ontology_term_names("WP1") == ["lung cancer", "signaling pathway"]
+    assert endpoints == ["byTerm", "byPathway"]
+
+
+def test_live_ontology_tables_expire(endpoints, monkeypatch):
+    import importlib
+
+    from pywikipathways.get_ontology_terms import get_pathway_ids_by_ontology_term
+
+    module = importlib.import_module("pywikipathways.ontology_index")
+    monkeypatch.setattr(module, "_INDEX_MAX_AGE", -1.0)
+    get_pathway_ids_by_ontology_term("DOID:4")
+    get_pathway_ids_by_ontology_term("DOID:4")
+    assert endpoints == ["byTerm", "byTerm"]
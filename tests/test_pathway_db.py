@@ -0,0 +1,90 @@
+import importlib
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from pywikipathways.find_pathways_by_orcid import find_pathways_by_orcid
+from pywikipathways.find_pathways_by_text import find_pathways_by_text
+from pywikipathways.find_pathways_by_xref import find_pathways_by_xref
+from pywikipathways.list_pathways import list_pathway_ids
+from pywikipathways.pathway_db import database_info, export_database, use_database
+
+text_module = importlib.import_module("pywikipathways.find_pathways_by_text")
+xref_module = importlib.import_module("pywikipathways.find_pathways_by_xref")
+orcid_module = importlib.import_module("pywikipathways.find_pathways_by_orcid")
+list_pathways_module = importlib.import_module("pywikipathways.list_pathways")
+
+TEXT = pd.DataFrame({
+    "id": ["WP1", "WP2", "WP3"],
+    "name": ["Insulin signaling", "Apoptosis", "ACE inhibitor pathway"],
+    "description": ["", "Programmed cell death", None],
+    "datanodes": [["INSR", "IRS1"], ["CASP3"], ["ACE", "AGT"]],
+    "citedIn": ["PMC1", "", "PMC3"],
+    "species": ["Homo sapiens", "Homo sapiens", "Mus musculus"],
+})
+XREFS = pd.DataFrame({
+    "id": ["WP1", "WP3"],
+    "ncbigene": ["3643, 8660", "1636, 183"],
+    "ensembl": ["ENSG00000171105", "ENSG00000159640"],
+})
+ORCIDS = pd.DataFrame({"id": ["WP1", "WP2"], "orcids": ["0000-0001-9773-4008", None]})
+
+
+def _fail():
+    raise AssertionError("the endpoint should not be fetched")
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_module, "_find_pathways_by_text_frame", lambda: TEXT)
+    monkeypatch.setattr(xref_module, "_find_pathways_by_xref_frame", lambda: XREFS)
+    monkeypatch.setattr(orcid_module, "_find_pathways_by_orcid_frame", lambda: ORCIDS)
+    monkeypatch.setattr(list_pathways_module, "_list_pathways_frame", lambda: TEXT[["id", "name"]])
+    path = export_database(str(tmp_path / "wp.sqlite"), tables=[
+        "findPathwaysByText", "findPathwaysByXref", "findPathwaysByOrcid", "listPathways",
+    ])
+    for module, builder in ((text_module, "_find_pathways_by_text_frame"),
+                            (xref_module, "_find_pathways_by_xref_frame"),
+                            (orcid_module, "_find_pathways_by_orcid_frame"),
+                            (list_pathways_module, "_list_pathways_frame")):
+        monkeypatch.setattr(module, builder, _fail)
+    use_database(path)
+    yield path
+    use_database(None)
+
+
+def test_find_functions_query_the_database(database):
+    assert database_info()["tables"]["findPathwaysByText"]["fts_columns"] == [
+        "id", "name", "description", "datanodes", "citedIn",
+    ]
+    assert find_pathways_by_text("insulin", backend="pandas")["id"].tolist() == ["WP1"]
+    assert find_pathways_by_text(["CASP", "ace"], backend="pandas")["id"].tolist() == ["WP2", "WP3"]
+    # Terms shorter than a trigram fall back to a scan.
+    assert find_pathways_by_text("c3", field="citedIn", backend="pandas")["id"].tolist() == ["WP3"]
+    assert find_pathways_by_text("sapiens", backend="pandas") is None
+    assert find_pathways_by_text("ACE", backend="pandas")["datanodes"][0] == ["ACE", "AGT"]
+    with pytest.raises(ValueError):
+        find_pathways_by_text("x", field="missing")
+
+    assert find_pathways_by_xref("1636", "L", backend="pandas")["id"].tolist() == ["WP3"]
+    assert find_pathways_by_xref("1636", "En", backend="pandas") is None
+    assert find_pathways_by_orcid("0000-0001-9773-4008", backend="pandas")["id"].tolist() == ["WP1"]
+    assert list_pathway_ids().tolist() == ["WP1", "WP2", "WP3"]
+
+
+def test_database_file_is_complete_and_read_only(database):
+    with sqlite3.connect(database) as connection:
+        names = {row[0] for row in connection.execute("SELECT name FROM sqlite_master")}
+    assert {"findPathwaysByText", "findPathwaysByText_fts", "_manifest"} <= names
+    with pytest.raises(ValueError):
+        use_database(database + ".missing")
+
+
+def test_database_path_with_uri_characters(database, tmp_path):
+    import shutil
+
+    directory = tmp_path / "a?b#c%20d"
+    directory.mkdir()
+    path = shutil.copy(database, directory / "wp.sqlite")
+    assert database_info(str(path))["tables"]["listPathways"]["rows"] == 3
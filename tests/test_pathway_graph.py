@@ -0,0 +1,56 @@
+import numpy as np
+
+from pywikipathways.pathway_graph import pathway_graph
+
+G13 = b'''<?xml version="1.0" encoding="UTF-8"?>
+<Pathway xmlns="http://pathvisio.org/GPML/2013a" Name="Test">
+  <DataNode TextLabel="A" GraphId="a" Type="GeneProduct"><Xref Database="Entrez Gene" ID="1"/></DataNode>
+  <DataNode TextLabel="B" GraphId="b" Type="GeneProduct" GroupRef="g1"><Xref Database="Entrez Gene" ID="2"/></DataNode>
+  <DataNode TextLabel="C" GraphId="c" Type="GeneProduct" GroupRef="g1"><Xref Database="" ID=""/></DataNode>
+  <DataNode TextLabel="D" GraphId="d" Type="Metabolite"><Xref Database="ChEBI" ID="CHEBI:1"/></DataNode>
+  <DataNode TextLabel="E" GraphId="e" Type="Protein"><Xref Database="Uniprot-TrEMBL" ID="P1"/></DataNode>
+  <Group GroupId="g1" GraphId="grp" Style="Complex"/>
+  <Interaction GraphId="i1"><Graphics><Point X="0" Y="0" GraphRef="a"/><Point X="1" Y="1" GraphRef="grp" ArrowHead="mim-stimulation"/></Graphics></Interaction>
+  <Interaction GraphId="i2"><Graphics><Point X="0" Y="0" GraphRef="b"/><Point X="1" Y="1" GraphRef="d" ArrowHead="mim-conversion"/><Anchor Position="0.5" GraphId="anc"/></Graphics></Interaction>
+  <Interaction GraphId="i3"><Graphics><Point X="0" Y="0" GraphRef="anc" ArrowHead="mim-catalysis"/><Point X="1" Y="1" GraphRef="e"/></Graphics></Interaction>
+</Pathway>'''
+
+G2021 = b'''<?xml version="1.0" encoding="UTF-8"?>
+<Pathway xmlns="http://pathvisio.org/GPML/2021" title="Test">
+  <DataNodes>
+    <DataNode elementId="a" textLabel="A" type="GeneProduct"><Xref identifier="1" dataSource="ncbigene"/></DataNode>
+    <DataNode elementId="b" textLabel="B" type="GeneProduct"><Xref identifier="2" dataSource="ncbigene"/></DataNode>
+  </DataNodes>
+  <Interactions>
+    <Interaction elementId="i1"><Waypoints><Point elementRef="a" x="0" y="0"/><Point elementRef="b" x="1" y="1" arrowHead="Inhibition"/></Waypoints></Interaction>
+  </Interactions>
+</Pathway>'''
+
+
+def test_pathway_graph_resolves_groups_and_anchors():
+    graph = pathway_graph(G13)
+
+    assert graph.nodes["label"].tolist() == ["A", "B", "C", "D", "E"]
+    assert graph.nodes.loc[3, "identifier"] == "CHEBI:1"
+    assert graph.groups["g1"].tolist() == [1, 2]
+    edges = graph.edges()
+    assert list(zip(edges["source"], edges["target"], edges["type"])) == [
+        (0, 1, "mim-stimulation"),
+        (0, 2, "mim-stimulation"),
+        (1, 3, "mim-conversion"),
+        (4, 3, "mim-catalysis"),
+    ]
+    assert graph.indptr.tolist() == [0, 2, 3, 3, 3, 4]
+    assert graph.degree("all").tolist() == [2, 2, 1, 2, 1]
+    assert graph.neighbors("D", direction="in").tolist() == [1, 4]
+    assert graph.bfs("a").tolist() == [0, 1, 1, 2, -1]
+    assert graph.bfs("a", max_depth=1).tolist() == [0, 1, 1, -1, -1]
+    assert graph.bfs("e", direction="all").tolist() == [3, 2, 4, 1, 0]
+
+
+def test_pathway_graph_reads_gpml_2021():
+    graph = pathway_graph(G2021.decode("utf-8"))
+    assert graph.nodes["database"].tolist() == ["ncbigene", "ncbigene"]
+    assert graph.neighbors(0).tolist() == [1]
+    assert graph.interaction_types == ["Inhibition"]
+    assert np.array_equal(graph.degree("in"), [0, 1])
@@ -0,0 +1,92 @@
+import importlib
+import zipfile
+
+import pytest
+
+from pywikipathways.pathway_network import build_pathway_network
+
+pathway_network = importlib.import_module("pywikipathways.pathway_network")
+
+_GPML = '''<?xml version="1.0" encoding="UTF-8"?>
+<Pathway xmlns="http://pathvisio.org/GPML/2013a" Name="{name}">
+  <DataNode TextLabel="ACE" GraphId="n1" Type="GeneProduct"><Xref Database="Entrez Gene" ID="1636"/></DataNode>
+  <DataNode TextLabel="{target}" GraphId="n2" Type="Metabolite"><Xref Database="ChEBI" ID="{chebi}"/></DataNode>
+  <DataNode TextLabel="Note" GraphId="n3" Type="Unknown"><Xref Database="" ID=""/></DataNode>
+  <Interaction GraphId="i1"><Graphics>
+    <Point X="0" Y="0" GraphRef="n1"/><Point X="1" Y="1" GraphRef="n2" ArrowHead="{arrow}"/>
+  </Graphics></Interaction>
+  <Interaction GraphId="i2"><Graphics>
+    <Point X="0" Y="0" GraphRef="n3"/><Point X="1" Y="1" GraphRef="n1" ArrowHead="Arrow"/>
+  </Graphics></Interaction>
+</Pathway>'''
+
+
+def _write(directory, wpid, **fields):
+    values = {"name": wpid, "target": "Ang II", "chebi": "CHEBI:2719", "arrow": "mim-conversion"}
+    values.update(fields)
+    (directory / f"{wpid}.gpml").write_text(_GPML.format(**values), encoding="utf-8")
+
+
+def test_network_merges_nodes_by_xref(tmp_path):
+    _write(tmp_path, "WP1")
+    _write(tmp_path, "WP2", chebi="2719")
+    network = build_pathway_network(str(tmp_path), max_workers=2)
+
+    edges = network.edges.set_index(["source", "target"])
+    assert edges.loc[("ncbigene:1636", "chebi:2719"), "pathways"] == ["WP1", "WP2"]
+    assert edges.loc[("WP1:n3", "ncbigene:1636"), "pathways"] == ["WP1"]
+    assert len(network.edges) == 3
+    assert network.nodes.set_index("key").loc["chebi:2719", "label"] == "Ang II"
+
+
+def test_network_rebuilds_only_changed_pathways(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    _write(mirror, "WP1")
+    _write(mirror, "WP2")
+    archive = tmp_path / "archive.zip"
+    with zipfile.ZipFile(archive, "w") as handle:
+        handle.write(mirror / "WP1.gpml", "Hs_Test_WP1_123.gpml")
+    saved = str(tmp_path / "network")
+    build_pathway_network(str(mirror), path=saved, max_workers=1)
+
+    _write(mirror, "WP2", arrow="mim-inhibition")
+    parsed = []
+    original = pathway_network._pathway_tables
+    monkeypatch.setattr(pathway_network, "ProcessPoolExecutor", _InlineExecutor)
+    monkeypatch.setattr(pathway_network, "_pathway_tables",
+                        lambda item: parsed.append(item[0]) or original(item))
+    network = build_pathway_network(str(mirror), previous=saved)
+
+    assert parsed == ["WP2"]
+    interactions = dict(zip(network.edges["interaction"], network.edges["pathways"]))
+    assert interactions["mim-conversion"] == ["WP1"]
+    assert interactions["mim-inhibition"] == ["WP2"]
+
+    from_archive = build_pathway_network(str(archive), max_workers=1)
+    assert sorted(from_archive.hashes) == ["WP1"]
+
+
+class _InlineExecutor:
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, func, items, chunksize=1):
+        return map(func, items)
+
+
+def test_network_skips_malformed_gpml(tmp_path):
+    _write(tmp_path, "WP1")
+    (tmp_path / "WP2.gpml").write_text(_GPML[:200], encoding="utf-8")
+    network = build_pathway_network(str(tmp_path), max_workers=2)
+
+    assert list(network.failed) == ["WP2"]
+    assert sorted(network.hashes) == ["WP1"]
+    assert len(network.edges) == 2
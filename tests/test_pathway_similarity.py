@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from pywikipathways.pathway_similarity import pathway_similarity
+
+
+GENE_SETS = {
+    "WP1": ["a", "b", "c", "d"],
+    "WP2": ["a", "b", "c", "e"],
+    "WP3": ["x", "y"],
+    "WP4": ["a", "b"],
+}
+
+
+def test_pathway_similarity_exact_jaccard():
+    pytest.importorskip("scipy")
+    edges = pathway_similarity(GENE_SETS)
+    assert list(edges.columns) == ["source", "target", "similarity"]
+    pairs = {(s, t): v for s, t, v in edges.itertuples(index=False)}
+    assert pairs[("WP1", "WP2")] == pytest.approx(3 / 5)
+    assert pairs[("WP1", "WP4")] == pytest.approx(2 / 4)
+    assert not any("WP3" in pair for pair in pairs)
+
+
+def test_pathway_similarity_overlap_top_k_and_threshold():
+    pytest.importorskip("scipy")
+    edges = pathway_similarity(GENE_SETS, method="overlap", top_k=1)
+    assert edges.groupby("source").size().max() == 1
+    wp4 = edges[edges["source"] == "WP4"].iloc[0]
+    assert wp4["similarity"] == pytest.approx(1.0)
+
+    edges = pathway_similarity(GENE_SETS, threshold=0.55)
+    assert edges[["source", "target"]].values.tolist() == [["WP1", "WP2"]]
+
+
+def test_pathway_similarity_minhash_matches_exact_on_frame(tmp_path):
+    gmt_file = tmp_path / "pathways.gmt"
+    gmt_file.write_text(
+        "One%1%WP1%Homo sapiens\tOne\t" + "\t".join(map(str, range(100))) + "\n"
+        "Two%1%WP2%Homo sapiens\tTwo\t" + "\t".join(map(str, range(10, 100))) + "\n"
+        "Three%1%WP3%Homo sapiens\tThree\t" + "\t".join(map(str, range(500, 520))) + "\n",
+        encoding="utf-8",
+    )
+    edges = pathway_similarity(str(gmt_file), mode="minhash", num_perm=256, threshold=0.5)
+    assert edges[["source", "target"]].values.tolist() == [["WP1", "WP2"]]
+    assert edges["similarity"].iloc[0] == pytest.approx(0.9, abs=0.1)
+
+
+def test_pathway_similarity_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        pathway_similarity(GENE_SETS, method="cosine")
+    with pytest.raises(ValueError):
+        pathway_similarity(pd.DataFrame({"gene": ["a"]}))
@@ -0,0 +1,78 @@
+import importlib
+import threading
+import time
+
+import pytest
+
+from pywikipathways.ratelimit import (
+    FileTokenBucket,
+    TokenBucket,
+    clear_rate_limit,
+    get_rate_limits,
+    set_rate_limit,
+)
+
+utilities = importlib.import_module("pywikipathways.utilities")
+
+
+class _Response:
+    status_code = 200
+    content = b""
+
+    def raise_for_status(self):
+        pass
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket(rate=50, burst=2)
+    start = time.monotonic()
+    waits = [bucket.acquire() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] > 0 and waits[3] > 0
+    assert time.monotonic() - start >= 0.035
+
+
+def test_file_token_bucket_shares_state(tmp_path):
+    path = str(tmp_path / "bucket.lock")
+    first = FileTokenBucket(rate=50, burst=1, path=path)
+    second = FileTokenBucket(rate=50, burst=1, path=path)
+    assert first.acquire() == 0.0
+    assert second.acquire() > 0
+
+
+def test_transport_applies_host_concurrency_limit(monkeypatch):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_get(url, **kwargs):
+        with lock:
+            active.append(url)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(url)
+        return _Response()
+
+    monkeypatch.setattr(utilities.requests, "get", fake_get)
+    set_rate_limit("example.org", max_concurrency=2)
+    try:
+        assert get_rate_limits()["example.org"]["max_concurrency"] == 2
+        threads = [
+            threading.Thread(target=utilities.wikipathways_get, args=(f"https://example.org/{i}",))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        clear_rate_limit()
+
+    assert max(peak) <= 2
+    assert get_rate_limits() == {}
+
+
+def test_set_rate_limit_requires_a_limit():
+    with pytest.raises(ValueError):
+        set_rate_limit("example.org")
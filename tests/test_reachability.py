@@ -0,0 +1,63 @@
+import pandas as pd
+
+from pywikipathways.pathway_network import PathwayNetwork
+from pywikipathways.reachability import build_reachability_index
+
+
+def _network():
+    rows = [
+        # WP1: A -> B -> C, with a B <-> D cycle.
+        ("WP1", "g:A", "g:B", "Arrow"),
+        ("WP1", "g:B", "g:C", "Arrow"),
+        ("WP1", "g:B", "g:D", "Arrow"),
+        ("WP1", "g:D", "g:B", "mim-inhibition"),
+        # WP2 continues C -> E; only the merged network links A to E.
+        ("WP2", "g:C", "g:E", "mim-conversion"),
+        ("WP2", "g:A", "g:C", "Arrow"),
+    ]
+    edges = pd.DataFrame(rows, columns=["pathway", "source", "target", "interaction"])
+    nodes = pd.DataFrame(
+        [(wpid, key, key[2:], "g", key[2:])
+         for wpid, group in edges.groupby("pathway")
+         for key in sorted(set(group["source"]) | set(group["target"]))],
+        columns=["pathway", "key", "label", "database", "identifier"],
+    )
+    nodes.loc[len(nodes)] = ["WP2", "g:F", "F", "g", "F"]
+    return PathwayNetwork(nodes, edges, {"WP1": "x", "WP2": "y"})
+
+
+def test_reachability_queries():
+    index = build_reachability_index(_network())
+
+    assert index.reachable("g:A", "g:E")
+    assert not index.reachable("g:E", "g:A")
+    assert not index.reachable("g:A", "g:F")
+    assert index.reachable("D", "B") and index.reachable("B", "B")
+    assert not index.reachable("A", "A")
+    assert sorted(index.downstream("g:A")) == ["g:B", "g:C", "g:D", "g:E"]
+    assert sorted(index.upstream("g:C")) == ["g:A", "g:B", "g:D"]
+
+    explained = index.explain("g:A", "g:C")
+    assert explained["pathways"] == ["WP1", "WP2"]
+    assert explained["path"] == ["g:A", "g:C"]
+    assert explained["path_pathways"] == [["WP2"]]
+
+    across = index.explain("g:B", "g:E")
+    assert across["pathways"] == []
+    assert across["path"] == ["g:B", "g:C", "g:E"]
+    assert across["path_pathways"] == [["WP1"], ["WP2"]]
+    assert index.explain("g:E", "g:A")["reachable"] is False
+
+    cycle = index.explain("g:B", "g:B")
+    assert cycle["pathways"] == ["WP1"]
+    assert cycle["path"] == ["g:B", "g:D", "g:B"]
+    assert cycle["path_pathways"] == [["WP1"], ["WP1"]]
+    assert index.shortest_path("g:A", "g:A") == []
+
+
+def test_reachability_interaction_filter():
+    index = build_reachability_index(_network(), interactions=["Arrow"])
+
+    assert not index.reachable("g:D", "g:B")
+    assert not index.reachable("g:A", "g:E")
+    assert index.explain("g:A", "g:D")["pathways"] == ["WP1"]
@@ -0,0 +1,114 @@
+import importlib
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from pywikipathways.list_organisms import list_organisms
+from pywikipathways.list_pathways import list_pathways, list_pathway_ids
+from pywikipathways.snapshot import (
+    _pushdown_table,
+    export_snapshot,
+    load_snapshot,
+    snapshot_info,
+    use_snapshot,
+)
+
+list_pathways_module = importlib.import_module("pywikipathways.list_pathways")
+list_organisms_module = importlib.import_module("pywikipathways.list_organisms")
+
+PATHWAYS = pd.DataFrame(
+    {
+        "id": ["WP1", "WP2", "WP3"],
+        "url": ["u1", "u2", "u3"],
+        "name": ["Statin pathway", "Apoptosis", "Glycolysis"],
+        "species": ["Mus musculus", "Homo sapiens", "Mus musculus"],
+        "revision": ["2021-01-01", "2023-06-01", "2024-02-01"],
+    }
+)
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(list_pathways_module, "_list_pathways_frame", lambda: PATHWAYS)
+    monkeypatch.setattr(
+        list_organisms_module, "_organisms_frame",
+        lambda: pd.DataFrame({"organism": ["Homo sapiens", "Mus musculus"]}),
+    )
+    path = export_snapshot(str(tmp_path / "snap"), tables=["listPathways", "listOrganisms"])
+    yield path
+    use_snapshot(None)
+
+
+def test_export_and_load_snapshot(snapshot_dir):
+    manifest = snapshot_info(snapshot_dir)
+    assert manifest["format"] == "feather"
+    assert manifest["tables"]["listPathways"]["rows"] == 3
+
+    tables = load_snapshot(snapshot_dir)
+    assert set(tables) == {"listPathways", "listOrganisms"}
+    assert tables["listPathways"]["id"].tolist() == ["WP1", "WP2", "WP3"]
+
+
+def test_functions_read_active_snapshot(snapshot_dir, monkeypatch):
+    use_snapshot(snapshot_dir)
+    monkeypatch.setattr(list_pathways_module, "_list_pathways_frame", None)
+
+    assert snapshot_info()["pywikipathways"]
+    assert list_pathway_ids("Mus musculus").tolist() == ["WP1", "WP3"]
+    assert len(list_pathways()) == 3
+    assert list_organisms() == ["Homo sapiens", "Mus musculus"]
+
+
+def test_snapshot_rejects_unknown_input(tmp_path):
+    with pytest.raises(ValueError):
+        export_snapshot(str(tmp_path), tables=["notAnEndpoint"])
+    with pytest.raises(ValueError):
+        use_snapshot(str(tmp_path))
+
+
+def test_pushdown_filters_snapshot_tables(tmp_path, monkeypatch):
+    monkeypatch.setattr(list_pathways_module, "_list_pathways_frame", lambda: pd.DataFrame({
+        "id": ["WP1", "WP2", "WP3"],
+        "species": ["Mus musculus", "Homo sapiens", "Homo sapiens"],
+        "name": ["a", "b", "c"],
+    }))
+    export_snapshot(str(tmp_path), tables=["listPathways"])
+    use_snapshot(str(tmp_path))
+    try:
+        frame = list_pathways("Homo sapiens", columns=["name", "id"], ids=["WP3", "WP1"])
+        missing = _pushdown_table("listPathways", ["id"], {"url": ["x"]})
+    finally:
+        use_snapshot(None)
+    assert frame.to_dict("list") == {"name": ["c"], "id": ["WP3"]}
+    assert missing.empty
+
+
+def test_snapshot_text_search_matches_live(tmp_path, monkeypatch):
+    from pywikipathways.find_pathways_by_text import find_pathways_by_text
+
+    text_module = importlib.import_module("pywikipathways.find_pathways_by_text")
+    frame = pd.DataFrame({
+        "id": ["WP1", "WP2", "WP3"],
+        "name": ["Statin pathway", "Apoptosis", "Renin"],
+        "datanodes": [["HMGCR", "LDLR"], ["CASP3"], ["ACE", "AGT"]],
+        "citedIn": ["PMID:1", ["PMID:2", "PMID:3"], None],
+    })
+    monkeypatch.setattr(text_module, "_find_pathways_by_text_frame", lambda: frame)
+    queries = ["'hmgcr', 'ldlr'", "hmgcr ldlr", "['pmid:2'", "pmid:1", "ace"]
+    live = [find_pathways_by_text(query, backend="pandas") for query in queries]
+
+    export_snapshot(str(tmp_path), tables=["findPathwaysByText"])
+    use_snapshot(str(tmp_path))
+    try:
+        served = [find_pathways_by_text(query, backend="pandas") for query in queries]
+    finally:
+        use_snapshot(None)
+    for expected, result in zip(live, served):
+        if expected is None:
+            assert result is None
+        else:
+            assert result.to_dict("list") == expected.to_dict("list")
+    assert served[1] is None
+    assert served[2]["datanodes"].tolist() == [["CASP3"]]
@@ -0,0 +1,44 @@
+import importlib
+
+from pywikipathways.list_pathways import list_pathways
+from pywikipathways.tracing import get_tracer, profile, span
+
+utilities = importlib.import_module("pywikipathways.utilities")
+
+
+class _Response:
+    status_code = 200
+    content = b"{}"
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"organisms": [{"pathways": [
+            {"id": "WP1", "species": "Mus musculus"},
+            {"id": "WP2", "species": "Homo sapiens"},
+        ]}]}
+
+
+def test_profile_records_nested_stage_spans(monkeypatch):
+    monkeypatch.setattr(utilities.requests, "get", lambda url, **kwargs: _Response())
+    with profile() as recorder:
+        list_pathways("Mus musculus")
+
+    assert get_tracer() is None
+    (root,) = recorder.spans
+    assert root.name == "list_pathways"
+    assert root.children[0].attributes == {"endpoint": "listPathways.json"}
+    paths = {row["path"] for row in recorder.summary()}
+    assert {
+        "list_pathways/fetch",
+        "list_pathways/decode",
+        "list_pathways/dataframe",
+        "list_pathways/filter",
+    } <= paths
+    assert "list_pathways/filter" in recorder.report()
+
+
+def test_span_without_tracer_is_a_no_op():
+    with span("idle") as current:
+        assert current is None
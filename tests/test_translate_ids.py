@@ -0,0 +1,45 @@
+import pytest
+
+from pywikipathways.translate_ids import build_id_mapping, translate_ids
+
+_HEADER = "Label\tType\tIdentifier\tComment\tEnsembl\tNCBI gene\tUniProt\n"
+
+
+def _mirror(tmp_path):
+    (tmp_path / "WP1-datanodes.tsv").write_text(
+        _HEADER
+        + "ACE\tGeneProduct\t\t\tensembl:ENSG1\tncbigene:1636\tuniprot:P12821\n"
+        + "AGT\tGeneProduct\t\t\t\tncbigene:183\tuniprot:P01019;uniprot:P01020\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "WP2-datanodes.tsv").write_text(
+        _HEADER + "ACE\tGeneProduct\t\t\tensembl:ENSG1\tncbigene:1636\tuniprot:P12821\n",
+        encoding="utf-8",
+    )
+    return str(tmp_path)
+
+
+def test_translate_ids_from_mirror(tmp_path):
+    path = str(tmp_path / "idmap.tsv.gz")
+    mapping = build_id_mapping(mirror=_mirror(tmp_path), path=path)
+
+    # The ACE node appears in both pathways but is stored once.
+    assert mapping["node"].nunique() == 2
+
+    result = translate_ids(["ncbigene:183", "1636", "999"], "L", "S")
+    assert result["from_id"].tolist() == ["183", "183", "1636", "999"]
+    assert result["to_id"].tolist()[:3] == ["P01019", "P01020", "P12821"]
+    assert result["to_id"].isna().tolist() == [False, False, False, True]
+
+    reloaded = translate_ids(["P12821"], "S", "En", mapping=path)
+    assert reloaded["to_id"].tolist() == ["ENSG1"]
+
+    # A path is used for that call only; the default mapping is untouched.
+    other = tmp_path / "other.tsv"
+    agt = mapping.loc[mapping["identifier"] == "183", "node"].iloc[0]
+    mapping[mapping["node"] != agt].to_csv(other, sep="\t", index=False)
+    translate_ids(["P12821"], "S", "En", mapping=str(other))
+    assert translate_ids(["183"], "L", "S")["to_id"].tolist() == ["P01019", "P01020"]
+
+    with pytest.raises(ValueError):
+        translate_ids(["1636"], "L", "XX")
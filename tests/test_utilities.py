@@ -0,0 +1,73 @@
+import importlib
+import threading
+import time
+
+import pytest
+import requests
+
+utilities = importlib.import_module("pywikipathways.utilities")
+
+
+class _Response:
+    status_code = 200
+    content = b"{}"
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"pathwayInfo": []}
+
+
+def _run_concurrently(target, count):
+    barrier = threading.Barrier(count)
+    results, errors = [], []
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(target())
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_identical_fetches_share_one_request(monkeypatch):
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        time.sleep(0.05)
+        return _Response()
+
+    monkeypatch.setattr(utilities.requests, "get", fake_get)
+    url = "https://example.org/json/findPathwaysByXref.json"
+    results, errors = _run_concurrently(lambda: utilities.wikipathways_get_json(url), 6)
+
+    assert not errors
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    utilities.wikipathways_get_json(url)
+    assert len(calls) == 2
+
+
+def test_waiters_see_the_leader_error(monkeypatch):
+    def fake_get(url, **kwargs):
+        time.sleep(0.05)
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(utilities.requests, "get", fake_get)
+    url = "https://example.org/json/getPathwayInfo.json"
+    results, errors = _run_concurrently(lambda: utilities.wikipathways_get_json(url), 4)
+
+    assert not results
+    assert len(errors) == 4
+    assert all(isinstance(error, requests.ConnectionError) for error in errors)
+    with pytest.raises(requests.ConnectionError):
+        utilities.wikipathways_get_json(url)
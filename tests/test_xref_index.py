@@ -0,0 +1,42 @@
+import pytest
+
+from pywikipathways.xref_index import build_xref_index, load_xref_index
+
+_HEADER = "Label\tType\tIdentifier\tComment\tEnsembl\tNCBI gene\tUniProt\tHMDB\n"
+
+
+def _mirror(tmp_path):
+    (tmp_path / "WP1-datanodes.tsv").write_text(
+        _HEADER
+        + "ACE\tGeneProduct\t\t\tensembl:ENSG1\tncbigene:1636\tuniprot:P12821\t\n"
+        + "AGT\tGeneProduct\t\t\t\tncbigene:183\tuniprot:P01019;uniprot:P12821\t\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "WP2-datanodes.tsv").write_text(
+        _HEADER + "Glucose\tMetabolite\t\t\t\t\t\thmdb:HMDB0000122\n"
+        + "ACE\tGeneProduct\t\t\t\t\tuniprot:P12821\t\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "WP2.gpml").write_text("<Pathway/>", encoding="utf-8")
+    return str(tmp_path)
+
+
+def test_build_lookup_and_reload(tmp_path):
+    path = str(tmp_path / "index.npz")
+    index = build_xref_index(mirror=_mirror(tmp_path), path=path, max_workers=2)
+
+    assert index.pathways.tolist() == ["WP1", "WP2"]
+    assert index.systems == ["Ch", "En", "L", "S"]
+    assert index.lookup("P12821", "S") == ["WP1", "WP2"]
+    assert index.lookup("uniprot:P01019", "S") == ["WP1"]
+    assert index.lookup("HMDB0000122", "Ch") == ["WP2"]
+    assert index.lookup("P12821", "Ck") == []
+    with pytest.raises(ValueError):
+        index.lookup("P12821", "XX")
+
+    hits = index.find_pathways(["P12821", "P01019", "Q00000"], "S")
+    assert hits.to_dict("list") == {"pathway": ["WP1", "WP2"], "hits": [2, 1]}
+
+    reloaded = load_xref_index(path)
+    assert reloaded.lookup("1636", "L") == ["WP1"]
+    assert len(reloaded) == len(index)